@@ -0,0 +1,90 @@
+import math
+from typing import Dict, List, Any, Tuple
+
+import numpy as np
+
+from metrics_collector import MetricsCollector, ModelMetricsCollector
+
+
+class AdaptiveSampler:
+    """Sequential stopping rule for the repetitions of one question.
+
+    Tests are run until the bootstrap confidence interval of the mean score is
+    at most score_ci_width wide and that of the mean response time at most
+    response_time_ci_width of the mean, bounded by min_tests and max_tests.
+    Questions where every repetition agrees stop at min_tests.
+    """
+
+    def __init__(self, min_tests: int = 2, max_tests: int = 10, score_ci_width: float = 0.2,
+                 response_time_ci_width: float = 0.25):
+        if not 1 <= min_tests <= max_tests:
+            raise ValueError("adaptive_sampling requires 1 <= min_tests <= max_tests")
+        self.min_tests = min_tests
+        self.max_tests = max_tests
+        self.score_ci_width = score_ci_width
+        self.response_time_ci_width = response_time_ci_width
+        self._statistics = MetricsCollector()
+
+    def _ci_width(self, values: List[float]) -> float:
+        ci_low, ci_high = self._statistics.bootstrap_confidence_interval(np.array(values, dtype=np.float64))
+        return ci_high - ci_low
+
+    def is_done(self, test_results: List[Dict[str, Any]]) -> bool:
+        if len(test_results) >= self.max_tests:
+            return True
+        if len(test_results) < self.min_tests:
+            return False
+
+        if self._ci_width([result['evaluation_score'] for result in test_results]) > self.score_ci_width:
+            return False
+        response_times = [result['response_time'] for result in test_results]
+        mean_response_time = sum(response_times) / len(response_times)
+        return self._ci_width(response_times) <= self.response_time_ci_width * mean_response_time
+
+    def next_round_size(self, completed: int, batch_size: int) -> int:
+        # Up to min_tests first, then one evaluator batch at a time
+        if completed < self.min_tests:
+            return self.min_tests - completed
+        return min(max(1, batch_size), self.max_tests - completed)
+
+
+class SuccessiveHalving:
+    """Tests subject models on the dataset in rounds, dropping clearly dominated models between rounds.
+
+    The questions are split into consecutive rounds. After each round except the
+    last, up to half of the remaining models (the lowest mean scores so far) are
+    dropped, but only those whose score confidence interval lies entirely below
+    the leader's, so models that are merely close are kept.
+    """
+
+    def __init__(self, rounds: int = 3):
+        if rounds < 1:
+            raise ValueError("successive_halving rounds must be at least 1")
+        self.rounds = rounds
+
+    def split(self, qa_pairs: List[Dict[str, str]]) -> List[Tuple[int, List[Dict[str, str]]]]:
+        """Returns (first question number, questions) for each round."""
+        round_size = math.ceil(len(qa_pairs) / min(self.rounds, max(1, len(qa_pairs))))
+        return [(start + 1, qa_pairs[start:start + round_size]) for start in range(0, len(qa_pairs), round_size)]
+
+    @staticmethod
+    def _score_interval(collector: ModelMetricsCollector) -> Tuple[float, float]:
+        scores = collector.evaluation_scores.values
+        if len(scores) == 0:
+            return 0.0, 0.0
+        return collector.bootstrap_confidence_interval(scores)
+
+    def select(self, models: List[Dict[str, str]],
+               collectors: Dict[str, ModelMetricsCollector]) -> Tuple[List[Dict[str, str]], List[Dict[str, str]]]:
+        """Returns the models to keep testing and the models dropped after this round."""
+        ranked = sorted(models, key=lambda model: collectors[model['model']].evaluation_scores.mean() or 0,
+                        reverse=True)
+        leader_low, _ = self._score_interval(collectors[ranked[0]['model']])
+        keep_count = math.ceil(len(ranked) / 2)
+
+        dropped = [
+            model for model in ranked[keep_count:]
+            if self._score_interval(collectors[model['model']])[1] < leader_low
+        ]
+        # Keep the original testing order for the next round
+        return [model for model in models if model not in dropped], dropped
@@ -0,0 +1,89 @@
+import asyncio
+from typing import Callable, Dict, List, Any, Optional
+from model_tester import ModelTester, build_test_result
+from evaluation_manager import EvaluationManager
+from run_journal import RunJournal
+from console_output import console
+from providers.registry import registry
+
+
+class AsyncTestRunner:
+    def __init__(self, model_tester: ModelTester, evaluation_manager: EvaluationManager,
+                 number_of_tests: int, subject_concurrency: Dict[str, int],
+                 evaluator_concurrency: int, journal: RunJournal):
+        self.model_tester = model_tester
+        self.evaluation_manager = evaluation_manager
+        self.number_of_tests = number_of_tests
+        self.subject_concurrency = subject_concurrency
+        self.evaluator_concurrency = evaluator_concurrency
+        self.journal = journal
+        # Set on shard workers to skip tests that belong to other shards
+        self.test_filter: Optional[Callable[[str, int, int], bool]] = None
+
+    def run_model(self, model: Dict[str, str], qa_pairs: List[Dict[str, str]],
+                  first_question_num: int = 1) -> List[List[Dict[str, Any]]]:
+        """Run every (question, repetition) pair for a model concurrently.
+
+        Results are returned indexed by question and then test number, so the
+        caller can aggregate them in the same order as a sequential run.
+        Questions are numbered from first_question_num.
+        """
+        return asyncio.run(registry.run_and_close(self._run_model(model, qa_pairs, first_question_num)))
+
+    async def _run_model(self, model: Dict[str, str], qa_pairs: List[Dict[str, str]],
+                         first_question_num: int) -> List[List[Dict[str, Any]]]:
+        subject_semaphore = asyncio.Semaphore(self.subject_concurrency.get(model['provider'], 1))
+        evaluator_semaphore = asyncio.Semaphore(self.evaluator_concurrency)
+
+        tasks = [
+            self._run_question(model, qa, question_num, subject_semaphore, evaluator_semaphore)
+            for question_num, qa in enumerate(qa_pairs, first_question_num)
+        ]
+        return list(await asyncio.gather(*tasks))
+
+    async def _run_question(self, model: Dict[str, str], qa: Dict[str, str], question_num: int,
+                            subject_semaphore: asyncio.Semaphore,
+                            evaluator_semaphore: asyncio.Semaphore) -> List[Dict[str, Any]]:
+        expected_answer: Optional[str] = qa['answer'] if qa['answer'] else None
+        results = [
+            self.journal.get_result(model['model'], question_num, test_num)
+            for test_num in range(1, self.number_of_tests + 1)
+        ]
+        pending = [
+            test_num for test_num, result in enumerate(results, 1)
+            if not result and (self.test_filter is None or self.test_filter(model['model'], question_num, test_num))
+        ]
+
+        responses = await asyncio.gather(*[self._generate(model, qa, subject_semaphore) for _ in pending])
+
+        batch_size = max(1, self.evaluation_manager.batch_size)
+        batches = [list(range(len(pending)))[i:i + batch_size] for i in range(0, len(pending), batch_size)]
+
+        async def evaluate_batch(batch):
+            async with evaluator_semaphore:
+                return await self.evaluation_manager.evaluate_responses_async(
+                    qa['question'], expected_answer, [responses[i]['response'] for i in batch]
+                )
+
+        batch_evaluations = await asyncio.gather(*[evaluate_batch(batch) for batch in batches])
+
+        for batch, evaluation_results in zip(batches, batch_evaluations):
+            for i, evaluation_result in zip(batch, evaluation_results):
+                test_num = pending[i]
+                print(f"Question {question_num}, Test {test_num}: completed in {responses[i]['response_time']:.2f} seconds, "
+                      f"score {evaluation_result['score']}", file=console.details)
+
+                # Overlapping tests cannot be attributed a share of the system power draw
+                result = build_test_result(responses[i], None, evaluation_result)
+                self.journal.record(model['model'], question_num, test_num, result)
+                console.record_test(model['model'], result)
+                results[test_num - 1] = result
+
+        return results
+
+    async def _generate(self, model: Dict[str, str], qa: Dict[str, str],
+                        subject_semaphore: asyncio.Semaphore) -> Dict[str, Any]:
+        async with subject_semaphore:
+            return await self.model_tester.test_single_iteration_async(
+                model['provider'], model['model'], qa['question']
+            )
@@ -0,0 +1,147 @@
+import argparse
+import contextlib
+import importlib
+import io
+import os
+import tempfile
+import time
+from typing import Any, Dict
+
+import yaml
+from fake_server import FakeLLMServer, FakeServerSettings, add_server_arguments, settings_from_arguments
+from main import LocalLLMTestSuite
+from providers.registry import PROVIDER_MODULES
+from dataset_loader import load_dataset
+
+EXECUTION_MODES = ('sequential', 'async', 'pipeline')
+
+
+def build_config(base_url: str, work_dir: str, args: argparse.Namespace, execution_mode: str) -> str:
+    """Writes a suite config that sends every provider to the fake server."""
+    config = {
+        'subject_models': [
+            {'provider': args.provider, 'model': f"fake-model-{i + 1}"} for i in range(args.models)
+        ],
+        'evaluator': args.evaluator,
+        'evaluator_model': 'fake-judge',
+        'evaluation_batch_size': args.evaluation_batch_size,
+        'local_scoring': {'enabled': False},
+        'evaluation_cache': {'enabled': False},
+        'number_of_tests': args.number_of_tests,
+        'dataset': args.dataset,
+        'evaluation_type': args.evaluation_type,
+        'powermetrics': False,
+        'streaming': args.streaming,
+        'output': {'format': 'csv', 'filename': os.path.join(work_dir, f"results_{execution_mode}.csv")},
+        'journal_path': os.path.join(work_dir, f"journal_{execution_mode}.jsonl"),
+        'execution_mode': execution_mode,
+        'max_concurrency': {
+            'subject': {provider: args.concurrency for provider in PROVIDER_MODULES},
+            'evaluator': args.concurrency
+        },
+        'pipeline': {'queue_size': 2 * args.concurrency, 'judge_workers': args.concurrency},
+        'providers': {
+            'lmstudio': {'base_url': f"{base_url}/v1", 'initial_backoff': 0.05},
+            'openai': {'base_url': f"{base_url}/v1", 'api_key': 'fake', 'initial_backoff': 0.05},
+            'anthropic': {'base_url': base_url, 'api_key': 'fake', 'initial_backoff': 0.05}
+        }
+    }
+
+    config_path = os.path.join(work_dir, f"config_{execution_mode}.yml")
+    with open(config_path, 'w') as config_file:
+        yaml.safe_dump(config, config_file)
+    return config_path
+
+
+def run_suite(server: FakeLLMServer, config_path: str, test_count: int) -> Dict[str, Any]:
+    stats_before = server.get_stats()
+
+    # The suite's own console output would dominate the timing of fast runs
+    with contextlib.redirect_stdout(io.StringIO()):
+        start_time = time.perf_counter()
+        LocalLLMTestSuite(config_path).run_complete_test_suite()
+        wall_time = time.perf_counter() - start_time
+
+    stats_after = server.get_stats()
+    return {
+        'tests': test_count,
+        'wall_time': wall_time,
+        'throughput': test_count / wall_time,
+        'requests': stats_after['requests'] - stats_before['requests'],
+        'errors': stats_after['errors'] - stats_before['errors'],
+        'simulated_time': stats_after['simulated_time'] - stats_before['simulated_time']
+    }
+
+
+def display_results(results: Dict[str, Dict[str, Any]], zero_latency: Dict[str, Any]) -> None:
+    print("\n" + "=" * 80)
+    print("HARNESS BENCHMARK:")
+    print("=" * 80)
+    print(f"{'Mode':<12} {'Tests':>6} {'Wall (s)':>10} {'Tests/s':>9} {'Requests':>9} {'Errors':>7} "
+          f"{'Overhead/test':>14}")
+    for mode, result in results.items():
+        # Simulated server time only adds up to wall time when requests run one at a time
+        overhead = '-'
+        if mode == 'sequential':
+            overhead = f"{(result['wall_time'] - result['simulated_time']) / result['tests'] * 1000:.1f} ms"
+        print(f"{mode:<12} {result['tests']:>6} {result['wall_time']:>10.2f} {result['throughput']:>9.2f} "
+              f"{result['requests']:>9} {result['errors']:>7} {overhead:>14}")
+    print("-" * 80)
+    print(f"Zero-latency server, sequential: {zero_latency['wall_time'] / zero_latency['tests'] * 1000:.1f} ms "
+          f"per test ({zero_latency['requests']} requests) — harness, HTTP and judging cost with no model time")
+    print("=" * 80)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Benchmark suite throughput and harness overhead against the bundled fake LLM server'
+    )
+    parser.add_argument('--dataset', default='test_data/questions_simple.txt', help='Dataset to run')
+    parser.add_argument('--evaluation-type', default='SIMPLE_QUESTION', help='Evaluation type of the dataset')
+    parser.add_argument('--models', type=int, default=2, help='Number of fake subject models')
+    parser.add_argument('--number-of-tests', type=int, default=3, help='Repetitions per question')
+    parser.add_argument('--provider', choices=list(PROVIDER_MODULES), default='lmstudio',
+                        help='Provider used for the subject models')
+    parser.add_argument('--evaluator', choices=list(PROVIDER_MODULES), default='openai',
+                        help='Provider used for the evaluator')
+    parser.add_argument('--evaluation-batch-size', type=int, default=1, help='Answers judged per evaluator request')
+    parser.add_argument('--concurrency', type=int, default=8,
+                        help='Concurrency limit for async mode and judge workers for pipeline mode')
+    parser.add_argument('--streaming', action='store_true', help='Stream subject model completions')
+    parser.add_argument('--modes', nargs='+', choices=EXECUTION_MODES, default=list(EXECUTION_MODES),
+                        help='Execution modes to benchmark')
+    add_server_arguments(parser)
+    args = parser.parse_args()
+
+    test_count = args.models * len(load_dataset(args.dataset)) * args.number_of_tests
+
+    # Import provider SDKs up front so one-off import time is not counted against the first run
+    for module_name in PROVIDER_MODULES.values():
+        importlib.import_module(module_name)
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        zero_latency_server = FakeLLMServer(settings=FakeServerSettings(ttft=0, tokens_per_second=0)).start_in_thread()
+        try:
+            print("Measuring harness overhead against a zero-latency server...")
+            zero_latency = run_suite(
+                zero_latency_server,
+                build_config(zero_latency_server.base_url, work_dir, args, 'sequential'),
+                test_count
+            )
+        finally:
+            zero_latency_server.stop()
+
+        server = FakeLLMServer(settings=settings_from_arguments(args)).start_in_thread()
+        results = {}
+        try:
+            for mode in args.modes:
+                print(f"Running {test_count} tests in {mode} mode...")
+                results[mode] = run_suite(server, build_config(server.base_url, work_dir, args, mode), test_count)
+        finally:
+            server.stop()
+
+    display_results(results, zero_latency)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,16 @@
-from typing import Dict, Tuple, Optional
+from typing import Any, Dict, Tuple, Optional
+
+import numpy as np
 
 
 class ComparisonAnalyzer:
-    def __init__(self):
-        pass
+    # Upper bound on resampling weights or signs held in memory at once
+    CHUNK_ELEMENTS = 2_000_000
+
+    def __init__(self, resamples: int = 10000, permutations: int = 10000, alpha: float = 0.05):
+        self.resamples = resamples
+        self.permutations = permutations
+        self.alpha = alpha
 
     def find_winning_model(self, model_metrics: Dict[str, Dict[str, Optional[float]]]) -> Tuple[str, float]:
         if not model_metrics:
@@ -28,12 +35,13 @@ class ComparisonAnalyzer:
         return sorted(model_metrics.items(), key=lambda x: efficiency_score(x[1]), reverse=True)
 
     def rank_models_by_energy_efficiency(self, model_metrics: Dict[str, Dict[str, Optional[float]]]) -> list:
-        # Rank by score/energy_usage ratio (higher is better), excluding models without energy data
+        # Rank by score x tokens per joule of net (idle subtracted) energy (higher is better),
+        # excluding models without energy data
         valid_models = [(name, metrics) for name, metrics in model_metrics.items()
-                       if metrics['avg_energy_usage'] is not None and metrics['avg_energy_usage'] > 0]
+                       if metrics.get('tokens_per_joule') is not None]
 
         def energy_efficiency_score(metrics):
-            return metrics['avg_score'] / metrics['avg_energy_usage']
+            return metrics['avg_score'] * metrics['tokens_per_joule']
 
         return sorted(valid_models, key=lambda x: energy_efficiency_score(x[1]), reverse=True)
 
@@ -52,4 +60,97 @@ class ComparisonAnalyzer:
             'fastest_response_time': min(response_times),
             'slowest_response_time': max(response_times),
             'average_response_time': sum(response_times) / len(response_times)
-        }
\ No newline at end of file
+        }
+
+    def compare_models(self, question_scores: Dict[str, Dict[int, float]], seed: int = 0) -> Optional[Dict[str, Any]]:
+        """Paired significance tests between models on per-question mean scores.
+
+        Only questions every model answered are compared. For each pair of
+        models this reports the paired bootstrap probability that the first is
+        better (questions resampled with replacement) and a two-sided paired
+        permutation test p-value (per-question differences randomly sign-flipped).
+        Both are computed for all pairs at once with matrix products, in chunks
+        so memory stays bounded with many models and questions. Models whose
+        difference from the best model is not significant are reported as tied.
+        """
+        models = list(question_scores)
+        if len(models) < 2:
+            return None
+        questions = sorted(set.intersection(*(set(scores) for scores in question_scores.values())))
+        if not questions:
+            return None
+
+        scores = np.array([[question_scores[model][q] for q in questions] for model in models], dtype=np.float64)
+        rng = np.random.default_rng(seed)
+        means = scores.mean(axis=1)
+
+        prob_better = self._paired_bootstrap(scores, rng)
+        p_values = self._paired_permutation_test(scores, rng)
+
+        # Per-question wins, ties and losses of the row model against the column model
+        differences = scores[:, None, :] - scores[None, :, :]
+        wins = (differences > 0).sum(axis=2)
+        ties = (differences == 0).sum(axis=2)
+        losses = (differences < 0).sum(axis=2)
+
+        best = int(np.argmax(means))
+        ranked = np.argsort(-means, kind='stable')
+        tied = [models[i] for i in ranked if i == best or p_values[best, i] >= self.alpha]
+        others = [i for i in range(len(models)) if i != best]
+        runner_up = max(others, key=lambda i: means[i])
+
+        return {
+            'models': models,
+            'questions': len(questions),
+            'mean_scores': dict(zip(models, means.tolist())),
+            'prob_better': prob_better,
+            'p_values': p_values,
+            'wins': wins,
+            'ties': ties,
+            'losses': losses,
+            'alpha': self.alpha,
+            'best_model': models[best],
+            'tied_models': tied,
+            'runner_up': models[runner_up],
+            'winner_confidence': float(prob_better[best, runner_up]),
+            'winner_p_value': float(p_values[best, runner_up])
+        }
+
+    def _paired_bootstrap(self, scores: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+        # A resample is a count of how often each question was drawn, so every model's
+        # resampled mean comes from one matrix product per chunk
+        model_count, question_count = scores.shape
+        # Chunks also hold a model x model difference per resample
+        chunk_size = max(1, self.CHUNK_ELEMENTS // max(question_count, model_count ** 2))
+        better = np.zeros((model_count, model_count))
+        for start in range(0, self.resamples, chunk_size):
+            count = min(chunk_size, self.resamples - start)
+            draws = rng.integers(0, question_count, size=(count, question_count))
+            # Offsetting each resample's draws lets one bincount build all the counts
+            offsets = np.arange(count)[:, None] * question_count
+            weights = np.bincount((draws + offsets).ravel(), minlength=count * question_count)
+            resampled_means = scores @ weights.reshape(count, question_count).T / question_count
+            differences = resampled_means[:, None, :] - resampled_means[None, :, :]
+            # Resamples with equal means count as half a win each way
+            better += (differences > 0).sum(axis=2) + 0.5 * (differences == 0).sum(axis=2)
+        return better / self.resamples
+
+    def _paired_permutation_test(self, scores: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+        model_count, question_count = scores.shape
+        rows, columns = np.triu_indices(model_count, k=1)
+        pair_differences = scores[rows] - scores[columns]
+        observed = np.abs(pair_differences.mean(axis=1))
+
+        chunk_size = max(1, self.CHUNK_ELEMENTS // max(question_count, len(rows)))
+        extreme = np.zeros(len(rows))
+        for start in range(0, self.permutations, chunk_size):
+            count = min(chunk_size, self.permutations - start)
+            signs = rng.choice(np.array([-1.0, 1.0]), size=(count, question_count))
+            permuted_means = np.abs(signs @ pair_differences.T / question_count)
+            # Small tolerance so floating point noise does not make identical statistics look smaller
+            extreme += (permuted_means >= observed - 1e-12).sum(axis=0)
+
+        p_values = np.ones((model_count, model_count))
+        p_values[rows, columns] = p_values[columns, rows] = (extreme + 1) / (self.permutations + 1)
+        return p_values
+
@@ -1,17 +1,19 @@
 import yaml
 from evaluators.evaluation_types import EvaluationType
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 
 
 class ConfigManager:
-    def __init__(self, config_path: str = 'config.yml'):
+    def __init__(self, config_path: str = 'config.yml', overrides: Optional[Dict[str, Any]] = None):
         self.config_path = config_path
+        # Top-level settings replaced for one job of a suite manifest
+        self.overrides = overrides or {}
         self._config = None
 
     def load_config(self) -> Dict[str, Any]:
         if self._config is None:
             with open(self.config_path, 'r') as file:
-                self._config = yaml.safe_load(file)
+                self._config = {**yaml.safe_load(file), **self.overrides}
             self._config['evaluation_type'] = EvaluationType[self._config['evaluation_type']]
         return self._config
 
@@ -35,10 +37,119 @@ class ConfigManager:
     def dataset(self) -> str:
         return self.load_config()['dataset']
 
+    @property
+    def dataset_sampling(self) -> Dict[str, Any]:
+        return self.load_config().get('dataset_sampling', {})
+
     @property
     def evaluation_type(self) -> EvaluationType:
         return self.load_config()['evaluation_type']
 
     @property
     def powermetrics(self) -> bool:
-        return self.load_config()['powermetrics']
\ No newline at end of file
+        return self.load_config()['powermetrics']
+
+    @property
+    def power_backend(self) -> str:
+        return self.load_config().get('power_backend', 'auto')
+
+    @property
+    def power_baseline_seconds(self) -> float:
+        return self.load_config().get('power_baseline_seconds', 5)
+
+    @property
+    def execution_mode(self) -> str:
+        return self.load_config().get('execution_mode', 'sequential')
+
+    @property
+    def subject_concurrency(self) -> Dict[str, int]:
+        return self.load_config().get('max_concurrency', {}).get('subject', {})
+
+    @property
+    def evaluator_concurrency(self) -> int:
+        return self.load_config().get('max_concurrency', {}).get('evaluator', 1)
+
+    @property
+    def pipeline_queue_size(self) -> int:
+        return self.load_config().get('pipeline', {}).get('queue_size', 8)
+
+    @property
+    def pipeline_judge_workers(self) -> int:
+        return self.load_config().get('pipeline', {}).get('judge_workers', 4)
+
+    @property
+    def warmup_requests(self) -> int:
+        return self.load_config().get('warmup_requests', 1)
+
+    @property
+    def streaming(self) -> bool:
+        return self.load_config().get('streaming', False)
+
+    @property
+    def evaluation_cache(self) -> Dict[str, Any]:
+        return self.load_config().get('evaluation_cache', {'enabled': False})
+
+    @property
+    def run_history(self) -> Dict[str, Any]:
+        return self.load_config().get('run_history', {'enabled': False})
+
+    @property
+    def journal_path(self) -> str:
+        return self.load_config().get('journal_path', 'run_journal.jsonl')
+
+    @property
+    def output_format(self) -> str:
+        return self.load_config().get('output', {}).get('format', 'csv')
+
+    @property
+    def output_filename(self) -> str:
+        default_filename = 'test_results.parquet' if self.output_format == 'parquet' else 'test_results.csv'
+        return self.load_config().get('output', {}).get('filename', default_filename)
+
+    @property
+    def output_batch_size(self) -> int:
+        return self.load_config().get('output', {}).get('batch_size', 1000)
+
+    @property
+    def evaluation_batch_size(self) -> int:
+        return self.load_config().get('evaluation_batch_size', 1)
+
+    @property
+    def local_scoring(self) -> Dict[str, Any]:
+        return self.load_config().get('local_scoring', {'enabled': False})
+
+    @property
+    def adaptive_sampling(self) -> Dict[str, Any]:
+        return self.load_config().get('adaptive_sampling', {'enabled': False})
+
+    @property
+    def successive_halving(self) -> Dict[str, Any]:
+        return self.load_config().get('successive_halving', {'enabled': False})
+
+    @property
+    def significance(self) -> Dict[str, Any]:
+        return self.load_config().get('significance', {})
+
+    @property
+    def console(self) -> Dict[str, Any]:
+        return self.load_config().get('console', {})
+
+    @property
+    def jobs(self) -> List[Dict[str, Any]]:
+        return self.load_config().get('jobs') or []
+
+    @property
+    def suite_output(self) -> str:
+        return self.load_config().get('suite_output', 'suite_results.csv')
+
+    @property
+    def distributed(self) -> Dict[str, Any]:
+        return self.load_config().get('distributed', {})
+
+    @property
+    def load_test(self) -> Dict[str, Any]:
+        return self.load_config().get('load_test', {})
+
+    @property
+    def providers(self) -> Dict[str, Dict[str, Any]]:
+        return self.load_config().get('providers', {})
@@ -0,0 +1,160 @@
+import collections
+import os
+import sys
+import time
+from typing import Dict, Any, List, Optional, TextIO
+
+CONSOLE_MODES = ('verbose', 'progress', 'quiet')
+
+
+class _StatusAwareStream:
+    """Stdout wrapper that erases the progress block before anything else is written."""
+
+    def __init__(self, stream: TextIO, console: 'ConsoleOutput'):
+        self._stream = stream
+        self._console = console
+
+    def __getattr__(self, attribute):
+        return getattr(self._stream, attribute)
+
+    def write(self, text: str) -> int:
+        self._console.clear_status()
+        return self._stream.write(text)
+
+
+class ConsoleOutput:
+    """Routes per-test output and draws the live progress view.
+
+    In verbose mode every answer, its token counts and the judge reasoning are
+    printed as before. In progress and quiet modes that output goes to log_file
+    instead; progress mode also redraws a summary at most every refresh_interval
+    seconds: tests completed of planned, ETA, throughput over the last
+    throughput_window seconds, and each model's running score and response time.
+    Model headers, averages and the final report are printed in every mode.
+    """
+
+    def __init__(self):
+        self.mode = 'verbose'
+        self.refresh_interval = 0.5
+        self.throughput_window = 30.0
+        self._log_file: Optional[TextIO] = None
+        self._stdout: Optional[TextIO] = None
+        self._status_lines = 0
+        self._reset_progress()
+
+    def _reset_progress(self) -> None:
+        self.planned_tests = 0
+        self.completed_tests = 0
+        self.restored_tests = 0
+        self.start_time = time.monotonic()
+        self._last_refresh = 0.0
+        self._completion_times = collections.deque()
+        # Model name -> [tests, score total, response time total]
+        self._models: Dict[str, List[float]] = {}
+
+    def configure(self, mode: str = 'verbose', log_file: Optional[str] = None, refresh_interval: float = 0.5,
+                  throughput_window: float = 30.0) -> None:
+        if mode not in CONSOLE_MODES:
+            raise ValueError(f"Unknown console mode '{mode}'. Available modes: {', '.join(CONSOLE_MODES)}")
+        self.close()
+        self.mode = mode
+        self.refresh_interval = refresh_interval
+        self.throughput_window = throughput_window
+        self._reset_progress()
+
+        if mode != 'verbose' and log_file:
+            directory = os.path.dirname(log_file)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._log_file = open(log_file, 'w', encoding='utf-8')
+        if mode == 'progress' and sys.stdout.isatty():
+            # The progress block is redrawn in place, so other output has to erase it first
+            self._stdout = sys.stdout
+            sys.stdout = _StatusAwareStream(self._stdout, self)
+
+    @property
+    def details(self) -> TextIO:
+        """Stream for per-test output: stdout in verbose mode, otherwise the log file (or nowhere)."""
+        if self.mode == 'verbose':
+            return sys.stdout
+        if self._log_file is None:
+            # No log file configured, so per-test output is discarded
+            self._log_file = open(os.devnull, 'w')
+        return self._log_file
+
+    def add_planned_tests(self, planned: int, restored: int = 0) -> None:
+        # Tests restored from a journal count as done, but not towards throughput
+        self.planned_tests += planned
+        self.completed_tests += restored
+        self.restored_tests += restored
+
+    def record_test(self, model_name: str, result: Dict[str, Any]) -> None:
+        now = time.monotonic()
+        self.completed_tests += 1
+        self._completion_times.append(now)
+        model = self._models.setdefault(model_name, [0, 0.0, 0.0])
+        model[0] += 1
+        model[1] += result['evaluation_score']
+        model[2] += result['response_time']
+
+        if self.mode == 'progress' and now - self._last_refresh >= self._refresh_interval():
+            self._last_refresh = now
+            self._draw_status(now)
+
+    def _refresh_interval(self) -> float:
+        # Without a terminal every refresh is a new line, so they are spaced further apart
+        return self.refresh_interval if self._stdout else max(self.refresh_interval, 10.0)
+
+    def get_throughput(self, now: float) -> Optional[float]:
+        while self._completion_times and now - self._completion_times[0] > self.throughput_window:
+            self._completion_times.popleft()
+        elapsed = min(self.throughput_window, now - self.start_time)
+        return len(self._completion_times) / elapsed if elapsed > 0 else None
+
+    def get_status_lines(self, now: float) -> List[str]:
+        throughput = self.get_throughput(now)
+        planned = max(self.planned_tests, self.completed_tests)
+        remaining = planned - self.completed_tests
+        eta = _format_duration(remaining / throughput) if throughput else '--'
+        percent = self.completed_tests / planned * 100 if planned else 0.0
+        rate = f"{throughput:.2f} tests/s" if throughput is not None else '-- tests/s'
+
+        lines = [f"Progress: {self.completed_tests}/{planned} tests ({percent:.0f}%), {rate}, ETA {eta}"]
+        for model_name, (tests, score_total, response_time_total) in self._models.items():
+            lines.append(f"  {model_name}: {tests} tests, score {score_total / tests:.2f}, "
+                         f"response time {response_time_total / tests:.2f}s")
+        return lines
+
+    def _draw_status(self, now: float) -> None:
+        lines = self.get_status_lines(now)
+        if self._stdout is None:
+            print(" | ".join(line.strip() for line in lines), flush=True)
+            return
+        self.clear_status()
+        self._stdout.write("\n".join(lines) + "\n")
+        self._stdout.flush()
+        self._status_lines = len(lines)
+
+    def clear_status(self) -> None:
+        if self._status_lines and self._stdout:
+            # Back to the first line of the block, then erase to the end of the screen
+            self._stdout.write(f"\x1b[{self._status_lines}F\x1b[J")
+            self._status_lines = 0
+
+    def close(self) -> None:
+        if self._stdout:
+            self.clear_status()
+            sys.stdout = self._stdout
+            self._stdout = None
+        if self._log_file:
+            self._log_file.close()
+            self._log_file = None
+
+
+def _format_duration(seconds: float) -> str:
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h{minutes:02d}m{seconds:02d}s" if hours else f"{minutes}m{seconds:02d}s"
+
+
+console = ConsoleOutput()
@@ -0,0 +1,224 @@
+import csv
+import hashlib
+import io
+import itertools
+import json
+import mmap
+import os
+import threading
+from typing import Any, Dict, Iterator, Optional
+
+from evaluators.evaluation_types import EvaluationType
+
+# Field names accepted for the question and expected answer in JSONL and CSV datasets
+QUESTION_FIELDS = ('question', 'prompt', 'input', 'text')
+ANSWER_FIELDS = ('answer', 'expected_answer', 'output')
+METADATA_FIELDS = ('id', 'category', 'evaluation_type')
+DOCUMENT_EXTENSIONS = ('.txt', '.md')
+
+
+def _iter_lines(path: str) -> Iterator[str]:
+    # Memory mapped so large files are paged in by the OS rather than read into memory
+    with open(path, 'rb') as dataset_file:
+        if os.fstat(dataset_file.fileno()).st_size == 0:
+            return
+        with mmap.mmap(dataset_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            for line in iter(mapped.readline, b''):
+                yield line.decode('utf-8')
+
+
+def _make_item(record: Dict[str, Any], source: str) -> Dict[str, Any]:
+    question = next((record[field] for field in QUESTION_FIELDS if record.get(field)), None)
+    if question is None:
+        raise ValueError(f"{source}: no question field (expected one of {', '.join(QUESTION_FIELDS)})")
+    answer = next((record[field] for field in ANSWER_FIELDS if record.get(field) not in (None, '')), None)
+
+    item = {'question': str(question), 'answer': str(answer) if answer is not None else None}
+    for field in METADATA_FIELDS:
+        if record.get(field) not in (None, ''):
+            item[field] = str(record[field])
+    if 'evaluation_type' in item and item['evaluation_type'] not in EvaluationType.__members__:
+        raise ValueError(
+            f"{source}: unknown evaluation_type '{item['evaluation_type']}'. "
+            f"Available types: {', '.join(EvaluationType.__members__)}"
+        )
+    return item
+
+
+def read_qa_text(path: str) -> Iterator[Dict[str, Any]]:
+    """Q:/A: blocks separated by blank lines; the A: line is optional."""
+    block = []
+    for line in itertools.chain(_iter_lines(path), ['']):
+        if line.strip():
+            block.append(line.rstrip('\r\n'))
+            continue
+        if block and block[0].startswith('Q: '):
+            if len(block) >= 2 and block[1].startswith('A: '):
+                yield {'question': block[0][3:], 'answer': block[1][3:]}
+            elif len(block) == 1:
+                yield {'question': block[0][3:], 'answer': None}
+        block = []
+
+
+def read_jsonl(path: str) -> Iterator[Dict[str, Any]]:
+    for line_number, line in enumerate(_iter_lines(path), 1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"{path}:{line_number}: invalid JSON ({e.msg})")
+        yield _make_item(record, f"{path}:{line_number}")
+
+
+def read_csv(path: str) -> Iterator[Dict[str, Any]]:
+    with open(path, 'r', newline='', encoding='utf-8') as csv_file:
+        for row_number, row in enumerate(csv.DictReader(csv_file), 2):
+            yield _make_item(row, f"{path}:{row_number}")
+
+
+def read_document(path: str, item_id: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    # A whole document is one summarisation item
+    with io.open(path, 'r', encoding='utf-8') as document_file:
+        content = document_file.read().strip()
+    if content:
+        yield {'question': content, 'answer': None, 'id': item_id or os.path.basename(path)}
+
+
+def read_directory(path: str) -> Iterator[Dict[str, Any]]:
+    """Every document in the directory tree, in sorted path order, identified by its relative path."""
+    for root, directories, files in os.walk(path):
+        directories.sort()
+        for filename in sorted(files):
+            if filename.lower().endswith(DOCUMENT_EXTENSIONS):
+                document_path = os.path.join(root, filename)
+                yield from read_document(document_path, os.path.relpath(document_path, path))
+
+
+def iter_dataset_file(path: str) -> Iterator[Dict[str, Any]]:
+    """Yields the items of a dataset file or directory, picking the reader by type and name."""
+    filename = os.path.basename(path).lower()
+    if os.path.isdir(path):
+        return read_directory(path)
+    if filename.endswith('.jsonl'):
+        return read_jsonl(path)
+    if filename.endswith('.csv'):
+        return read_csv(path)
+    if 'summarise_' in filename:
+        return read_document(path)
+    if 'questions_' in filename:
+        return read_qa_text(path)
+    raise ValueError(
+        f"Cannot tell the format of dataset '{path}'. Use a .jsonl or .csv file, a directory of documents, "
+        "or a text file named questions_* (Q/A blocks) or summarise_* (one document)"
+    )
+
+
+def _sample_key(seed: int, item: Dict[str, Any], index: int) -> float:
+    # Items are identified by id when they have one, so sampling is stable when a dataset is reordered
+    key = item.get('id', str(index))
+    return int(hashlib.sha256(f"{seed}\x00{key}".encode('utf-8')).hexdigest()[:15], 16) / 16 ** 15
+
+
+class Dataset:
+    """Lazily streamed dataset that can be iterated any number of times.
+
+    Every pass re-reads the source, so memory does not grow with the dataset.
+    Sampling and sharding are deterministic: an item is kept when a hash of
+    its id (or position) and seed is below fraction, and belongs to shard
+    shard_index of shard_count by the same hash. Items with an evaluation_type
+    other than the suite's are skipped. len() streams once and is cached.
+    Indexing streams from the position of the previous lookup when it can, so
+    ascending lookups cost one pass in total; prefer iterating over indexing.
+    """
+
+    def __init__(self, path: str, evaluation_type: Optional[EvaluationType] = None, fraction: float = 1.0,
+                 max_items: Optional[int] = None, seed: int = 0, shard_index: int = 0, shard_count: int = 1):
+        if not 0 < fraction <= 1:
+            raise ValueError("Dataset sampling fraction must be in (0, 1]")
+        if not 0 <= shard_index < shard_count:
+            raise ValueError("Dataset shard_index must be in [0, shard_count)")
+        self.path = path
+        self.evaluation_type = evaluation_type
+        self.fraction = fraction
+        self.max_items = max_items
+        self.seed = seed
+        self.shard_index = shard_index
+        self.shard_count = shard_count
+        self._length = None
+        # (index of the next item, iterator positioned there) left by the last lookup
+        self._cursor = None
+        self._cursor_lock = threading.Lock()
+
+    def _keep(self, item: Dict[str, Any], index: int) -> bool:
+        if self.evaluation_type and item.get('evaluation_type', self.evaluation_type.name) != self.evaluation_type.name:
+            return False
+        if self.fraction == 1 and self.shard_count == 1:
+            return True
+        key = _sample_key(self.seed, item, index)
+        # The fraction and shard use separate parts of the hash so shards stay balanced when sampling
+        return key < self.fraction and int(key * 16 ** 15) % self.shard_count == self.shard_index
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        items = (item for index, item in enumerate(iter_dataset_file(self.path)) if self._keep(item, index))
+        return itertools.islice(items, self.max_items)
+
+    def __len__(self) -> int:
+        if self._length is None:
+            self._length = sum(1 for _ in self)
+        return self._length
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return DatasetSlice(self, *key.indices(len(self))[:2])
+        if key < 0:
+            key += len(self)
+        if key < 0:
+            raise IndexError("Dataset index out of range")
+        with self._cursor_lock:
+            position, items = self._cursor if self._cursor and self._cursor[0] <= key else (0, iter(self))
+            item = next(itertools.islice(items, key - position, None), None)
+            self._cursor = (key + 1, items) if item is not None else None
+        if item is None:
+            raise IndexError("Dataset index out of range")
+        return item
+
+
+class DatasetSlice:
+    """A contiguous, re-iterable range of a Dataset's items."""
+
+    def __init__(self, dataset: Dataset, start: int, stop: int):
+        self.dataset = dataset
+        self.start = start
+        self.stop = max(start, stop)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return itertools.islice(self.dataset, self.start, self.stop)
+
+    def __len__(self) -> int:
+        return self.stop - self.start
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            start, stop, _ = key.indices(len(self))
+            return DatasetSlice(self.dataset, self.start + start, self.start + stop)
+        if key < 0:
+            key += len(self)
+        if not 0 <= key < len(self):
+            raise IndexError("Dataset index out of range")
+        return self.dataset[self.start + key]
+
+
+def load_dataset(path: str, evaluation_type: Optional[EvaluationType] = None,
+                 sampling: Optional[Dict[str, Any]] = None) -> Dataset:
+    sampling = sampling or {}
+    return Dataset(
+        path,
+        evaluation_type,
+        sampling.get('fraction', 1.0),
+        sampling.get('max_items'),
+        sampling.get('seed', 0),
+        sampling.get('shard_index', 0),
+        sampling.get('shard_count', 1)
+    )
+
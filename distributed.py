@@ -0,0 +1,67 @@
+import hashlib
+import os
+import subprocess
+import sys
+from typing import Any, Dict, List
+
+MAIN_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'main.py')
+
+
+def shard_of(model_name: str, question_num: int, test_num: int, shard_count: int) -> int:
+    """Deterministic shard of one (model, question, repetition) work item.
+
+    Hashing spreads every model's questions and repetitions over all shards,
+    so each worker gets a similar mix of fast and slow models.
+    """
+    key = f"{model_name}\x00{question_num}\x00{test_num}".encode('utf-8')
+    return int(hashlib.sha256(key).hexdigest()[:15], 16) % shard_count
+
+
+def shard_journal_path(journal_path: str, journal_dir: str, shard_index: int, shard_count: int) -> str:
+    base, extension = os.path.splitext(os.path.basename(journal_path))
+    return os.path.join(journal_dir, f"{base}.shard-{shard_index}-of-{shard_count}{extension or '.jsonl'}")
+
+
+def worker_provider_settings(providers: Dict[str, Dict[str, Any]], workers: List[Dict[str, Any]],
+                             shard_index: int) -> Dict[str, Dict[str, Any]]:
+    # Per-worker settings (e.g. one LM Studio instance per worker) override the shared provider settings
+    overrides = workers[shard_index].get('providers', {}) if shard_index < len(workers) else {}
+    return {
+        name: {**providers.get(name, {}), **overrides.get(name, {})}
+        for name in set(providers) | set(overrides)
+    }
+
+
+def run_workers(config_path: str, shard_count: int, log_dir: str, resume: bool = False) -> None:
+    """Runs shard_count local worker processes and waits for all of them.
+
+    Each worker's console output goes to a log file next to its journal.
+    Workers on one machine run at the same time, so power is not measured.
+    """
+    os.makedirs(log_dir, exist_ok=True)
+    processes = []
+    for shard_index in range(shard_count):
+        command = [
+            sys.executable, MAIN_SCRIPT, '--config', config_path,
+            '--shard-index', str(shard_index), '--shard-count', str(shard_count), '--no-powermetrics',
+            # Per-test output goes to the worker's own log file
+            '--verbose'
+        ]
+        if resume:
+            command.append('--resume')
+        log_path = os.path.join(log_dir, f"worker-{shard_index}-of-{shard_count}.log")
+        log_file = open(log_path, 'w', encoding='utf-8')
+        processes.append((shard_index, log_path, log_file, subprocess.Popen(command, stdout=log_file, stderr=subprocess.STDOUT)))
+        print(f"Started worker {shard_index + 1}/{shard_count} (log: {log_path})")
+
+    failed = []
+    for shard_index, log_path, log_file, process in processes:
+        return_code = process.wait()
+        log_file.close()
+        if return_code != 0:
+            failed.append(f"worker {shard_index + 1} (exit code {return_code}, see {log_path})")
+        else:
+            print(f"Worker {shard_index + 1}/{shard_count} finished")
+
+    if failed:
+        raise RuntimeError(f"Shard workers failed: {', '.join(failed)}. Rerun with --resume to retry their remaining tests")
@@ -0,0 +1,105 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Dict, Any, Optional
+
+
+class EvaluationCache:
+    """Persistent, size-bounded LRU cache of evaluator judgments backed by SQLite.
+
+    Entries are keyed on everything that can change a judgment: the evaluator
+    and its model, a hash of the evaluator prompt template, the question, the
+    expected answer and the normalized answer being judged.
+    """
+
+    def __init__(self, path: str = '.cache/evaluations.sqlite', max_entries: int = 10000):
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS evaluations ("
+            "key TEXT PRIMARY KEY, score TEXT NOT NULL, reasoning TEXT NOT NULL, last_used REAL NOT NULL)"
+        )
+        self._connection.execute("CREATE INDEX IF NOT EXISTS idx_evaluations_last_used ON evaluations (last_used)")
+        self._connection.commit()
+        self._size = self._connection.execute("SELECT COUNT(*) FROM evaluations").fetchone()[0]
+
+    @staticmethod
+    def normalize_answer(answer: str) -> str:
+        return re.sub(r'\s+', ' ', answer or '').strip().casefold()
+
+    @classmethod
+    def make_key(cls, evaluator: str, evaluator_model: str, template_hash: str, question: str,
+                 expected_answer: Optional[str], answer: str) -> str:
+        payload = json.dumps([
+            evaluator, evaluator_model, template_hash, question,
+            expected_answer or '', cls.normalize_answer(answer)
+        ])
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT score, reasoning FROM evaluations WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self._connection.execute("UPDATE evaluations SET last_used = ? WHERE key = ?", (time.time(), key))
+            self._connection.commit()
+            return {'score': row[0], 'reasoning': row[1]}
+
+    def put(self, key: str, evaluation: Dict[str, Any]) -> None:
+        with self._lock:
+            exists = self._connection.execute(
+                "SELECT 1 FROM evaluations WHERE key = ?", (key,)
+            ).fetchone() is not None
+            self._connection.execute(
+                "INSERT OR REPLACE INTO evaluations (key, score, reasoning, last_used) VALUES (?, ?, ?, ?)",
+                (key, str(evaluation['score']), evaluation['reasoning'], time.time())
+            )
+            if not exists:
+                self._size += 1
+            self._evict()
+            self._connection.commit()
+
+    def _evict(self) -> None:
+        excess = self._size - self.max_entries
+        if excess <= 0:
+            return
+        self._connection.execute(
+            "DELETE FROM evaluations WHERE key IN (SELECT key FROM evaluations ORDER BY last_used ASC LIMIT ?)",
+            (excess,)
+        )
+        self._size -= excess
+        self.evictions += excess
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0,
+            'evictions': self.evictions,
+            'entries': self._size,
+            'max_entries': self.max_entries
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
@@ -1,32 +1,153 @@
+import hashlib
 import importlib
-from typing import Dict, Any, Union, Optional
+from typing import Dict, Any, List, Union, Optional
 from evaluators.evaluation_types import EvaluationType
+from evaluators.local_scorer import LocalScorer
+from evaluators import judging
+from evaluation_cache import EvaluationCache
+from console_output import console
 
 
 class EvaluationManager:
-    def __init__(self, evaluation_type: EvaluationType, evaluator: str, evaluator_model: str):
+    def __init__(self, evaluation_type: EvaluationType, evaluator: str, evaluator_model: str,
+                 cache: Optional[EvaluationCache] = None, batch_size: int = 1,
+                 local_scorer: Optional[LocalScorer] = None):
         self.evaluation_type = evaluation_type
         self.evaluator = evaluator
         self.evaluator_model = evaluator_model
-        self.evaluate_function = self._load_evaluator()
+        self.cache = cache
+        self.batch_size = batch_size
+        # Deterministic scoring only applies to short factual answers
+        self.local_scorer = local_scorer if evaluation_type == EvaluationType.SIMPLE_QUESTION else None
+        self.scored_by_counts = {'local': 0, 'cache': 0, 'judge': 0}
+        self.judge_requests = 0
+        self.evaluator_module = self._load_evaluator()
+        self.evaluate_function = self.evaluator_module.evaluate
+        self.evaluate_async_function = self.evaluator_module.evaluate_async
+        self.template_hash = self._hash_prompt_template()
     
     def _load_evaluator(self):
         try:
-            evaluator_module = importlib.import_module(f'evaluators.{self.evaluation_type.value}')
-            return evaluator_module.evaluate
+            return importlib.import_module(f'evaluators.{self.evaluation_type.value}')
         except ImportError:
             raise ValueError(f"Evaluator '{self.evaluation_type.value}' not found. Available evaluators: problem_solving, simple_question")
     
+    def _hash_prompt_template(self) -> str:
+        module = self.evaluator_module
+        template = '\n'.join([
+            module.system_prompt, module.prompt_template,
+            module.batch_system_prompt, module.batch_prompt_template,
+            str(module.temperature), str(module.max_output_tokens)
+        ])
+        return hashlib.sha256(template.encode('utf-8')).hexdigest()
+
+    def _cache_key(self, question: str, expected_answer: Optional[str], actual_answer: str) -> Optional[str]:
+        if self.cache is None:
+            return None
+        return self.cache.make_key(
+            self.evaluator, self.evaluator_model, self.template_hash,
+            question, expected_answer, actual_answer
+        )
+    
     def evaluate_response(self, question: str, expected_answer: Optional[str], 
                          actual_answer: str) -> Dict[str, Any]:
-        evaluation = self.evaluate_function(
-            evaluator=self.evaluator,
-            evaluator_model=self.evaluator_model,
-            question=question,
-            expected_answer=expected_answer,
-            answer=actual_answer
+        return self.evaluate_responses(question, expected_answer, [actual_answer])[0]
+    
+    async def evaluate_response_async(self, question: str, expected_answer: Optional[str],
+                                      actual_answer: str) -> Dict[str, Any]:
+        return (await self.evaluate_responses_async(question, expected_answer, [actual_answer]))[0]
+
+    def evaluate_responses(self, question: str, expected_answer: Optional[str],
+                           actual_answers: List[str]) -> List[Dict[str, Any]]:
+        """Evaluate several answers to the same question, batch_size answers per evaluator request."""
+        evaluations, cache_keys, batches = self._resolve_without_judge(question, expected_answer, actual_answers)
+        results = [self._judge(question, expected_answer, [actual_answers[i] for i in batch]) for batch in batches]
+        return self._store_judged(evaluations, cache_keys, batches, results)
+
+    async def evaluate_responses_async(self, question: str, expected_answer: Optional[str],
+                                       actual_answers: List[str]) -> List[Dict[str, Any]]:
+        evaluations, cache_keys, batches = self._resolve_without_judge(question, expected_answer, actual_answers)
+        results = [await self._judge_async(question, expected_answer, [actual_answers[i] for i in batch]) for batch in batches]
+        return self._store_judged(evaluations, cache_keys, batches, results)
+
+    def _judge(self, question: str, expected_answer: Optional[str], answers: List[str]):
+        if len(answers) == 1:
+            return [self.evaluate_function(
+                evaluator=self.evaluator, evaluator_model=self.evaluator_model,
+                question=question, expected_answer=expected_answer, answer=answers[0]
+            )], 1
+        return judging.evaluate_batch(
+            self.evaluator_module, evaluator=self.evaluator, evaluator_model=self.evaluator_model,
+            question=question, expected_answer=expected_answer, answers=answers
+        )
+
+    async def _judge_async(self, question: str, expected_answer: Optional[str], answers: List[str]):
+        if len(answers) == 1:
+            return [await self.evaluate_async_function(
+                evaluator=self.evaluator, evaluator_model=self.evaluator_model,
+                question=question, expected_answer=expected_answer, answer=answers[0]
+            )], 1
+        return await judging.evaluate_batch_async(
+            self.evaluator_module, evaluator=self.evaluator, evaluator_model=self.evaluator_model,
+            question=question, expected_answer=expected_answer, answers=answers
         )
-        
+
+    def _store_judged(self, evaluations: List[Optional[Dict[str, Any]]], cache_keys: List[Optional[str]],
+                      batches: List[List[int]], results) -> List[Dict[str, Any]]:
+        for batch, (batch_evaluations, requests) in zip(batches, results):
+            self.judge_requests += requests
+            for i, evaluation in zip(batch, batch_evaluations):
+                evaluations[i] = self._store_evaluation(cache_keys[i], evaluation)
+        return evaluations
+
+    def _resolve_without_judge(self, question: str, expected_answer: Optional[str], actual_answers: List[str]):
+        # Local scoring first as it is cheapest, then the cache; anything left needs the judge
+        evaluations = [None] * len(actual_answers)
+        cache_keys = [self._cache_key(question, expected_answer, answer) for answer in actual_answers]
+        pending = []
+        for i, (answer, cache_key) in enumerate(zip(actual_answers, cache_keys)):
+            local = self.local_scorer.score(expected_answer, answer) if self.local_scorer else None
+            cached = self.cache.get(cache_key) if cache_key and not local else None
+            if local:
+                evaluations[i] = {**local, 'scored_by': 'local'}
+            elif cached:
+                evaluations[i] = {**cached, 'scored_by': 'cache'}
+            else:
+                pending.append(i)
+                continue
+            self.scored_by_counts[evaluations[i]['scored_by']] += 1
+        return evaluations, cache_keys, self._batches(pending)
+
+    def _batches(self, indices: List[int]) -> List[List[int]]:
+        size = max(1, self.batch_size)
+        return [indices[i:i + size] for i in range(0, len(indices), size)]
+
+    def get_scoring_summary(self) -> Dict[str, int]:
+        return {
+            **self.scored_by_counts,
+            'judge_requests': self.judge_requests,
+            'judge_calls_saved': self.scored_by_counts['local'] + self.scored_by_counts['cache']
+        }
+
+    def _store_evaluation(self, cache_key: Optional[str], evaluation: Union[Dict[str, Any], str]) -> Dict[str, Any]:
+        self.scored_by_counts['judge'] += 1
+        formatted = self._format_evaluation(evaluation)
+        if cache_key and self._is_cacheable(evaluation, formatted):
+            self.cache.put(cache_key, formatted)
+        return {**formatted, 'scored_by': 'judge'}
+
+    @staticmethod
+    def _is_cacheable(evaluation: Union[Dict[str, Any], str], formatted: Dict[str, Any]) -> bool:
+        # A malformed judge reply would otherwise fix that answer's score on every later run
+        if isinstance(evaluation, dict) and evaluation.get('parse_error'):
+            return False
+        try:
+            float(formatted['score'])
+        except (TypeError, ValueError):
+            return False
+        return True
+    
+    def _format_evaluation(self, evaluation: Union[Dict[str, Any], str]) -> Dict[str, Any]:
         # Handle both old format (string) and new format (dict)
         if isinstance(evaluation, dict):
             return {
@@ -40,7 +161,8 @@ class EvaluationManager:
             }
     
     def display_evaluation_results(self, evaluation_result: Dict[str, Any]) -> None:
-        print("Evaluating Response...")
-        print(f"Evaluation Score: {evaluation_result['score']}")
-        print(f"Evaluation Reasoning: {evaluation_result['reasoning']}")
-        print("-" * 50)
\ No newline at end of file
+        print("Evaluating Response...", file=console.details)
+        print(f"Evaluation Score: {evaluation_result['score']}", file=console.details)
+        print(f"Evaluation Reasoning: {evaluation_result['reasoning']}", file=console.details)
+        print(f"Scored By: {evaluation_result['scored_by']}", file=console.details)
+        print("-" * 50, file=console.details)
\ No newline at end of file
@@ -0,0 +1,58 @@
+import json
+from providers.registry import registry
+
+
+def call_evaluator(evaluator, evaluator_model, system, prompt, temperature, output_tokens):
+    if (evaluator == 'lmstudio'):
+        # Local evaluators keep the default output limit so reasoning models can finish thinking
+        response = registry.call(evaluator, evaluator_model, system, prompt, temperature)
+    else:
+        response = registry.call(evaluator, evaluator_model, system, prompt, temperature, output_tokens)
+    return response["response"]
+
+async def call_evaluator_async(evaluator, evaluator_model, system, prompt, temperature, output_tokens):
+    if (evaluator == 'lmstudio'):
+        response = await registry.call_async(evaluator, evaluator_model, system, prompt, temperature)
+    else:
+        response = await registry.call_async(evaluator, evaluator_model, system, prompt, temperature, output_tokens)
+    return response["response"]
+
+def parse_batch_evaluation(evaluation_text, answer_count):
+    # Returns None unless every answer got exactly one score in [0, 1], so callers can fall back
+    try:
+        evaluations = json.loads(evaluation_text[evaluation_text.index('['):evaluation_text.rindex(']') + 1])
+        by_answer = {int(e['answer']): e for e in evaluations}
+        if len(evaluations) != answer_count or set(by_answer) != set(range(1, answer_count + 1)):
+            return None
+        parsed = []
+        for answer in range(1, answer_count + 1):
+            score = float(by_answer[answer]['score'])
+            if not 0.0 <= score <= 1.0:
+                return None
+            parsed.append({'score': str(score), 'reasoning': str(by_answer[answer].get('reasoning') or 'No reasoning provided')})
+        return parsed
+    except (ValueError, KeyError, TypeError, AttributeError):
+        return None
+
+def _batch_request(evaluator_module, question, answers, expected_answer):
+    prompt = evaluator_module.build_batch_prompt(question, answers, expected_answer)
+    return evaluator_module.batch_system_prompt, prompt, evaluator_module.max_output_tokens * len(answers)
+
+def evaluate_batch(evaluator_module, evaluator, evaluator_model, question, answers, expected_answer):
+    """Judge several answers in one request; returns the evaluations and the number of requests made."""
+    system, prompt, output_tokens = _batch_request(evaluator_module, question, answers, expected_answer)
+    evaluation_text = call_evaluator(evaluator, evaluator_model, system, prompt, evaluator_module.temperature, output_tokens)
+    evaluations = parse_batch_evaluation(evaluation_text, len(answers))
+    if evaluations is None:
+        evaluations = [evaluator_module.evaluate(evaluator, evaluator_model, question, answer, expected_answer) for answer in answers]
+        return evaluations, 1 + len(answers)
+    return evaluations, 1
+
+async def evaluate_batch_async(evaluator_module, evaluator, evaluator_model, question, answers, expected_answer):
+    system, prompt, output_tokens = _batch_request(evaluator_module, question, answers, expected_answer)
+    evaluation_text = await call_evaluator_async(evaluator, evaluator_model, system, prompt, evaluator_module.temperature, output_tokens)
+    evaluations = parse_batch_evaluation(evaluation_text, len(answers))
+    if evaluations is None:
+        evaluations = [await evaluator_module.evaluate_async(evaluator, evaluator_model, question, answer, expected_answer) for answer in answers]
+        return evaluations, 1 + len(answers)
+    return evaluations, 1
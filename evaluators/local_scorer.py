@@ -0,0 +1,121 @@
+import math
+import re
+from typing import Callable, Dict, List, Optional, Tuple
+
+NUMBER_WORDS = {
+    'zero': 0, 'one': 1, 'two': 2, 'three': 3, 'four': 4, 'five': 5, 'six': 6, 'seven': 7,
+    'eight': 8, 'nine': 9, 'ten': 10, 'eleven': 11, 'twelve': 12, 'thirteen': 13,
+    'fourteen': 14, 'fifteen': 15, 'sixteen': 16, 'seventeen': 17, 'eighteen': 18,
+    'nineteen': 19, 'twenty': 20
+}
+
+UNIT_ALIASES = {
+    'm': 'm', 'meter': 'm', 'meters': 'm', 'metre': 'm', 'metres': 'm',
+    'km': 'km', 'kilometer': 'km', 'kilometers': 'km', 'kilometre': 'km', 'kilometres': 'km',
+    'cm': 'cm', 'mm': 'mm',
+    'ft': 'ft', 'foot': 'ft', 'feet': 'ft',
+    'mi': 'mi', 'mile': 'mi', 'miles': 'mi',
+    'kg': 'kg', 'kilogram': 'kg', 'kilograms': 'kg',
+    'g': 'g', 'gram': 'g', 'grams': 'g',
+    's': 's', 'sec': 's', 'second': 's', 'seconds': 's',
+    'min': 'min', 'minute': 'min', 'minutes': 'min',
+    'h': 'h', 'hr': 'h', 'hour': 'h', 'hours': 'h',
+    '%': '%', 'percent': '%'
+}
+
+NUMBER_PATTERN = re.compile(
+    r'(?<![\w.])(-?(?:\d{1,3}(?:,\d{3})+|\d+)(?:\.\d+)?|-?\.\d+)\s*([a-zA-Z%]+)?'
+)
+THINK_PATTERN = re.compile(r'<think>.*?</think>', re.DOTALL | re.IGNORECASE)
+# An explicit final answer, e.g. "Final answer: 42" or "The result is 42."
+FINAL_ANSWER_PATTERN = re.compile(
+    r'\b(?:final answer|answer|result)\s*(?:is|:|=)\s*(.+?)\s*$', re.IGNORECASE | re.MULTILINE
+)
+ARTICLE_PATTERN = re.compile(r'\b(the|a|an)\b')
+
+# A rule returns (score, reasoning) when it can decide confidently, otherwise None
+ScoringRule = Callable[[str, str], Optional[Tuple[float, str]]]
+
+
+def normalize_text(text: str) -> str:
+    text = THINK_PATTERN.sub(' ', text or '').casefold()
+    text = ARTICLE_PATTERN.sub(' ', text)
+    text = re.sub(r'[^\w\s%.-]', ' ', text)
+    return re.sub(r'\s+', ' ', text).strip(' .')
+
+
+def final_answer_text(answer: str) -> str:
+    """The answer on its own: the last explicit final answer if there is one, otherwise the whole answer."""
+    text = THINK_PATTERN.sub(' ', answer or '').strip()
+    matches = FINAL_ANSWER_PATTERN.findall(text)
+    if matches:
+        text = matches[-1]
+    return text.strip('*_`"\' ')
+
+
+def parse_quantity(text: str) -> Optional[Tuple[float, Optional[str]]]:
+    """Returns (value, unit) when text is only a number with an optional known unit.
+
+    Anything else, including ordinals ("3rd"), negations ("not 3") and hedges
+    ("maybe 3?"), returns None.
+    """
+    text = (text or '').strip().rstrip('.')
+    match = NUMBER_PATTERN.fullmatch(text)
+    if match:
+        unit = match.group(2).casefold() if match.group(2) else None
+        if unit and unit not in UNIT_ALIASES:
+            return None
+        return float(match.group(1).replace(',', '')), UNIT_ALIASES.get(unit)
+    if text.casefold() in NUMBER_WORDS:
+        return float(NUMBER_WORDS[text.casefold()]), None
+    return None
+
+
+def exact_match_rule(expected_answer: str, answer: str) -> Optional[Tuple[float, str]]:
+    if normalize_text(answer) == normalize_text(expected_answer):
+        return 1.0, "Local exact match with the expected answer"
+    return None
+
+
+def make_numeric_rule(relative_tolerance: float = 1e-6, absolute_tolerance: float = 1e-9) -> ScoringRule:
+    def numeric_rule(expected_answer: str, answer: str) -> Optional[Tuple[float, str]]:
+        expected = parse_quantity(expected_answer)
+        if expected is None:
+            return None
+        expected_value, expected_unit = expected
+
+        # Only an answer that is just the quantity is unambiguous; anything else goes to the judge
+        found = parse_quantity(final_answer_text(answer))
+        if found is None:
+            return None
+        value, unit = found
+        if unit and expected_unit and unit != expected_unit:
+            return None
+
+        if math.isclose(value, expected_value, rel_tol=relative_tolerance, abs_tol=absolute_tolerance):
+            return 1.0, f"Local numeric match: {value:g} equals expected {expected_value:g}"
+        return 0.0, f"Local numeric mismatch: {value:g} does not equal expected {expected_value:g}"
+
+    return numeric_rule
+
+
+class LocalScorer:
+    """Scores answers without the LLM judge when a rule can decide confidently.
+
+    Rules are tried in order and the first confident decision wins. Answers no
+    rule can decide are left for the judge.
+    """
+
+    def __init__(self, rules: Optional[List[ScoringRule]] = None, numeric_tolerance: float = 1e-6):
+        self.rules = rules if rules is not None else [exact_match_rule, make_numeric_rule(numeric_tolerance)]
+
+    def score(self, expected_answer: Optional[str], answer: str) -> Optional[Dict[str, str]]:
+        if not expected_answer or answer is None:
+            return None
+
+        for rule in self.rules:
+            decision = rule(expected_answer, answer)
+            if decision is not None:
+                score, reasoning = decision
+                return {'score': f"{score:g}", 'reasoning': reasoning}
+        return None
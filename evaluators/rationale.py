@@ -1,22 +1,16 @@
-from providers.anthropic import call_anthropic_model
-from providers.openai import call_openai_model
-from providers.lmstudio import call_lmstudio_model
+from evaluators.judging import call_evaluator, call_evaluator_async
 
-def evaluate(evaluator, evaluator_model, question, answer, expected_answer):
-
-    temperature = 0.2
-    max_output_tokens = 200
+temperature = 0.2
+max_output_tokens = 200
 
-    system_prompt = f"""
+system_prompt = """
     You are an expert evaluator specialising in assessing answer accuracy and reasoning quality.
     Focus solely on comparing the given answer to the expected answer.
     Ignore formatting, style, or extra information unless it affects correctness.
     You must respond with a numeric score between 0.0 and 1.0, followed by a pipe symbol (|), then a brief one-sentence reasoning for your evaluation.
     """
 
-    prompt = f"""
-    Please evaluate the ANSWER to a QUESTION by comparing it to the EXPECTED ANSWER. Assess both correctness and quality of reasoning. Rate from 0.0 to 1.0:
-
+rubric = """
     **Rating Scale:**
     - 1.0: Correct answer with excellent, logical, and accurate rationale
     - 0.8: Correct answer with good rationale that may have minor gaps or unclear elements
@@ -28,7 +22,11 @@ def evaluate(evaluator, evaluator_model, question, answer, expected_answer):
     **Evaluation Criteria:**
     - **Correctness**: Does the answer match the expected answer?
     - **Rationale Quality**: Is the reasoning logical, accurate, and well-explained?
+"""
 
+prompt_template = """
+    Please evaluate the ANSWER to a QUESTION by comparing it to the EXPECTED ANSWER. Assess both correctness and quality of reasoning. Rate from 0.0 to 1.0:
+""" + rubric + """
     ORIGINAL QUESTION:
     {question}
 
@@ -41,16 +39,37 @@ def evaluate(evaluator, evaluator_model, question, answer, expected_answer):
     Only provide the numeric score followed by a pipe symbol and brief reasoning (e.g. "0.8|Correct answer with good logical reasoning but minor gaps in explanation.").
     """
 
-    if (evaluator == 'lmstudio'):
-        response = call_lmstudio_model(evaluator_model, system_prompt, prompt, temperature)
-        evaluation_text = response["response"]
-    elif (evaluator == 'openai'):
-        response = call_openai_model(evaluator_model, system_prompt, prompt, temperature, max_output_tokens)
-        evaluation_text = response["response"]
-    elif (evaluator == 'anthropic'):
-        response = call_anthropic_model(evaluator_model, system_prompt, prompt, temperature, max_output_tokens)
-        evaluation_text = response["response"]
+batch_system_prompt = """
+    You are an expert evaluator specialising in assessing answer accuracy and reasoning quality.
+    Focus solely on comparing each given answer to the expected answer, judging every answer independently.
+    Ignore formatting, style, or extra information unless it affects correctness.
+    You must respond with a JSON array only, containing a numeric score between 0.0 and 1.0 and a brief one-sentence reasoning for each answer.
+    """
+
+batch_prompt_template = """
+    Please evaluate each of the numbered ANSWERS to a QUESTION by comparing it to the EXPECTED ANSWER. Assess both correctness and quality of reasoning. Rate from 0.0 to 1.0:
+""" + rubric + """
+    ORIGINAL QUESTION:
+    {question}
 
+    EXPECTED ANSWER:
+    {expected_answer}
+
+    ANSWERS TO EVALUATE:
+    {answers}
+
+    Respond with a JSON array containing one object per answer, in the same order, e.g.
+    [{{"answer": 1, "score": 0.8, "reasoning": "Correct answer with good logical reasoning but minor gaps in explanation."}}]
+    """
+
+def build_prompt(question, answer, expected_answer):
+    return prompt_template.format(question=question, expected_answer=expected_answer, answer=answer)
+
+def build_batch_prompt(question, answers, expected_answer):
+    numbered_answers = "\n\n".join(f"[ANSWER {i}]\n{answer}" for i, answer in enumerate(answers, 1))
+    return batch_prompt_template.format(question=question, expected_answer=expected_answer, answers=numbered_answers)
+
+def parse_evaluation(evaluation_text):
     # Parse the response to extract score and reasoning
     try:
         if '|' in evaluation_text:
@@ -60,5 +79,14 @@ def evaluate(evaluator, evaluator_model, question, answer, expected_answer):
             # Fallback if no pipe delimiter found
             return {'score': evaluation_text.strip(), 'reasoning': 'No reasoning provided'}
     except:
-        return {'score': '0.0', 'reasoning': 'Error parsing evaluation response'}
+        return {'score': '0.0', 'reasoning': 'Error parsing evaluation response', 'parse_error': True}
+
+def evaluate(evaluator, evaluator_model, question, answer, expected_answer):
+    prompt = build_prompt(question, answer, expected_answer)
+    evaluation_text = call_evaluator(evaluator, evaluator_model, system_prompt, prompt, temperature, max_output_tokens)
+    return parse_evaluation(evaluation_text)
 
+async def evaluate_async(evaluator, evaluator_model, question, answer, expected_answer):
+    prompt = build_prompt(question, answer, expected_answer)
+    evaluation_text = await call_evaluator_async(evaluator, evaluator_model, system_prompt, prompt, temperature, max_output_tokens)
+    return parse_evaluation(evaluation_text)
@@ -1,29 +1,27 @@
-from providers.anthropic import call_anthropic_model
-from providers.openai import call_openai_model
-from providers.lmstudio import call_lmstudio_model
+from evaluators.judging import call_evaluator, call_evaluator_async
 
-def evaluate(evaluator, evaluator_model, question, answer, expected_answer):
-
-    temperature = 0.2
-    max_output_tokens = 200
+temperature = 0.2
+max_output_tokens = 200
 
-    system_prompt = f"""
+system_prompt = """
     You are an expert evaluator specialising in assessing answer accuracy.
     Focus only on comparing the given answer to the expected answer.
     Ignore formatting, style, or extra information unless it affects correctness.
     You must respond with a numeric score of either 0 or 1 only.
     """
 
-    prompt = f"""
-    Please evaluate the ANSWER to a QUESTION by comparing it to the EXPECTED ANSWER:
-
+rubric = """
     **Rating Scale:**
     - 1: Correct answer
     - 0: Incorrect answer
 
     **Evaluation Criteria:**
     - **Correctness**: Does the answer match the expected answer exactly?
+"""
 
+prompt_template = """
+    Please evaluate the ANSWER to a QUESTION by comparing it to the EXPECTED ANSWER:
+""" + rubric + """
     ORIGINAL QUESTION:
     {question}
 
@@ -36,16 +34,37 @@ def evaluate(evaluator, evaluator_model, question, answer, expected_answer):
     Respond with the numeric score only.
     """
 
-    if (evaluator == 'lmstudio'):
-        response = call_lmstudio_model(evaluator_model, system_prompt, prompt, temperature)
-        evaluation_text = response["response"]
-    if (evaluator == 'openai'):
-        response = call_openai_model(evaluator_model, system_prompt, prompt, temperature, max_output_tokens)
-        evaluation_text = response["response"]
-    elif (evaluator == 'anthropic'):
-        response = call_anthropic_model(evaluator_model, system_prompt, prompt, temperature, max_output_tokens)
-        evaluation_text = response["response"]
+batch_system_prompt = """
+    You are an expert evaluator specialising in assessing answer accuracy.
+    Focus only on comparing each given answer to the expected answer, judging every answer independently.
+    Ignore formatting, style, or extra information unless it affects correctness.
+    You must respond with a JSON array only, containing one score of either 0 or 1 for each answer.
+    """
+
+batch_prompt_template = """
+    Please evaluate each of the numbered ANSWERS to a QUESTION by comparing it to the EXPECTED ANSWER:
+""" + rubric + """
+    ORIGINAL QUESTION:
+    {question}
 
+    EXPECTED ANSWER:
+    {expected_answer}
+
+    ANSWERS TO EVALUATE:
+    {answers}
+
+    Respond with a JSON array containing one object per answer, in the same order, e.g.
+    [{{"answer": 1, "score": 1, "reasoning": "Matches the expected answer."}}]
+    """
+
+def build_prompt(question, answer, expected_answer):
+    return prompt_template.format(question=question, expected_answer=expected_answer, answer=answer)
+
+def build_batch_prompt(question, answers, expected_answer):
+    numbered_answers = "\n\n".join(f"[ANSWER {i}]\n{answer}" for i, answer in enumerate(answers, 1))
+    return batch_prompt_template.format(question=question, expected_answer=expected_answer, answers=numbered_answers)
+
+def parse_evaluation(evaluation_text):
     # Parse the response to extract score and reasoning
     try:
         if '|' in evaluation_text:
@@ -55,5 +74,14 @@ def evaluate(evaluator, evaluator_model, question, answer, expected_answer):
             # Fallback if no pipe delimiter found
             return {'score': evaluation_text.strip(), 'reasoning': 'No reasoning provided'}
     except:
-        return {'score': '0.0', 'reasoning': 'Error parsing evaluation response'}
+        return {'score': '0.0', 'reasoning': 'Error parsing evaluation response', 'parse_error': True}
+
+def evaluate(evaluator, evaluator_model, question, answer, expected_answer):
+    prompt = build_prompt(question, answer, expected_answer)
+    evaluation_text = call_evaluator(evaluator, evaluator_model, system_prompt, prompt, temperature, max_output_tokens)
+    return parse_evaluation(evaluation_text)
 
+async def evaluate_async(evaluator, evaluator_model, question, answer, expected_answer):
+    prompt = build_prompt(question, answer, expected_answer)
+    evaluation_text = await call_evaluator_async(evaluator, evaluator_model, system_prompt, prompt, temperature, max_output_tokens)
+    return parse_evaluation(evaluation_text)
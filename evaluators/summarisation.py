@@ -1,22 +1,16 @@
-from providers.anthropic import call_anthropic_model
-from providers.openai import call_openai_model
+from evaluators.judging import call_evaluator, call_evaluator_async
 
-def evaluate(evaluator, evaluator_model, question, answer, expected_answer=None):
-
-    temperature = 0.2
-    max_output_tokens = 200
+temperature = 0.2
+max_output_tokens = 200
 
-    system_prompt = f"""
+system_prompt = """
     You are an expert evaluator specialising in assessing text summarisation quality.
     Focus on factual accuracy, completeness of key information, clarity, structure, and appropriate length.
     Ignore minor formatting or stylistic preferences unless they significantly impact comprehension.
     You must respond with a numeric score between 0.0 and 1.0, followed by a pipe symbol (|), then a brief one-sentence reasoning for your evaluation.
     """
 
-    prompt = f"""
-    Please evaluate the provided SUMMARISATION against the original TEXT. Assess factual accuracy, retention of key information, clarity, structure, and appropriate length. Rate from 0.0 to 1.0.
-    Clearly identify the actual summarised text to evaluate, seperating and ingoring any thought and reasoning processes, for example any text between "<think> </think>" tags. Only evaluate the summary text.
-
+rubric = """
     **Rating Scale:**
     - 1.0: Factually accurate, captures all key information, excellently structured and clear, optimal length
     - 0.8: Factually accurate, captures most key information, well-structured and clear, appropriate length
@@ -31,7 +25,12 @@ def evaluate(evaluator, evaluator_model, question, answer, expected_answer=None)
     - **Key Information Retention**: Are the most important points from the original text included?
     - **Clarity and Structure**: Is the summary well-organised and easy to understand?
     - **Appropriate Length**: Is the summary suitably concise whilst retaining essential information?
+"""
 
+prompt_template = """
+    Please evaluate the provided SUMMARISATION against the original TEXT. Assess factual accuracy, retention of key information, clarity, structure, and appropriate length. Rate from 0.0 to 1.0.
+    Clearly identify the actual summarised text to evaluate, seperating and ingoring any thought and reasoning processes, for example any text between "<think> </think>" tags. Only evaluate the summary text.
+""" + rubric + """
     ORIGINAL QUESTION:
     {question}
 
@@ -41,13 +40,35 @@ def evaluate(evaluator, evaluator_model, question, answer, expected_answer=None)
     Provide the numeric score followed by a pipe symbol and brief reasoning (e.g. "0.9|Excellent summary with accurate facts and good structure, but slightly verbose.").
     """
 
-    if (evaluator == 'openai'):
-        response = call_openai_model(evaluator_model, system_prompt, prompt, temperature, max_output_tokens)
-        evaluation_text = response["response"]
-    elif (evaluator == 'anthropic'):
-        response = call_anthropic_model(evaluator_model, system_prompt, prompt, temperature, max_output_tokens)
-        evaluation_text = response["response"]
-    
+batch_system_prompt = """
+    You are an expert evaluator specialising in assessing text summarisation quality.
+    Focus on factual accuracy, completeness of key information, clarity, structure, and appropriate length, judging every summarisation independently.
+    Ignore minor formatting or stylistic preferences unless they significantly impact comprehension.
+    You must respond with a JSON array only, containing a numeric score between 0.0 and 1.0 and a brief one-sentence reasoning for each summarisation.
+    """
+
+batch_prompt_template = """
+    Please evaluate each of the numbered SUMMARISATIONS against the original TEXT. Assess factual accuracy, retention of key information, clarity, structure, and appropriate length. Rate from 0.0 to 1.0.
+    Clearly identify the actual summarised text to evaluate, seperating and ingoring any thought and reasoning processes, for example any text between "<think> </think>" tags. Only evaluate the summary text.
+""" + rubric + """
+    ORIGINAL QUESTION:
+    {question}
+
+    SUMMARISATIONS TO EVALUATE:
+    {answers}
+
+    Respond with a JSON array containing one object per summarisation, in the same order, e.g.
+    [{{"answer": 1, "score": 0.9, "reasoning": "Excellent summary with accurate facts and good structure, but slightly verbose."}}]
+    """
+
+def build_prompt(question, answer, expected_answer=None):
+    return prompt_template.format(question=question, answer=answer)
+
+def build_batch_prompt(question, answers, expected_answer=None):
+    numbered_answers = "\n\n".join(f"[SUMMARISATION {i}]\n{answer}" for i, answer in enumerate(answers, 1))
+    return batch_prompt_template.format(question=question, answers=numbered_answers)
+
+def parse_evaluation(evaluation_text):
     # Parse the response to extract score and reasoning
     try:
         if '|' in evaluation_text:
@@ -57,5 +78,14 @@ def evaluate(evaluator, evaluator_model, question, answer, expected_answer=None)
             # Fallback if no pipe delimiter found
             return {'score': evaluation_text.strip(), 'reasoning': 'No reasoning provided'}
     except:
-        return {'score': '0.0', 'reasoning': 'Error parsing evaluation response'}
+        return {'score': '0.0', 'reasoning': 'Error parsing evaluation response', 'parse_error': True}
+
+def evaluate(evaluator, evaluator_model, question, answer, expected_answer=None):
+    prompt = build_prompt(question, answer, expected_answer)
+    evaluation_text = call_evaluator(evaluator, evaluator_model, system_prompt, prompt, temperature, max_output_tokens)
+    return parse_evaluation(evaluation_text)
 
+async def evaluate_async(evaluator, evaluator_model, question, answer, expected_answer=None):
+    prompt = build_prompt(question, answer, expected_answer)
+    evaluation_text = await call_evaluator_async(evaluator, evaluator_model, system_prompt, prompt, temperature, max_output_tokens)
+    return parse_evaluation(evaluation_text)
@@ -0,0 +1,364 @@
+import argparse
+import hashlib
+import json
+import math
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+
+CANNED_WORDS = (
+    "the answer follows from the question as stated and the result is shown here with a short "
+    "explanation of each step so that the reasoning can be checked"
+).split()
+
+LATENCY_DISTRIBUTIONS = ('fixed', 'uniform', 'exponential', 'lognormal')
+
+
+class FakeServerSettings:
+    """Timing, error and answer settings for the fake server.
+
+    Latencies are drawn from latency_distribution with the configured mean:
+    uniform spans 0-2x the mean, exponential and lognormal (sigma 0.5) are
+    right-skewed. Answers and judge scores depend only on the request content,
+    so repeated runs judge the same answers the same way. load_time is added to
+    the first request for each model, like LM Studio loading a model on demand.
+    parallel limits how many requests are generated at once (0 for no limit);
+    the rest queue, so throughput saturates under load like a real server.
+    """
+
+    def __init__(self, ttft: float = 0.05, tokens_per_second: float = 200.0, answer_tokens: int = 24,
+                 error_rate: float = 0.0, latency_distribution: str = 'fixed', judge_pass_rate: float = 0.8,
+                 seed: int = 0, load_time: float = 0.0, parallel: int = 0):
+        if latency_distribution not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(
+                f"Unknown latency distribution '{latency_distribution}'. "
+                f"Available distributions: {', '.join(LATENCY_DISTRIBUTIONS)}"
+            )
+        self.ttft = ttft
+        self.tokens_per_second = tokens_per_second
+        self.answer_tokens = answer_tokens
+        self.error_rate = error_rate
+        self.latency_distribution = latency_distribution
+        self.judge_pass_rate = judge_pass_rate
+        self.seed = seed
+        self.load_time = load_time
+        self.parallel = parallel
+
+
+def _digest(*parts: str) -> int:
+    return int(hashlib.sha256('\x00'.join(parts).encode('utf-8')).hexdigest()[:12], 16)
+
+
+class FakeLLMServer(ThreadingHTTPServer):
+    """Stand-in for LM Studio, OpenAI and Anthropic used to benchmark the harness offline.
+
+    Serves POST /v1/chat/completions (OpenAI compatible) and POST /v1/messages
+    (Anthropic), both streaming and non-streaming. Requests whose system prompt
+    is an evaluator prompt get judge scores, everything else gets a canned answer.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, settings: Optional[FakeServerSettings] = None):
+        super().__init__((host, port), FakeRequestHandler)
+        self.settings = settings or FakeServerSettings()
+        self.requests = 0
+        self.errors = 0
+        self.simulated_time = 0.0
+        self.loaded_models = set()
+        self.generation_slots = threading.Semaphore(self.settings.parallel) if self.settings.parallel > 0 else None
+        self._random = random.Random(self.settings.seed)
+        self._lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start_in_thread(self) -> 'FakeLLMServer':
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+
+    def draw_latency(self, mean: float) -> float:
+        distribution = self.settings.latency_distribution
+        with self._lock:
+            if mean <= 0 or distribution == 'fixed':
+                return max(0.0, mean)
+            if distribution == 'uniform':
+                return self._random.uniform(0, 2 * mean)
+            if distribution == 'exponential':
+                return self._random.expovariate(1 / mean)
+            # Lognormal with sigma 0.5, scaled so the mean matches
+            sigma = 0.5
+            return self._random.lognormvariate(0, sigma) * mean / math.exp(sigma ** 2 / 2)
+
+    def load_model(self, model: str) -> float:
+        # Returns the load delay for a model's first request
+        with self._lock:
+            if model in self.loaded_models:
+                return 0.0
+            self.loaded_models.add(model)
+            return self.settings.load_time
+
+    def draw_error(self) -> Optional[int]:
+        with self._lock:
+            self.requests += 1
+            if self._random.random() >= self.settings.error_rate:
+                return None
+            self.errors += 1
+            return self._random.choice((429, 500, 503))
+
+    def record_simulated_time(self, seconds: float) -> None:
+        with self._lock:
+            self.simulated_time += seconds
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {'requests': self.requests, 'errors': self.errors, 'simulated_time': self.simulated_time}
+
+    def answer_tokens(self, system_prompt: str, prompt: str, model: str) -> List[str]:
+        if 'evaluator' not in system_prompt:
+            start = _digest(model, prompt) % len(CANNED_WORDS)
+            words = [CANNED_WORDS[(start + i) % len(CANNED_WORDS)] for i in range(self.settings.answer_tokens)]
+            return [word if i == 0 else f" {word}" for i, word in enumerate(words)]
+
+        # Judge requests: one score per numbered answer for batches, otherwise a single score.
+        # Scores depend on the answer text, so batched and single judging agree.
+        if 'JSON array' in system_prompt:
+            answers = re.findall(r'\[(?:ANSWER|SUMMARISATION) (\d+)\]\n(.*?)(?=\n\n\[(?:ANSWER|SUMMARISATION) |\n\s*\n)',
+                                 prompt, re.DOTALL)
+            scores = [
+                {'answer': int(number), 'score': self.judge_score(text), 'reasoning': 'Synthetic judgment'}
+                for number, text in answers
+            ]
+            return [json.dumps(scores)]
+
+        answer = re.search(r'TO EVALUATE:\s*\n\s*(.*?)\n\s*\n', prompt, re.DOTALL)
+        return [f"{self.judge_score(answer.group(1) if answer else prompt)} | Synthetic judgment"]
+
+    def judge_score(self, answer: str) -> int:
+        fraction = _digest(str(self.settings.seed), answer.strip()) % 10000 / 10000
+        return 1 if fraction < self.settings.judge_pass_rate else 0
+
+
+class FakeRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Headers and body go out in separate writes; with Nagle enabled every keep-alive
+    # response would stall on the client's delayed ACK and inflate the measured overhead
+    disable_nagle_algorithm = True
+    server: FakeLLMServer
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        if self.path.rstrip('/') == '/v1/models':
+            self._send_json(200, {'object': 'list', 'data': [{'id': 'fake-model', 'object': 'model'}]})
+        else:
+            self._send_json(404, {'error': {'message': f"Unknown path {self.path}"}})
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+        path = self.path.rstrip('/')
+        if path not in ('/v1/chat/completions', '/v1/messages'):
+            self._send_json(404, {'error': {'message': f"Unknown path {self.path}"}})
+            return
+
+        status = self.server.draw_error()
+        if status is not None:
+            self._send_error_response(status)
+            return
+
+        if path == '/v1/chat/completions':
+            messages = body.get('messages', [])
+            system_prompt = ' '.join(m['content'] for m in messages if m.get('role') == 'system')
+            prompt = ' '.join(m['content'] for m in messages if m.get('role') == 'user')
+        else:
+            system_prompt = body.get('system') or ''
+            prompt = ' '.join(m['content'] for m in body.get('messages', []) if isinstance(m.get('content'), str))
+
+        if self.server.generation_slots is None:
+            self._generate(path, body, system_prompt, prompt)
+        else:
+            with self.server.generation_slots:
+                self._generate(path, body, system_prompt, prompt)
+
+    def _generate(self, path: str, body: Dict[str, Any], system_prompt: str, prompt: str) -> None:
+        model = body.get('model', 'fake-model')
+        tokens = self.server.answer_tokens(system_prompt, prompt, model)
+        prompt_tokens = max(1, len((system_prompt + ' ' + prompt).split()))
+        ttft = self.server.load_model(model) + self.server.draw_latency(self.server.settings.ttft)
+        token_delay = 1 / self.server.settings.tokens_per_second if self.server.settings.tokens_per_second > 0 else 0.0
+
+        if path == '/v1/chat/completions':
+            if body.get('stream'):
+                self._stream_openai(model, tokens, prompt_tokens, ttft, token_delay)
+            else:
+                self._simulate(ttft + token_delay * len(tokens))
+                self._send_json(200, self._openai_completion(model, tokens, prompt_tokens))
+        elif body.get('stream'):
+            self._stream_anthropic(model, tokens, prompt_tokens, ttft, token_delay)
+        else:
+            self._simulate(ttft + token_delay * len(tokens))
+            self._send_json(200, self._anthropic_message(model, tokens, prompt_tokens))
+
+    def _simulate(self, seconds: float) -> None:
+        self.server.record_simulated_time(seconds)
+        if seconds > 0:
+            time.sleep(seconds)
+
+    def _send_json(self, status: int, payload: Dict[str, Any], headers: Optional[Dict[str, str]] = None) -> None:
+        data = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_error_response(self, status: int) -> None:
+        headers = {'retry-after': '0.1'} if status == 429 else {}
+        self._send_json(status, {
+            'type': 'error',
+            'error': {'type': 'rate_limit_error' if status == 429 else 'api_error', 'message': 'Synthetic error'}
+        }, headers)
+
+    def _start_stream(self) -> None:
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+
+    def _write_chunk(self, text: str) -> None:
+        data = text.encode('utf-8')
+        self.wfile.write(b'%x\r\n%s\r\n' % (len(data), data))
+        self.wfile.flush()
+
+    def _end_stream(self) -> None:
+        self.wfile.write(b'0\r\n\r\n')
+        self.wfile.flush()
+
+    @staticmethod
+    def _openai_completion(model: str, tokens: List[str], prompt_tokens: int) -> Dict[str, Any]:
+        return {
+            'id': 'chatcmpl-fake', 'object': 'chat.completion', 'created': int(time.time()), 'model': model,
+            'choices': [{
+                'index': 0, 'message': {'role': 'assistant', 'content': ''.join(tokens)}, 'finish_reason': 'stop'
+            }],
+            'usage': {
+                'prompt_tokens': prompt_tokens, 'completion_tokens': len(tokens),
+                'total_tokens': prompt_tokens + len(tokens)
+            }
+        }
+
+    def _stream_openai(self, model: str, tokens: List[str], prompt_tokens: int, ttft: float,
+                       token_delay: float) -> None:
+        def chunk(choices, usage=None):
+            payload = {
+                'id': 'chatcmpl-fake', 'object': 'chat.completion.chunk', 'created': int(time.time()),
+                'model': model, 'choices': choices, 'usage': usage
+            }
+            self._write_chunk(f"data: {json.dumps(payload)}\n\n")
+
+        self._start_stream()
+        self._simulate(ttft)
+        for i, token in enumerate(tokens):
+            if i:
+                self._simulate(token_delay)
+            chunk([{'index': 0, 'delta': {'content': token}, 'finish_reason': None}])
+        chunk([{'index': 0, 'delta': {}, 'finish_reason': 'stop'}])
+        chunk([], {
+            'prompt_tokens': prompt_tokens, 'completion_tokens': len(tokens),
+            'total_tokens': prompt_tokens + len(tokens)
+        })
+        self._write_chunk("data: [DONE]\n\n")
+        self._end_stream()
+
+    @staticmethod
+    def _anthropic_message(model: str, tokens: List[str], prompt_tokens: int) -> Dict[str, Any]:
+        return {
+            'id': 'msg_fake', 'type': 'message', 'role': 'assistant', 'model': model,
+            'content': [{'type': 'text', 'text': ''.join(tokens)}],
+            'stop_reason': 'end_turn', 'stop_sequence': None,
+            'usage': {'input_tokens': prompt_tokens, 'output_tokens': len(tokens)}
+        }
+
+    def _stream_anthropic(self, model: str, tokens: List[str], prompt_tokens: int, ttft: float,
+                          token_delay: float) -> None:
+        def event(name, payload):
+            self._write_chunk(f"event: {name}\ndata: {json.dumps({'type': name, **payload})}\n\n")
+
+        self._start_stream()
+        message = self._anthropic_message(model, [], prompt_tokens)
+        message.update({'content': [], 'stop_reason': None})
+        message['usage']['output_tokens'] = 0
+        event('message_start', {'message': message})
+        event('content_block_start', {'index': 0, 'content_block': {'type': 'text', 'text': ''}})
+        self._simulate(ttft)
+        for i, token in enumerate(tokens):
+            if i:
+                self._simulate(token_delay)
+            event('content_block_delta', {'index': 0, 'delta': {'type': 'text_delta', 'text': token}})
+        event('content_block_stop', {'index': 0})
+        event('message_delta', {
+            'delta': {'stop_reason': 'end_turn', 'stop_sequence': None}, 'usage': {'output_tokens': len(tokens)}
+        })
+        event('message_stop', {})
+        self._end_stream()
+
+
+def add_server_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument('--ttft', type=float, default=0.05, help='Mean time to first token in seconds')
+    parser.add_argument('--tokens-per-second', type=float, default=200.0,
+                        help='Decode speed after the first token (0 for no delay)')
+    parser.add_argument('--answer-tokens', type=int, default=24, help='Tokens in each canned answer')
+    parser.add_argument('--error-rate', type=float, default=0.0,
+                        help='Fraction of requests answered with a 429, 500 or 503 error')
+    parser.add_argument('--latency-distribution', choices=LATENCY_DISTRIBUTIONS, default='fixed',
+                        help='Distribution of time to first token around its mean')
+    parser.add_argument('--judge-pass-rate', type=float, default=0.8,
+                        help='Fraction of judged answers that are scored 1')
+    parser.add_argument('--seed', type=int, default=0, help='Seed for latencies, errors and judge scores')
+    parser.add_argument('--parallel', type=int, default=0,
+                        help='Requests generated at once; others queue (0 for no limit)')
+    parser.add_argument('--load-time', type=float, default=0.0,
+                        help='Seconds added to the first request for each model, simulating model loading')
+
+
+def settings_from_arguments(args: argparse.Namespace) -> FakeServerSettings:
+    return FakeServerSettings(
+        args.ttft, args.tokens_per_second, args.answer_tokens, args.error_rate,
+        args.latency_distribution, args.judge_pass_rate, args.seed, args.load_time, args.parallel
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run a fake OpenAI/Anthropic compatible server for offline testing')
+    parser.add_argument('--host', default='127.0.0.1', help='Host to listen on')
+    parser.add_argument('--port', type=int, default=1234, help='Port to listen on (1234 matches LM Studio)')
+    add_server_arguments(parser)
+    args = parser.parse_args()
+
+    server = FakeLLMServer(args.host, args.port, settings_from_arguments(args))
+    print(f"Fake LLM server listening on {server.base_url} "
+          f"(OpenAI: {server.base_url}/v1, Anthropic: {server.base_url})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,279 @@
+import argparse
+import asyncio
+import csv
+import itertools
+import random
+import time
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from config_manager import ConfigManager
+from dataset_loader import load_dataset
+from model_tester import ModelTester
+from providers.registry import PROVIDER_MODULES, registry
+
+LOAD_TEST_FIELDNAMES = [
+    'model_name', 'provider', 'mode', 'level', 'requests', 'errors', 'error_rate', 'duration',
+    'request_throughput', 'tokens_per_second', 'latency_p50', 'latency_p99', 'time_to_first_token_p50',
+    'saturated', 'overloaded'
+]
+
+
+class LoadLevelResult:
+    """Outcomes of the requests sent at one concurrency or QPS level."""
+
+    def __init__(self, mode: str, level: float):
+        self.mode = mode
+        self.level = level
+        self.latencies: List[float] = []
+        self.times_to_first_token: List[float] = []
+        self.completion_tokens = 0
+        self.errors = 0
+        self.start_time = None
+        self.end_time = None
+
+    def add_response(self, latency: float, response: Dict[str, Any]) -> None:
+        self.latencies.append(latency)
+        self.completion_tokens += response['completion_tokens']
+        if response['time_to_first_token'] is not None:
+            self.times_to_first_token.append(response['time_to_first_token'])
+
+    def get_summary(self) -> Dict[str, Any]:
+        requests = len(self.latencies) + self.errors
+        duration = self.end_time - self.start_time if self.start_time is not None else 0.0
+
+        def percentile(values, pct):
+            return float(np.percentile(values, pct)) if values else None
+
+        return {
+            'mode': self.mode,
+            'level': self.level,
+            'requests': requests,
+            'errors': self.errors,
+            'error_rate': self.errors / requests if requests else 0.0,
+            'duration': duration,
+            # Only successful requests count towards throughput
+            'request_throughput': len(self.latencies) / duration if duration > 0 else 0.0,
+            'tokens_per_second': self.completion_tokens / duration if duration > 0 else 0.0,
+            'latency_p50': percentile(self.latencies, 50),
+            'latency_p99': percentile(self.latencies, 99),
+            'time_to_first_token_p50': percentile(self.times_to_first_token, 50)
+        }
+
+
+def find_saturation_point(summaries: List[Dict[str, Any]], min_gain: float = 0.1,
+                          max_error_rate: float = 0.05) -> Optional[Dict[str, Any]]:
+    """Returns the last level before throughput stopped growing.
+
+    A level counts as an improvement when its request throughput is at least
+    min_gain above the best so far. Levels with an error rate above
+    max_error_rate end the search, as the model is already overloaded there;
+    if that happens at the first level, the first level is returned.
+    Returns None if throughput was still growing at the highest level.
+    """
+    best = None
+    for summary in summaries:
+        if summary['error_rate'] > max_error_rate:
+            return best or summary
+        if best is None or summary['request_throughput'] >= best['request_throughput'] * (1 + min_gain):
+            best = summary
+        else:
+            return best
+    return None
+
+
+class LoadTester:
+    """Sends dataset questions to each subject model at increasing load, without judging the answers.
+
+    Concurrency levels are closed loop: that many requests are kept in flight.
+    QPS levels are open loop: requests start at Poisson arrival times regardless
+    of how many are still running, so queueing shows up as latency.
+    """
+
+    def __init__(self, config: ConfigManager, concurrency_levels: List[int], qps_levels: List[float],
+                 requests_per_level: int, min_gain: float, max_error_rate: float):
+        self.config = config
+        self.model_tester = ModelTester(config.evaluation_type, config.streaming)
+        self.concurrency_levels = concurrency_levels
+        self.qps_levels = qps_levels
+        self.requests_per_level = requests_per_level
+        self.min_gain = min_gain
+        self.max_error_rate = max_error_rate
+
+    def run(self) -> List[Dict[str, Any]]:
+        dataset = load_dataset(self.config.dataset, self.config.evaluation_type, self.config.dataset_sampling)
+        questions = [qa['question'] for qa in dataset]
+        if not questions:
+            raise ValueError(f"Dataset '{self.config.dataset}' has no questions")
+
+        rows = []
+        for model in self.config.subject_models:
+            print(f"\n{'='*60}")
+            print(f"Load testing Provider and Model: {model['provider']} - {model['model']}")
+            print(f"{'='*60}")
+            self._warm_up(model, questions[0])
+            rows.extend(asyncio.run(registry.run_and_close(self._run_model(model, questions))))
+        return rows
+
+    def _warm_up(self, model: Dict[str, str], question: str) -> None:
+        # Keeps model loading out of the first level
+        for _ in range(self.config.warmup_requests):
+            self.model_tester.test_single_iteration(model['provider'], model['model'], question)
+
+    async def _run_model(self, model: Dict[str, str], questions: List[str]) -> List[Dict[str, Any]]:
+        rows = []
+        for mode, levels in (('concurrency', self.concurrency_levels), ('qps', self.qps_levels)):
+            summaries = []
+            for level in levels:
+                result = LoadLevelResult(mode, level)
+                if mode == 'concurrency':
+                    await self._run_closed_loop(model, questions, int(level), result)
+                else:
+                    await self._run_open_loop(model, questions, level, result)
+
+                summary = result.get_summary()
+                summaries.append(summary)
+                print(f"  {mode} {level}: {summary['request_throughput']:.2f} requests/s, "
+                      f"{summary['tokens_per_second']:.1f} tokens/s, {summary['error_rate'] * 100:.1f}% errors")
+
+            saturation = find_saturation_point(summaries, self.min_gain, self.max_error_rate)
+            for summary in summaries:
+                rows.append({
+                    'model_name': model['model'],
+                    'provider': model['provider'],
+                    **summary,
+                    'saturated': summary is saturation,
+                    'overloaded': summary['error_rate'] > self.max_error_rate
+                })
+        return rows
+
+    async def _send(self, model: Dict[str, str], question: str, result: LoadLevelResult) -> None:
+        start_time = time.perf_counter()
+        if result.start_time is None:
+            result.start_time = start_time
+        try:
+            response = await self.model_tester.test_single_iteration_async(model['provider'], model['model'], question)
+        except Exception as e:
+            result.errors += 1
+            print(f"  Request failed: {type(e).__name__}: {e}")
+        else:
+            # End-to-end latency of a single attempt: retries and rate limits are off for load tests
+            result.add_response(time.perf_counter() - start_time, response)
+        result.end_time = time.perf_counter()
+
+    async def _run_closed_loop(self, model: Dict[str, str], questions: List[str], concurrency: int,
+                               result: LoadLevelResult) -> None:
+        question_cycle = itertools.islice(itertools.cycle(questions), self.requests_per_level)
+
+        async def worker():
+            for question in question_cycle:
+                await self._send(model, question, result)
+
+        await asyncio.gather(*[worker() for _ in range(concurrency)])
+
+    async def _run_open_loop(self, model: Dict[str, str], questions: List[str], qps: float,
+                             result: LoadLevelResult) -> None:
+        # Seeded so every model sees the same arrival pattern
+        arrivals = random.Random(0)
+        start_time = time.perf_counter()
+        next_arrival = 0.0
+        tasks = []
+        for question in itertools.islice(itertools.cycle(questions), self.requests_per_level):
+            await asyncio.sleep(max(0.0, start_time + next_arrival - time.perf_counter()))
+            tasks.append(asyncio.create_task(self._send(model, question, result)))
+            next_arrival += arrivals.expovariate(qps)
+        await asyncio.gather(*tasks)
+
+
+def load_test_provider_settings(providers: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    # Every failed attempt counts as an error and nothing throttles the load, so saturation shows where it happens
+    return {
+        name: {**providers.get(name, {}), 'max_retries': 0, 'requests_per_minute': None, 'tokens_per_minute': None}
+        for name in PROVIDER_MODULES
+    }
+
+
+def _format_optional(value: Optional[float], precision: int) -> str:
+    return f"{value:.{precision}f}" if value is not None else 'N/A'
+
+
+def display_load_test_results(rows: List[Dict[str, Any]]) -> None:
+    print("\n" + "=" * 100)
+    print("LOAD TEST RESULTS:")
+    print("=" * 100)
+    print(f"{'Model':<28} {'Mode':<12} {'Level':>6} {'Req/s':>8} {'Tokens/s':>9} {'p50 (s)':>8} "
+          f"{'p99 (s)':>8} {'TTFT p50':>9} {'Errors':>7}")
+    for row in rows:
+        marker = ' <- saturation' if row['saturated'] else ''
+        if row['overloaded']:
+            marker += ' (overloaded)'
+        print(f"{row['model_name'][:28]:<28} {row['mode']:<12} {row['level']:>6g} {row['request_throughput']:>8.2f} "
+              f"{row['tokens_per_second']:>9.1f} {_format_optional(row['latency_p50'], 2):>8} "
+              f"{_format_optional(row['latency_p99'], 2):>8} {_format_optional(row['time_to_first_token_p50'], 3):>9} "
+              f"{row['error_rate'] * 100:>6.1f}%{marker}")
+    print("=" * 100)
+
+    for (model_name, mode), group in itertools.groupby(rows, key=lambda row: (row['model_name'], row['mode'])):
+        saturation = next((row for row in group if row['saturated']), None)
+        if saturation and saturation['overloaded']:
+            print(f"{model_name} ({mode}): overloaded at the first level tested, {saturation['level']:g} "
+                  f"({saturation['error_rate'] * 100:.1f}% errors)")
+        elif saturation:
+            print(f"{model_name} ({mode}): saturates at {saturation['level']:g} "
+                  f"({saturation['request_throughput']:.2f} requests/s, {saturation['tokens_per_second']:.1f} tokens/s)")
+        else:
+            print(f"{model_name} ({mode}): throughput still growing at the highest level tested")
+
+
+def export_load_test_results(rows: List[Dict[str, Any]], output_filename: str) -> None:
+    with open(output_filename, 'w', newline='', encoding='utf-8') as csv_file:
+        writer = csv.DictWriter(csv_file, fieldnames=LOAD_TEST_FIELDNAMES)
+        writer.writeheader()
+        for row in rows:
+            writer.writerow({
+                **row,
+                'error_rate': f"{row['error_rate']:.4f}",
+                'duration': f"{row['duration']:.3f}",
+                'request_throughput': f"{row['request_throughput']:.3f}",
+                'tokens_per_second': f"{row['tokens_per_second']:.2f}",
+                'latency_p50': _format_optional(row['latency_p50'], 3),
+                'latency_p99': _format_optional(row['latency_p99'], 3),
+                'time_to_first_token_p50': _format_optional(row['time_to_first_token_p50'], 3)
+            })
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Measure throughput and latency of the subject models under increasing load'
+    )
+    parser.add_argument('--config', default='config.yml', help='Path to the configuration file')
+    parser.add_argument('--concurrency', type=int, nargs='*', help='Closed-loop concurrency levels')
+    parser.add_argument('--qps', type=float, nargs='*', help='Open-loop request rates (requests/second)')
+    parser.add_argument('--requests-per-level', type=int, help='Requests sent at each level')
+    parser.add_argument('--output', help='CSV file for the results')
+    args = parser.parse_args()
+
+    config = ConfigManager(args.config)
+    registry.configure(load_test_provider_settings(config.providers))
+    registry.configure_endpoints(config.subject_models)
+    settings = config.load_test
+
+    tester = LoadTester(
+        config,
+        args.concurrency if args.concurrency is not None else settings.get('concurrency_levels', [1, 2, 4, 8]),
+        args.qps if args.qps is not None else settings.get('qps_levels', []),
+        args.requests_per_level or settings.get('requests_per_level', 32),
+        settings.get('min_throughput_gain', 0.1),
+        settings.get('max_error_rate', 0.05)
+    )
+    rows = tester.run()
+
+    display_load_test_results(rows)
+    output_filename = args.output or settings.get('output', 'load_test_results.csv')
+    export_load_test_results(rows, output_filename)
+    print(f"\nLoad test results written to {output_filename}")
+
+
+if __name__ == "__main__":
+    main()
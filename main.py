@@ -1,50 +1,334 @@
+import sys
+from startup_profiler import startup_profiler
+
+# Enabled before the remaining imports so that their import time is recorded
+if '--profile-startup' in sys.argv:
+    startup_profiler.enable()
+
 from config_manager import ConfigManager
-from model_tester import ModelTester
+from model_tester import ModelTester, build_test_result
+from async_runner import AsyncTestRunner
+from pipeline_runner import PipelineTestRunner
 from evaluation_manager import EvaluationManager
+from evaluation_cache import EvaluationCache
+from evaluators.local_scorer import LocalScorer
 from power_metrics_manager import PowerMetricsManager
 from metrics_collector import QuestionMetricsCollector, ModelMetricsCollector
 from results_displayer import ResultsDisplayer
 from results_exporter import ResultsExporter
 from comparison_analyzer import ComparisonAnalyzer
-from utility import parse_input_data
-from typing import Dict, List, Any
+from adaptive_sampling import AdaptiveSampler, SuccessiveHalving
+from run_journal import RunJournal
+from run_history import RunHistory
+from providers.registry import registry
+from dataset_loader import load_dataset
+from distributed import shard_of, shard_journal_path, worker_provider_settings, run_workers
+from suite_scheduler import SuiteScheduler, job_overrides
+from console_output import console
+from typing import Dict, List, Any, Optional, Set
+import argparse
 
 
 class LocalLLMTestSuite:
-    def __init__(self, config_path: str = 'config.yml'):
-        self.config = ConfigManager(config_path)
-        self.model_tester = ModelTester(self.config.evaluation_type)
+    def __init__(self, config_path: str = 'config.yml', resume: bool = False, shard_index: Optional[int] = None,
+                 shard_count: int = 1, merging: bool = False, powermetrics: Optional[bool] = None,
+                 config_overrides: Optional[Dict[str, Any]] = None,
+                 power_manager: Optional[PowerMetricsManager] = None,
+                 warmed_up_models: Optional[Set[str]] = None):
+        self.config = ConfigManager(config_path, config_overrides)
+        self.job_name = (config_overrides or {}).get('name')
+        # A shard worker runs only its share of the tests; a merge only replays journaled results
+        self.shard_index = shard_index
+        self.shard_count = shard_count
+        self.merging = merging
+        if shard_index is None:
+            registry.configure(self.config.providers)
+        else:
+            registry.configure(worker_provider_settings(
+                self.config.providers, self.config.distributed.get('workers', []), shard_index
+            ))
+        registry.configure_endpoints(self.config.subject_models)
+        self.model_tester = ModelTester(self.config.evaluation_type, self.config.streaming)
+        self.evaluation_cache = self._create_evaluation_cache()
         self.evaluation_manager = EvaluationManager(
             self.config.evaluation_type,
             self.config.evaluator,
-            self.config.evaluator_model
+            self.config.evaluator_model,
+            self.evaluation_cache,
+            self.config.evaluation_batch_size,
+            self._create_local_scorer()
+        )
+        # Jobs of a suite manifest share one power sampler
+        self.power_manager = power_manager or PowerMetricsManager(
+            (self.config.powermetrics if powermetrics is None else powermetrics) and not merging,
+            self.config.power_backend,
+            baseline_seconds=self.config.power_baseline_seconds
         )
-        self.power_manager = PowerMetricsManager(self.config.powermetrics)
         self.displayer = ResultsDisplayer()
-        self.exporter = ResultsExporter()
-        self.analyzer = ComparisonAnalyzer()
+        self.exporter = ResultsExporter(
+            self.config.output_filename,
+            self.config.output_format,
+            self.config.output_batch_size
+        )
+        self.analyzer = ComparisonAnalyzer(
+            self.config.significance.get('resamples', 10000),
+            self.config.significance.get('permutations', 10000),
+            self.config.significance.get('alpha', 0.05)
+        )
+        self.journal = RunJournal(self._journal_path(), self._run_signature(), resume)
+        self.run_history = self._create_run_history()
+        self.run_id: Optional[int] = None
+        self.runner = self._create_runner()
+        self.adaptive_sampler = self._create_adaptive_sampler()
+        self.successive_halving = self._create_successive_halving()
+        if (shard_index is not None or merging) and (self.adaptive_sampler or self.successive_halving):
+            raise ValueError("Adaptive sampling and successive halving decide which tests to run from earlier "
+                             "results, so they cannot be used with sharded workers")
+        self.tests_run = 0
+        # Mean score per question for each model, for paired significance tests between models
+        self.question_scores: Dict[str, Dict[int, float]] = {}
+        self.eliminated_models: Dict[str, int] = {}
+        # Set only for suite jobs, which share it so each model is warmed up once per model-major pass
+        self.warmed_up_models = warmed_up_models
+
+    def _run_signature(self) -> Dict[str, Any]:
+        # Settings that determine which tests are run and how they are judged
+        return {
+            'subject_models': self.config.subject_models,
+            'evaluator': self.config.evaluator,
+            'evaluator_model': self.config.evaluator_model,
+            'number_of_tests': self.config.number_of_tests,
+            'dataset': self.config.dataset,
+            'dataset_sampling': self.config.dataset_sampling,
+            'evaluation_type': self.config.evaluation_type.name
+        }
 
-    def run_complete_test_suite(self) -> None:
-        qa_pairs = parse_input_data(self.config.dataset)
-        csv_data = []
-        model_metrics = {}
+    def _journal_path(self) -> str:
+        if self.shard_index is None:
+            return self.config.journal_path
+        return shard_journal_path(
+            self.config.journal_path, self.config.distributed.get('journal_dir', 'shards'),
+            self.shard_index, self.shard_count
+        )
+
+    def _owns_test(self, model_name: str, question_num: int, test_num: int) -> bool:
+        return self.shard_index is None or shard_of(model_name, question_num, test_num, self.shard_count) == self.shard_index
+
+    def _create_evaluation_cache(self) -> Optional[EvaluationCache]:
+        cache_config = self.config.evaluation_cache
+        if not cache_config.get('enabled', False):
+            return None
+        return EvaluationCache(
+            cache_config.get('path', '.cache/evaluations.sqlite'),
+            cache_config.get('max_entries', 10000)
+        )
+
+    def _create_run_history(self) -> Optional[RunHistory]:
+        # Shard workers only journal; the merge run records the whole run
+        history_config = self.config.run_history
+        if not history_config.get('enabled', False) or self.shard_index is not None:
+            return None
+        return RunHistory(history_config.get('path', 'run_history.sqlite'))
+
+    def _create_local_scorer(self) -> Optional[LocalScorer]:
+        local_scoring = self.config.local_scoring
+        if not local_scoring.get('enabled', False):
+            return None
+        return LocalScorer(numeric_tolerance=local_scoring.get('numeric_tolerance', 1e-6))
+
+    def _create_adaptive_sampler(self) -> Optional[AdaptiveSampler]:
+        adaptive_sampling = self.config.adaptive_sampling
+        if not adaptive_sampling.get('enabled', False):
+            return None
+        if self.config.execution_mode != 'sequential':
+            print("Adaptive sampling is only used in the sequential execution mode; running number_of_tests per question")
+            return None
+        return AdaptiveSampler(
+            adaptive_sampling.get('min_tests', 2),
+            adaptive_sampling.get('max_tests', 10),
+            adaptive_sampling.get('score_ci_width', 0.2),
+            adaptive_sampling.get('response_time_ci_width', 0.25)
+        )
+
+    def _create_successive_halving(self) -> Optional[SuccessiveHalving]:
+        successive_halving = self.config.successive_halving
+        if not successive_halving.get('enabled', False):
+            return None
+        return SuccessiveHalving(successive_halving.get('rounds', 3))
+
+    def _create_runner(self):
+        runner = self._create_execution_runner()
+        if runner and self.shard_index is not None:
+            runner.test_filter = self._owns_test
+        return runner
+
+    def _create_execution_runner(self):
+        if self.merging:
+            # Every result comes from the journal, so nothing is generated
+            return None
+        if self.config.execution_mode == 'async':
+            return AsyncTestRunner(
+                self.model_tester,
+                self.evaluation_manager,
+                self.config.number_of_tests,
+                self.config.subject_concurrency,
+                self.config.evaluator_concurrency,
+                self.journal
+            )
+        if self.config.execution_mode == 'pipeline':
+            return PipelineTestRunner(
+                self.model_tester,
+                self.evaluation_manager,
+                self.power_manager,
+                self.config.number_of_tests,
+                self.config.pipeline_queue_size,
+                self.config.pipeline_judge_workers,
+                self.journal
+            )
+        return None
 
-        for model in self.config.subject_models:
-            model_results = self._test_model(model, qa_pairs)
-            model_metrics[model['model']] = model_results['metrics']
-            csv_data.extend(model_results['csv_data'])
+    def run_complete_test_suite(self) -> None:
+        self.open()
+        try:
+            if self.successive_halving:
+                self.model_metrics = self._run_successive_halving(self.qa_pairs)
+            else:
+                for model in self.config.subject_models:
+                    self.run_model(model)
+            self.finish()
+        finally:
+            self.close()
+
+        self.display_results()
+
+    def open(self, start_power: bool = True) -> None:
+        # Streamed from disk on every pass rather than held in memory
+        self.qa_pairs = load_dataset(self.config.dataset, self.config.evaluation_type, self.config.dataset_sampling)
+        self.model_metrics = {}
+        self._add_planned_tests(len(self.qa_pairs))
+        if self.run_history:
+            self.run_id = self.run_history.start_run(
+                self.config.load_config(), self.config.dataset, self.config.evaluation_type.name,
+                self.config.evaluator, self.config.evaluator_model, self.job_name
+            )
 
-        self._display_final_results(model_metrics)
-        self.exporter.export_to_csv(csv_data)
+        # Rows are written as each question completes so partial results survive and memory stays flat
+        self.exporter.open()
+        # Async runs overlap tests and do not record power, so no sampler is needed
+        if start_power and not isinstance(self.runner, AsyncTestRunner):
+            self.power_manager.start()
+            self.power_manager.calibrate_baseline()
+
+    def _add_planned_tests(self, question_count: int) -> None:
+        # An upper bound with adaptive sampling or successive halving, and an estimate for a shard
+        tests_per_question = self.adaptive_sampler.max_tests if self.adaptive_sampler else self.config.number_of_tests
+        planned = len(self.config.subject_models) * question_count * tests_per_question
+        if self.shard_index is not None:
+            planned = -(-planned // self.shard_count)
+        console.add_planned_tests(planned, len(self.journal.completed))
+
+    def run_model(self, model: Dict[str, str]) -> Dict[str, Optional[float]]:
+        self.model_metrics[model['model']] = self._test_model(model, self.qa_pairs)['metrics']
+        return self.model_metrics[model['model']]
+
+    def finish(self) -> None:
+        # Only called once every model has run, so runs stopped part way stay marked as interrupted
+        if self.run_history and self.run_id is not None:
+            self.run_history.finish_run(self.run_id)
+
+    def close(self) -> None:
+        self.power_manager.close()
+        self.exporter.close()
+        self.journal.close()
+        if self.evaluation_cache:
+            self.evaluation_cache.close()
+        if self.run_history:
+            self.run_history.close()
+
+    def display_results(self) -> None:
+        self._display_final_results(self.model_metrics, len(self.qa_pairs))
+
+    def run_shard(self) -> None:
+        """Runs this worker's share of the tests, recording results only in its shard journal.
+
+        Aggregates, the results file and the comparison are produced when the
+        shard journals are merged.
+        """
+        qa_pairs = load_dataset(self.config.dataset, self.config.evaluation_type, self.config.dataset_sampling)
+        self._add_planned_tests(len(qa_pairs))
+
+        if not isinstance(self.runner, AsyncTestRunner):
+            self.power_manager.start()
+            self.power_manager.calibrate_baseline()
+        try:
+            for model in self.config.subject_models:
+                self.displayer.display_model_header(model['provider'], model['model'])
+                self._warm_up(model, qa_pairs, 1, ModelMetricsCollector(model['model']))
+
+                if self.runner:
+                    model_test_results = self.runner.run_model(model, qa_pairs)
+                    self.tests_run += sum(result is not None for results in model_test_results for result in results)
+                    continue
+                for question_num, qa in enumerate(qa_pairs, 1):
+                    expected_answer = qa['answer'] if qa['answer'] else None
+                    self.tests_run += len(self._run_tests(
+                        model, qa, question_num, expected_answer, range(1, self.config.number_of_tests + 1)
+                    ))
+        finally:
+            self.power_manager.close()
+            self.journal.close()
+            if self.evaluation_cache:
+                self.evaluation_cache.close()
+
+        self.displayer.display_shard_complete(self.shard_index, self.shard_count, self.tests_run, self.journal.path)
 
     def _test_model(self, model: Dict[str, str], qa_pairs: List[Dict[str, str]]) -> Dict[str, Any]:
+        model_collector = ModelMetricsCollector(model['model'])
+        self._test_model_questions(model, qa_pairs, 1, model_collector)
+
+        return {
+            'metrics': self._finish_model(model, model_collector)
+        }
+
+    def _run_successive_halving(self, qa_pairs: List[Dict[str, str]]) -> Dict[str, Dict[str, Optional[float]]]:
+        models = self.config.subject_models
+        collectors = {model['model']: ModelMetricsCollector(model['model']) for model in models}
+        rounds = self.successive_halving.split(qa_pairs)
+
+        remaining = list(models)
+        for round_num, (first_question_num, round_pairs) in enumerate(rounds, 1):
+            for model in remaining:
+                # LM Studio reloads each model every round, so it is warmed up again; only round 1 is its cold start
+                self._test_model_questions(
+                    model, round_pairs, first_question_num, collectors[model['model']], record_cold_start=round_num == 1
+                )
+
+            if round_num < len(rounds) and len(remaining) > 1:
+                remaining, dropped = self.successive_halving.select(remaining, collectors)
+                last_question_num = first_question_num + len(round_pairs) - 1
+                for model in dropped:
+                    self.eliminated_models[model['model']] = last_question_num
+                self.displayer.display_halving_round(round_num, last_question_num, dropped, remaining)
+
+        return {model['model']: self._finish_model(model, collectors[model['model']]) for model in models}
+
+    def _test_model_questions(self, model: Dict[str, str], qa_pairs: List[Dict[str, str]], first_question_num: int,
+                              model_collector: ModelMetricsCollector, record_cold_start: bool = True) -> None:
         self.displayer.display_model_header(model['provider'], model['model'])
+        self._warm_up(model, qa_pairs, first_question_num, model_collector, record_cold_start)
 
-        model_collector = ModelMetricsCollector(model['model'])
-        csv_data = []
+        if self.runner:
+            model_test_results = self.runner.run_model(model, qa_pairs, first_question_num)
 
-        for i, qa in enumerate(qa_pairs, 1):
-            question_results = self._test_question(model, qa, i)
+        for i, qa in enumerate(qa_pairs, first_question_num):
+            if self.runner:
+                question_results = self._collect_question_results(
+                    model, qa, i, model_test_results[i - first_question_num]
+                )
+            else:
+                question_results = self._test_question(model, qa, i)
+            self.tests_run += len(question_results['individual_results'])
+            self.question_scores.setdefault(model['model'], {})[i] = question_results['averages']['avg_score']
 
             # Add individual test results to model collector
             for result in question_results['individual_results']:
@@ -53,40 +337,161 @@ class LocalLLMTestSuite:
                     result['response_time'],
                     result['completion_tokens'],
                     result['total_tokens'],
-                    result['energy_consumption_wh']
+                    result['energy_consumption_wh'],
+                    result['time_to_first_token'],
+                    result['decode_tokens_per_second'],
+                    result['inter_token_latency_avg'],
+                    endpoint=result.get('endpoint')
                 )
 
-            csv_data.extend(question_results['csv_data'])
+            self.exporter.write_rows(question_results['csv_data'])
+            if self.run_history:
+                self.run_history.record_tests(
+                    self.run_id, model['model'], self.config.dataset, i, qa, question_results['individual_results']
+                )
             self.displayer.display_question_averages(i, question_results['averages'])
 
-        # Display and add model averages
+    def _finish_model(self, model: Dict[str, str], model_collector: ModelMetricsCollector) -> Dict[str, Optional[float]]:
+        # Display and add model averages, computing the bootstrap intervals once for both
         model_averages = model_collector.get_averages()
         self.displayer.display_model_averages(model['model'], model_averages)
-        csv_data.append(model_collector.create_model_average_csv_row(
-            self.config.evaluator, self.config.evaluator_model
+        self.exporter.write_rows([model_collector.create_model_average_csv_row(
+            model_averages, self.config.evaluator, self.config.evaluator_model
+        )])
+        endpoint_averages = model_collector.get_endpoint_averages()
+        self.displayer.display_endpoint_averages(model['model'], endpoint_averages)
+        self.exporter.write_rows(model_collector.create_endpoint_average_csv_rows(
+            endpoint_averages, self.config.evaluator, self.config.evaluator_model
         ))
-
-        return {
-            'metrics': model_averages,
-            'csv_data': csv_data
-        }
+        if self.run_history:
+            self.run_history.record_model(
+                self.run_id, model['model'], self.config.dataset, len(model_collector.evaluation_scores.values),
+                model_averages
+            )
+        return model_averages
+
+    def _warm_up(self, model: Dict[str, str], qa_pairs: List[Dict[str, str]], first_question_num: int,
+                 model_collector: ModelMetricsCollector, record_cold_start: bool = True) -> None:
+        # Discarded requests that load the model before any test is timed or measured for power
+        if not qa_pairs:
+            return
+        if self._is_model_journaled(model, first_question_num, len(qa_pairs)):
+            # Nothing left to generate, so reuse the cold start journaled by the original run or a shard worker
+            cold_start = self.journal.get_warmup(model['model'])
+            if cold_start and record_cold_start:
+                model_collector.add_warmup(cold_start)
+            return
+        if self.warmed_up_models is not None:
+            if model['model'] in self.warmed_up_models:
+                # An earlier suite job has loaded the model in this pass, so there is no cold start to measure
+                return
+            self.warmed_up_models.add(model['model'])
+
+        # Iterated rather than indexed, as a dataset slice streams from its start
+        first_question = next(iter(qa_pairs))['question']
+        for warmup_num in range(1, self.config.warmup_requests + 1):
+            response = self.model_tester.test_single_iteration(
+                model['provider'], model['model'], first_question
+            )
+            self.displayer.display_warmup(warmup_num, self.config.warmup_requests, response)
+            if not record_cold_start:
+                continue
+            if warmup_num == 1:
+                self.journal.record_warmup(model['model'], response)
+            model_collector.add_warmup(response)
+
+    def _is_model_journaled(self, model: Dict[str, str], first_question_num: int, question_count: int) -> bool:
+        return all(
+            self.journal.get_result(model['model'], question_num, test_num)
+            for question_num in range(first_question_num, first_question_num + question_count)
+            for test_num in range(1, self.config.number_of_tests + 1)
+            if self._owns_test(model['model'], question_num, test_num)
+        )
 
     def _test_question(self, model: Dict[str, str], qa: Dict[str, str], question_num: int) -> Dict[str, Any]:
+        expected_answer = qa['answer'] if qa['answer'] else None
+
+        if self.adaptive_sampler:
+            # Sample in rounds until the score and response time estimates are precise enough
+            test_results = {}
+            while not self.adaptive_sampler.is_done(list(test_results.values())):
+                first_test_num = len(test_results) + 1
+                round_size = self.adaptive_sampler.next_round_size(len(test_results), self.evaluation_manager.batch_size)
+                test_results.update(self._run_tests(
+                    model, qa, question_num, expected_answer, range(first_test_num, first_test_num + round_size)
+                ))
+        else:
+            test_results = self._run_tests(
+                model, qa, question_num, expected_answer, range(1, self.config.number_of_tests + 1)
+            )
+
+        return self._collect_question_results(
+            model, qa, question_num, [test_results[test_num] for test_num in sorted(test_results)]
+        )
+
+    def _run_tests(self, model: Dict[str, str], qa: Dict[str, str], question_num: int,
+                   expected_answer: Optional[str], test_nums: range) -> Dict[int, Dict[str, Any]]:
+        test_results = {}
+        pending = []
+        for test_num in test_nums:
+            if not self._owns_test(model['model'], question_num, test_num):
+                continue
+            result = self.journal.get_result(model['model'], question_num, test_num)
+            if result:
+                self.displayer.display_journaled_test(question_num, test_num)
+                test_results[test_num] = result
+            elif self.merging:
+                raise ValueError(
+                    f"Question {question_num}, Test {test_num} of {model['model']} is missing from the shard journals"
+                )
+            elif self.evaluation_manager.batch_size > 1:
+                # Defer judging so the question's answers can be scored together
+                pending.append((test_num, *self._generate_response(model, qa, question_num, test_num, expected_answer)))
+            else:
+                result = self._run_single_test(model, qa, question_num, test_num, expected_answer)
+                self.journal.record(model['model'], question_num, test_num, result)
+                console.record_test(model['model'], result)
+                test_results[test_num] = result
+
+        if pending:
+            test_results.update(self._evaluate_pending_tests(model, qa, question_num, expected_answer, pending))
+
+        return test_results
+
+    def _evaluate_pending_tests(self, model: Dict[str, str], qa: Dict[str, str], question_num: int,
+                                expected_answer: Optional[str], pending: List[tuple]) -> Dict[int, Dict[str, Any]]:
+        evaluation_results = self.evaluation_manager.evaluate_responses(
+            qa['question'], expected_answer, [response['response'] for _, response, _ in pending]
+        )
+
+        test_results = {}
+        for (test_num, response, energy_metrics), evaluation_result in zip(pending, evaluation_results):
+            self.displayer.display_question_header(question_num, test_num, qa['question'])
+            self.evaluation_manager.display_evaluation_results(evaluation_result)
+            result = build_test_result(response, energy_metrics, evaluation_result)
+            self.journal.record(model['model'], question_num, test_num, result)
+            console.record_test(model['model'], result)
+            test_results[test_num] = result
+        return test_results
+
+    def _collect_question_results(self, model: Dict[str, str], qa: Dict[str, str], question_num: int,
+                                  test_results: List[Dict[str, Any]]) -> Dict[str, Any]:
         question_collector = QuestionMetricsCollector(question_num, qa['question'])
         csv_data = []
         individual_results = []
 
         expected_answer = qa['answer'] if qa['answer'] else None
 
-        for j in range(self.config.number_of_tests):
-            result = self._run_single_test(model, qa, question_num, j + 1, expected_answer)
-
+        for j, result in enumerate(test_results):
             question_collector.add_metric(
                 result['evaluation_score'],
                 result['response_time'],
                 result['completion_tokens'],
                 result['total_tokens'],
-                result['energy_consumption_wh']
+                result['energy_consumption_wh'],
+                result['time_to_first_token'],
+                result['decode_tokens_per_second'],
+                result['inter_token_latency_avg']
             )
 
             csv_data.append(question_collector.create_csv_row(
@@ -95,16 +500,21 @@ class LocalLLMTestSuite:
                 self.config.evaluator_model, result['prompt_tokens'],
                 result['completion_tokens'], result['total_tokens'],
                 result['response_time'], result['energy_consumption_wh'],
-                result['evaluation_score'], result['evaluation_reasoning']
+                result['evaluation_score'], result['evaluation_reasoning'],
+                result['time_to_first_token'], result['inter_token_latency_avg'],
+                result['inter_token_latency_p95'], result['decode_tokens_per_second'],
+                result['scored_by'], result.get('gross_energy_consumption_wh'),
+                result.get('joules_per_token'), result.get('tokens_per_joule'), result.get('endpoint')
             ))
 
             individual_results.append(result)
 
         # Add question averages to CSV
-        csv_data.append(question_collector.create_average_csv_row())
+        question_averages = question_collector.get_averages()
+        csv_data.append(question_collector.create_average_csv_row(question_averages))
 
         return {
-            'averages': question_collector.get_averages(),
+            'averages': question_averages,
             'csv_data': csv_data,
             'individual_results': individual_results
         }
@@ -112,6 +522,19 @@ class LocalLLMTestSuite:
     def _run_single_test(self, model: Dict[str, str], qa: Dict[str, str],
                         question_num: int, test_num: int, expected_answer: str) -> Dict[str, Any]:
 
+        response, energy_metrics = self._generate_response(model, qa, question_num, test_num, expected_answer)
+
+        # Evaluate response
+        evaluation_result = self.evaluation_manager.evaluate_response(
+            qa['question'], expected_answer, response['response']
+        )
+        self.evaluation_manager.display_evaluation_results(evaluation_result)
+
+        return build_test_result(response, energy_metrics, evaluation_result)
+
+    def _generate_response(self, model: Dict[str, str], qa: Dict[str, str],
+                           question_num: int, test_num: int, expected_answer: str) -> tuple:
+
         self.displayer.display_question_header(question_num, test_num, qa['question'])
         self.displayer.display_expected_answer(expected_answer)
 
@@ -124,42 +547,161 @@ class LocalLLMTestSuite:
         )
 
         # Stop power monitoring
-        energy_usage = self.power_manager.stop_monitoring()
-        energy_consumption_wh = self.power_manager.calculate_energy_consumption(
-            energy_usage, response['response_time']
+        power_measurement = self.power_manager.stop_monitoring()
+        energy_metrics = self.power_manager.calculate_energy_metrics(
+            power_measurement, response['completion_tokens']
         )
 
         # Display response details
         self.displayer.display_response_details(response)
-        self.power_manager.display_power_metrics(energy_usage, response['response_time'])
+        self.power_manager.display_power_metrics(energy_metrics)
 
-        # Evaluate response
-        evaluation_result = self.evaluation_manager.evaluate_response(
-            qa['question'], expected_answer, response['response']
-        )
-        self.evaluation_manager.display_evaluation_results(evaluation_result)
+        return response, energy_metrics
 
+    def _get_sampling_summary(self, question_count: int) -> Dict[str, Any]:
+        # Savings are against the fixed run of number_of_tests per question that sampling replaces,
+        # so they are negative when adaptive sampling ran more tests
+        model_questions = len(self.config.subject_models) * question_count
+        fixed_tests = model_questions * self.config.number_of_tests
         return {
-            'llm_answer': response['response'],
-            'prompt_tokens': response['prompt_tokens'],
-            'completion_tokens': response['completion_tokens'],
-            'total_tokens': response['total_tokens'],
-            'response_time': response['response_time'],
-            'energy_consumption_wh': energy_consumption_wh,
-            'evaluation_score': float(evaluation_result['score']),
-            'evaluation_reasoning': evaluation_result['reasoning']
+            'number_of_tests': self.config.number_of_tests,
+            'fixed_tests': fixed_tests,
+            'max_tests': self.adaptive_sampler.max_tests if self.adaptive_sampler else None,
+            'ceiling_tests': model_questions * self.adaptive_sampler.max_tests if self.adaptive_sampler else None,
+            'tests_run': self.tests_run,
+            'tests_saved': fixed_tests - self.tests_run,
+            'eliminated_models': self.eliminated_models
         }
 
-    def _display_final_results(self, model_metrics: Dict[str, Dict[str, float]]) -> None:
+    def _display_final_results(self, model_metrics: Dict[str, Dict[str, float]], question_count: int) -> None:
         self.displayer.display_model_comparison(model_metrics)
-
-        winning_model_name, winning_score = self.analyzer.find_winning_model(model_metrics)
-        self.displayer.display_winning_model(winning_model_name, winning_score)
+        self.displayer.display_energy_ranking(self.analyzer.rank_models_by_energy_efficiency(model_metrics))
+
+        self.displayer.display_scoring_summary(self.evaluation_manager.get_scoring_summary())
+
+        if self.evaluation_cache:
+            self.displayer.display_cache_stats(self.evaluation_cache.get_stats())
+
+        if isinstance(self.runner, PipelineTestRunner):
+            self.displayer.display_pipeline_stats(self.runner.get_stats_summary())
+
+        self.displayer.display_provider_stats(registry.get_stats())
+        self.displayer.display_endpoint_stats(registry.get_endpoint_stats())
+
+        if self.adaptive_sampler or self.successive_halving:
+            self.displayer.display_sampling_summary(self._get_sampling_summary(question_count))
+
+        # Models dropped by successive halving were already shown to be worse on fewer questions
+        comparison = self.analyzer.compare_models({
+            model_name: scores for model_name, scores in self.question_scores.items()
+            if model_name not in self.eliminated_models
+        })
+        if comparison:
+            self.displayer.display_significance(comparison)
+
+        if comparison and len(comparison['tied_models']) > 1:
+            self.displayer.display_tied_models(comparison, model_metrics)
+        elif comparison:
+            winning_model_name = comparison['best_model']
+            self.displayer.display_winning_model(winning_model_name, model_metrics[winning_model_name]['avg_score'], comparison)
+        else:
+            winning_model_name, winning_score = self.analyzer.find_winning_model(model_metrics)
+            self.displayer.display_winning_model(winning_model_name, winning_score)
+
+
+def run_suite_manifest(config_path: str, resume: bool = False, powermetrics: Optional[bool] = None) -> None:
+    """Runs every job listed under `jobs` in the configuration, model-major."""
+    config = ConfigManager(config_path)
+    jobs = []
+    warmed_up_models: Set[str] = set()
+    for overrides in job_overrides(config):
+        with startup_profiler.measure('LocalLLMTestSuite'):
+            suite = LocalLLMTestSuite(
+                config_path, resume=resume, powermetrics=powermetrics, config_overrides=overrides,
+                power_manager=jobs[0][1].power_manager if jobs else None, warmed_up_models=warmed_up_models
+            )
+        if suite.successive_halving:
+            raise ValueError("Successive halving tests models round by round, so it cannot be used with suite jobs")
+        jobs.append((overrides['name'], suite))
+    SuiteScheduler(jobs, config.suite_output).run(config.subject_models)
 
 
 def main():
-    test_suite = LocalLLMTestSuite()
-    test_suite.run_complete_test_suite()
+    parser = argparse.ArgumentParser(description='Test and evaluate local LLMs')
+    parser.add_argument('--config', default='config.yml', help='Path to the configuration file')
+    parser.add_argument('--resume', action='store_true',
+                        help='Resume an interrupted run, skipping tests already recorded in the run journal')
+    parser.add_argument('--profile-startup', action='store_true',
+                        help='Report import and initialization time per module at the end of the run')
+    parser.add_argument('--workers', type=int,
+                        help='Split the tests across this many local worker processes and merge their results')
+    parser.add_argument('--shard-index', type=int,
+                        help='Worker mode: run only this shard of the tests (0 to shard count - 1)')
+    parser.add_argument('--shard-count', type=int, default=1, help='Worker mode: number of shards')
+    parser.add_argument('--merge', nargs='+', metavar='JOURNAL',
+                        help='Merge shard worker journals and write the combined results')
+    parser.add_argument('--no-powermetrics', action='store_true', help='Do not record power for this run')
+    output_mode = parser.add_mutually_exclusive_group()
+    output_mode.add_argument('--quiet', dest='console_mode', action='store_const', const='quiet',
+                             help='Print only headers and summaries; per-test output goes to the console log file')
+    output_mode.add_argument('--progress', dest='console_mode', action='store_const', const='progress',
+                             help='Show a live progress view; per-test output goes to the console log file')
+    output_mode.add_argument('--verbose', dest='console_mode', action='store_const', const='verbose',
+                             help='Print every answer, its token counts and the judge reasoning')
+    args = parser.parse_args()
+    powermetrics = False if args.no_powermetrics else None
+
+    console_settings = ConfigManager(args.config).console
+    console.configure(
+        args.console_mode or console_settings.get('mode', 'verbose'),
+        console_settings.get('log_file', 'run_output.log'),
+        console_settings.get('refresh_interval', 0.5),
+        console_settings.get('throughput_window', 30.0)
+    )
+    try:
+        _run(parser, args, powermetrics)
+    finally:
+        console.close()
+
+    if args.profile_startup:
+        startup_profiler.display_report()
+
+
+def _run(parser: argparse.ArgumentParser, args: argparse.Namespace, powermetrics: Optional[bool]) -> None:
+    suite_manifest = bool(ConfigManager(args.config).jobs)
+    if suite_manifest and (args.workers or args.shard_index is not None or args.merge):
+        parser.error("Suite manifests (jobs) cannot be combined with --workers, --shard-index or --merge")
+
+    merge_paths = args.merge
+    if args.workers:
+        config = ConfigManager(args.config)
+        journal_dir = config.distributed.get('journal_dir', 'shards')
+        run_workers(args.config, args.workers, journal_dir, args.resume)
+        merge_paths = [
+            shard_journal_path(config.journal_path, journal_dir, shard_index, args.workers)
+            for shard_index in range(args.workers)
+        ]
+
+    if suite_manifest:
+        run_suite_manifest(args.config, args.resume, powermetrics)
+    elif merge_paths:
+        journal_path = ConfigManager(args.config).journal_path
+        merged_tests = RunJournal.merge(merge_paths, journal_path)
+        print(f"Merged {merged_tests} tests from {len(merge_paths)} shard journals into {journal_path}")
+        with startup_profiler.measure('LocalLLMTestSuite'):
+            test_suite = LocalLLMTestSuite(args.config, resume=True, merging=True)
+        test_suite.run_complete_test_suite()
+    elif args.shard_index is not None:
+        with startup_profiler.measure('LocalLLMTestSuite'):
+            test_suite = LocalLLMTestSuite(
+                args.config, resume=args.resume, shard_index=args.shard_index, shard_count=args.shard_count,
+                powermetrics=powermetrics
+            )
+        test_suite.run_shard()
+    else:
+        with startup_profiler.measure('LocalLLMTestSuite'):
+            test_suite = LocalLLMTestSuite(args.config, resume=args.resume, powermetrics=powermetrics)
+        test_suite.run_complete_test_suite()
 
 
 if __name__ == "__main__":
@@ -1,47 +1,175 @@
-import statistics
+import numpy as np
 from typing import Dict, List, Any, Optional
 
 
+# Metrics reported with a full distribution summary, mapped to their collector series and CSV precision
+DISTRIBUTION_METRICS = {
+    'response_time': ('response_times', 3),
+    'completion_tokens': ('completion_tokens', 2),
+    'energy_usage': ('energy_usage', 6)
+}
+DISTRIBUTION_STATS = ['p50', 'p90', 'p95', 'p99', 'stddev', 'min', 'max', 'ci_low', 'ci_high']
+DISTRIBUTION_FIELDNAMES = [f"{metric}_{stat}" for metric in DISTRIBUTION_METRICS for stat in DISTRIBUTION_STATS]
+COLD_START_FIELDNAMES = ['cold_start_response_time', 'cold_start_time_to_first_token', 'model_load_latency']
+
+
+class MetricSeries:
+    """Growable float64 array, so large sample counts use 8 bytes per value."""
+
+    def __init__(self, initial_capacity: int = 16):
+        self._data = np.empty(initial_capacity, dtype=np.float64)
+        self._size = 0
+
+    def append(self, value: float) -> None:
+        if self._size == len(self._data):
+            self._data = np.resize(self._data, len(self._data) * 2)
+        self._data[self._size] = value
+        self._size += 1
+
+    @property
+    def values(self) -> np.ndarray:
+        return self._data[:self._size]
+
+    def mean(self) -> Optional[float]:
+        return float(self.values.mean()) if self._size else None
+
+    def __len__(self) -> int:
+        return self._size
+
+
 class MetricsCollector:
+    BOOTSTRAP_RESAMPLES = 1000
+    CONFIDENCE_LEVEL = 0.95
+    # Upper bound on resampled values held in memory at once during bootstrapping
+    BOOTSTRAP_CHUNK_ELEMENTS = 2_000_000
+
     def __init__(self):
         self.reset()
     
     def reset(self):
-        self.evaluation_scores = []
-        self.response_times = []
-        self.completion_tokens = []
-        self.total_tokens = []
-        self.energy_usage = []
+        self.evaluation_scores = MetricSeries()
+        self.response_times = MetricSeries()
+        self.completion_tokens = MetricSeries()
+        self.total_tokens = MetricSeries()
+        self.energy_usage = MetricSeries()
+        # Completion tokens of the tests that have an energy measurement, for per-token energy
+        self.energy_completion_tokens = MetricSeries()
+        self.time_to_first_token = MetricSeries()
+        self.decode_tokens_per_second = MetricSeries()
+        self.inter_token_latency = MetricSeries()
     
     def add_metric(self, evaluation_score: float, response_time: float, 
                    completion_tokens: int, total_tokens: int, 
-                   energy_consumption_wh: Optional[float] = None):
+                   energy_consumption_wh: Optional[float] = None,
+                   time_to_first_token: Optional[float] = None,
+                   decode_tokens_per_second: Optional[float] = None,
+                   inter_token_latency: Optional[float] = None):
         self.evaluation_scores.append(evaluation_score)
         self.response_times.append(response_time)
         self.completion_tokens.append(completion_tokens)
         self.total_tokens.append(total_tokens)
         if energy_consumption_wh is not None:
             self.energy_usage.append(energy_consumption_wh)
+            self.energy_completion_tokens.append(completion_tokens)
+        if time_to_first_token is not None:
+            self.time_to_first_token.append(time_to_first_token)
+        if decode_tokens_per_second is not None:
+            self.decode_tokens_per_second.append(decode_tokens_per_second)
+        if inter_token_latency is not None:
+            self.inter_token_latency.append(inter_token_latency)
     
     def get_averages(self) -> Dict[str, Optional[float]]:
+        averages = {
+            'avg_score': self.evaluation_scores.mean() or 0,
+            'avg_response_time': self.response_times.mean() or 0,
+            'avg_completion_tokens': self.completion_tokens.mean() or 0,
+            'avg_total_tokens': self.total_tokens.mean() or 0,
+            'avg_energy_usage': self.energy_usage.mean(),
+            'avg_time_to_first_token': self.time_to_first_token.mean(),
+            'avg_decode_tokens_per_second': self.decode_tokens_per_second.mean(),
+            'avg_inter_token_latency': self.inter_token_latency.mean(),
+            **self.get_energy_efficiency()
+        }
+        for metric, (series_name, _) in DISTRIBUTION_METRICS.items():
+            distribution = self.get_distribution(getattr(self, series_name).values)
+            averages.update({f"{metric}_{stat}": value for stat, value in distribution.items()})
+        return averages
+
+    def get_energy_efficiency(self) -> Dict[str, Optional[float]]:
+        # Ratios of totals, so long answers weigh in proportion to their tokens
+        energy_joules = float(self.energy_usage.values.sum()) * 3600
+        energy_tokens = float(self.energy_completion_tokens.values.sum())
+        return {
+            'joules_per_token': energy_joules / energy_tokens if energy_tokens else None,
+            'tokens_per_joule': energy_tokens / energy_joules if energy_joules > 0 else None
+        }
+
+    def get_distribution(self, values: np.ndarray) -> Dict[str, Optional[float]]:
+        if len(values) == 0:
+            return {stat: None for stat in DISTRIBUTION_STATS}
+
+        p50, p90, p95, p99 = np.percentile(values, [50, 90, 95, 99])
+        ci_low, ci_high = self.bootstrap_confidence_interval(values)
         return {
-            'avg_score': statistics.mean(self.evaluation_scores) if self.evaluation_scores else 0,
-            'avg_response_time': statistics.mean(self.response_times) if self.response_times else 0,
-            'avg_completion_tokens': statistics.mean(self.completion_tokens) if self.completion_tokens else 0,
-            'avg_total_tokens': statistics.mean(self.total_tokens) if self.total_tokens else 0,
-            'avg_energy_usage': statistics.mean(self.energy_usage) if self.energy_usage else None
+            'p50': float(p50),
+            'p90': float(p90),
+            'p95': float(p95),
+            'p99': float(p99),
+            'stddev': float(values.std(ddof=1)) if len(values) > 1 else 0.0,
+            'min': float(values.min()),
+            'max': float(values.max()),
+            'ci_low': ci_low,
+            'ci_high': ci_high
         }
+
+    def bootstrap_confidence_interval(self, values: np.ndarray) -> tuple:
+        """Percentile bootstrap confidence interval for the mean.
+
+        Resamples are drawn in chunks so memory is bounded however many
+        samples the collector holds. A fixed seed keeps reports reproducible.
+        """
+        n = len(values)
+        if n < 2:
+            return float(values[0]), float(values[0])
+
+        rng = np.random.default_rng(0)
+        chunk_size = max(1, self.BOOTSTRAP_CHUNK_ELEMENTS // n)
+        means = np.empty(self.BOOTSTRAP_RESAMPLES, dtype=np.float64)
+        for start in range(0, self.BOOTSTRAP_RESAMPLES, chunk_size):
+            count = min(chunk_size, self.BOOTSTRAP_RESAMPLES - start)
+            indices = rng.integers(0, n, size=(count, n))
+            means[start:start + count] = values[indices].mean(axis=1)
+
+        alpha = (1 - self.CONFIDENCE_LEVEL) / 2 * 100
+        ci_low, ci_high = np.percentile(means, [alpha, 100 - alpha])
+        return float(ci_low), float(ci_high)
     
     def get_raw_metrics(self) -> Dict[str, List]:
         return {
-            'evaluation_scores': self.evaluation_scores.copy(),
-            'response_times': self.response_times.copy(),
-            'completion_tokens': self.completion_tokens.copy(),
-            'total_tokens': self.total_tokens.copy(),
-            'energy_usage': self.energy_usage.copy()
+            'evaluation_scores': self.evaluation_scores.values.tolist(),
+            'response_times': self.response_times.values.tolist(),
+            'completion_tokens': self.completion_tokens.values.tolist(),
+            'total_tokens': self.total_tokens.values.tolist(),
+            'energy_usage': self.energy_usage.values.tolist(),
+            'energy_completion_tokens': self.energy_completion_tokens.values.tolist(),
+            'time_to_first_token': self.time_to_first_token.values.tolist(),
+            'decode_tokens_per_second': self.decode_tokens_per_second.values.tolist(),
+            'inter_token_latency': self.inter_token_latency.values.tolist()
         }
 
 
+def _format_optional(value: Optional[float], precision: int) -> str:
+    return f"{value:.{precision}f}" if value is not None else 'N/A'
+
+
+def _distribution_csv_fields(averages: Dict[str, Optional[float]]) -> Dict[str, str]:
+    fields = {}
+    for metric, (_, precision) in DISTRIBUTION_METRICS.items():
+        for stat in DISTRIBUTION_STATS:
+            fields[f"{metric}_{stat}"] = _format_optional(averages[f"{metric}_{stat}"], precision)
+    return fields
+
+
 class QuestionMetricsCollector(MetricsCollector):
     def __init__(self, question_num: int, question: str):
         super().__init__()
@@ -52,7 +180,16 @@ class QuestionMetricsCollector(MetricsCollector):
                        expected_answer: str, model_name: str, evaluator: str,
                        evaluator_model: str, prompt_tokens: int, completion_tokens: int,
                        total_tokens: int, response_time: float, energy_usage: Optional[float],
-                       evaluation_score: float, evaluation_reasoning: str) -> Dict[str, str]:
+                       evaluation_score: float, evaluation_reasoning: str,
+                       time_to_first_token: Optional[float] = None,
+                       inter_token_latency_avg: Optional[float] = None,
+                       inter_token_latency_p95: Optional[float] = None,
+                       decode_tokens_per_second: Optional[float] = None,
+                       scored_by: str = '',
+                       gross_energy_usage: Optional[float] = None,
+                       joules_per_token: Optional[float] = None,
+                       tokens_per_joule: Optional[float] = None,
+                       endpoint: Optional[str] = None) -> Dict[str, str]:
         return {
             'question_number': self.question_num,
             'test_number': test_num,
@@ -60,6 +197,7 @@ class QuestionMetricsCollector(MetricsCollector):
             'llm_answer': llm_answer,
             'expected_answer': expected_answer if expected_answer else '',
             'model_name': model_name,
+            'endpoint': endpoint or '',
             'evaluator': evaluator,
             'evaluator_model': evaluator_model,
             'prompt_tokens': prompt_tokens,
@@ -67,12 +205,19 @@ class QuestionMetricsCollector(MetricsCollector):
             'total_tokens': total_tokens,
             'response_time': f"{response_time:.2f}",
             'energy_usage': f"{energy_usage:.6f}" if energy_usage is not None else 'N/A',
+            'gross_energy_usage': _format_optional(gross_energy_usage, 6),
+            'joules_per_token': _format_optional(joules_per_token, 4),
+            'tokens_per_joule': _format_optional(tokens_per_joule, 4),
             'evaluation_score': f"{evaluation_score:.2f}",
-            'evaluation_reasoning': evaluation_reasoning
+            'evaluation_reasoning': evaluation_reasoning,
+            'scored_by': scored_by,
+            'time_to_first_token': _format_optional(time_to_first_token, 3),
+            'inter_token_latency_avg': _format_optional(inter_token_latency_avg, 4),
+            'inter_token_latency_p95': _format_optional(inter_token_latency_p95, 4),
+            'decode_tokens_per_second': _format_optional(decode_tokens_per_second, 2)
         }
     
-    def create_average_csv_row(self) -> Dict[str, str]:
-        averages = self.get_averages()
+    def create_average_csv_row(self, averages: Dict[str, Optional[float]]) -> Dict[str, str]:
         return {
             'question_number': self.question_num,
             'test_number': 'Average',
@@ -87,8 +232,15 @@ class QuestionMetricsCollector(MetricsCollector):
             'total_tokens': f"{averages['avg_total_tokens']:.2f}",
             'response_time': f"{averages['avg_response_time']:.2f}",
             'energy_usage': f"{averages['avg_energy_usage']:.6f}" if averages['avg_energy_usage'] is not None else 'N/A',
+            'joules_per_token': _format_optional(averages['joules_per_token'], 4),
+            'tokens_per_joule': _format_optional(averages['tokens_per_joule'], 4),
             'evaluation_score': f"{averages['avg_score']:.2f}",
-            'evaluation_reasoning': ''
+            'evaluation_reasoning': '',
+            'time_to_first_token': _format_optional(averages['avg_time_to_first_token'], 3),
+            'inter_token_latency_avg': _format_optional(averages['avg_inter_token_latency'], 4),
+            'inter_token_latency_p95': '',
+            'decode_tokens_per_second': _format_optional(averages['avg_decode_tokens_per_second'], 2),
+            **_distribution_csv_fields(averages)
         }
 
 
@@ -96,11 +248,74 @@ class ModelMetricsCollector(MetricsCollector):
     def __init__(self, model_name: str):
         super().__init__()
         self.model_name = model_name
-    
-    def create_model_average_csv_row(self, evaluator: str, evaluator_model: str) -> Dict[str, str]:
-        averages = self.get_averages()
+        self.cold_start: Optional[Dict[str, Any]] = None
+        # Per-endpoint series, for models served by several endpoints
+        self.endpoints: Dict[str, MetricsCollector] = {}
+
+    def add_metric(self, *metrics, endpoint: Optional[str] = None) -> None:
+        super().add_metric(*metrics)
+        if endpoint:
+            self.endpoints.setdefault(endpoint, MetricsCollector()).add_metric(*metrics)
+
+    def get_endpoint_averages(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            endpoint: {**collector.get_averages(), 'tests': len(collector.response_times)}
+            for endpoint, collector in self.endpoints.items()
+        }
+
+    def add_warmup(self, response: Dict[str, Any]) -> None:
+        # Only the first warmup request can include loading the model
+        if self.cold_start is None:
+            self.cold_start = response
+
+    def get_averages(self) -> Dict[str, Optional[float]]:
+        return {**super().get_averages(), **self.get_cold_start_metrics()}
+
+    def get_cold_start_metrics(self) -> Dict[str, Optional[float]]:
+        """Cold start figures from the first warmup request.
+
+        Load latency is the cold request's time to first token (or response
+        time when not streaming) above the steady-state median of the tests.
+        """
+        if self.cold_start is None:
+            return {name: None for name in COLD_START_FIELDNAMES}
+
+        cold_latency = self.cold_start['time_to_first_token']
+        steady_latencies = self.time_to_first_token.values
+        if cold_latency is None or len(steady_latencies) == 0:
+            cold_latency = self.cold_start['response_time']
+            steady_latencies = self.response_times.values
+
+        model_load_latency = None
+        if len(steady_latencies):
+            model_load_latency = max(0.0, cold_latency - float(np.median(steady_latencies)))
+
+        return {
+            'cold_start_response_time': self.cold_start['response_time'],
+            'cold_start_time_to_first_token': self.cold_start['time_to_first_token'],
+            'model_load_latency': model_load_latency
+        }
+
+    def create_model_average_csv_row(self, averages: Dict[str, Optional[float]], evaluator: str,
+                                     evaluator_model: str) -> Dict[str, str]:
+        return self._create_average_csv_row(f"Model_{self.model_name}_Average", averages, evaluator, evaluator_model)
+
+    def create_endpoint_average_csv_rows(self, endpoint_averages: Dict[str, Dict[str, Any]], evaluator: str,
+                                         evaluator_model: str) -> List[Dict[str, str]]:
+        return [
+            {
+                **self._create_average_csv_row(
+                    f"Model_{self.model_name}_Endpoint_Average", averages, evaluator, evaluator_model
+                ),
+                'endpoint': endpoint
+            }
+            for endpoint, averages in endpoint_averages.items()
+        ]
+
+    def _create_average_csv_row(self, question_number: str, averages: Dict[str, Any], evaluator: str,
+                                evaluator_model: str) -> Dict[str, str]:
         return {
-            'question_number': f"Model_{self.model_name}_Average",
+            'question_number': question_number,
             'test_number': 'Average',
             'question': '',
             'llm_answer': '',
@@ -113,6 +328,16 @@ class ModelMetricsCollector(MetricsCollector):
             'total_tokens': f"{averages['avg_total_tokens']:.2f}",
             'response_time': f"{averages['avg_response_time']:.2f}",
             'energy_usage': f"{averages['avg_energy_usage']:.6f}" if averages['avg_energy_usage'] is not None else 'N/A',
+            'joules_per_token': _format_optional(averages['joules_per_token'], 4),
+            'tokens_per_joule': _format_optional(averages['tokens_per_joule'], 4),
             'evaluation_score': f"{averages['avg_score']:.2f}",
-            'evaluation_reasoning': ''
+            'evaluation_reasoning': '',
+            'time_to_first_token': _format_optional(averages['avg_time_to_first_token'], 3),
+            'inter_token_latency_avg': _format_optional(averages['avg_inter_token_latency'], 4),
+            'inter_token_latency_p95': '',
+            'decode_tokens_per_second': _format_optional(averages['avg_decode_tokens_per_second'], 2),
+            'cold_start_response_time': _format_optional(averages.get('cold_start_response_time'), 3),
+            'cold_start_time_to_first_token': _format_optional(averages.get('cold_start_time_to_first_token'), 3),
+            'model_load_latency': _format_optional(averages.get('model_load_latency'), 3),
+            **_distribution_csv_fields(averages)
         }
\ No newline at end of file
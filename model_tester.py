@@ -1,18 +1,54 @@
 from typing import Dict, Any, List, Optional
-from test_subject import test_model
+from test_subject import test_model, test_model_async
 from evaluators.evaluation_types import EvaluationType
 
 
+def build_test_result(response: Dict[str, Any], energy_metrics: Optional[Dict[str, Any]],
+                      evaluation_result: Dict[str, Any]) -> Dict[str, Any]:
+    energy_metrics = energy_metrics or {}
+    return {
+        'llm_answer': response['response'],
+        'prompt_tokens': response['prompt_tokens'],
+        'completion_tokens': response['completion_tokens'],
+        'total_tokens': response['total_tokens'],
+        'response_time': response['response_time'],
+        'endpoint': response.get('endpoint'),
+        'time_to_first_token': response['time_to_first_token'],
+        'decode_tokens_per_second': response['decode_tokens_per_second'],
+        'inter_token_latency_avg': response['inter_token_latency_avg'],
+        'inter_token_latency_p95': response['inter_token_latency_p95'],
+        'energy_consumption_wh': energy_metrics.get('energy_consumption_wh'),
+        'gross_energy_consumption_wh': energy_metrics.get('gross_energy_consumption_wh'),
+        'joules_per_token': energy_metrics.get('joules_per_token'),
+        'tokens_per_joule': energy_metrics.get('tokens_per_joule'),
+        'evaluation_score': float(evaluation_result['score']),
+        'evaluation_reasoning': evaluation_result['reasoning'],
+        'scored_by': evaluation_result['scored_by']
+    }
+
+
 class ModelTester:
-    def __init__(self, evaluation_type: EvaluationType):
+    def __init__(self, evaluation_type: EvaluationType, streaming: bool = False):
         self.evaluation_type = evaluation_type
+        self.streaming = streaming
 
     def test_single_iteration(self, provider: str, model: str, question: str) -> Dict[str, Any]:
         response = test_model(
             provider=provider,
             model=model,
             evaluation_type=self.evaluation_type,
-            question=question
+            question=question,
+            stream=self.streaming
+        )
+        return response
+
+    async def test_single_iteration_async(self, provider: str, model: str, question: str) -> Dict[str, Any]:
+        response = await test_model_async(
+            provider=provider,
+            model=model,
+            evaluation_type=self.evaluation_type,
+            question=question,
+            stream=self.streaming
         )
         return response
 
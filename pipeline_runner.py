@@ -0,0 +1,174 @@
+import asyncio
+import time
+from typing import Callable, Dict, List, Any, Optional
+from model_tester import ModelTester, build_test_result
+from evaluation_manager import EvaluationManager
+from power_metrics_manager import PowerMetricsManager
+from run_journal import RunJournal
+from console_output import console
+from providers.registry import registry
+
+
+class PipelineStats:
+    def __init__(self):
+        self.generated = 0
+        self.evaluated = 0
+        self.generation_busy_time = 0.0
+        self.evaluation_busy_time = 0.0
+        self.backpressure_wait_time = 0.0
+        self.queue_depth_samples = 0
+        self.queue_depth_total = 0
+        self.max_queue_depth = 0
+        self.wall_time = 0.0
+
+    def record_queue_depth(self, depth: int) -> None:
+        self.queue_depth_samples += 1
+        self.queue_depth_total += depth
+        self.max_queue_depth = max(self.max_queue_depth, depth)
+
+    def get_summary(self, queue_size: int, judge_workers: int) -> Dict[str, float]:
+        def rate(count, seconds):
+            return count / seconds if seconds > 0 else 0
+
+        return {
+            'queue_size': queue_size,
+            'judge_workers': judge_workers,
+            'wall_time': self.wall_time,
+            'generated': self.generated,
+            'evaluated': self.evaluated,
+            'generation_throughput': rate(self.generated, self.wall_time),
+            'evaluation_throughput': rate(self.evaluated, self.wall_time),
+            'generation_utilisation': self.generation_busy_time / self.wall_time if self.wall_time > 0 else 0,
+            'evaluation_utilisation': self.evaluation_busy_time / (self.wall_time * judge_workers) if self.wall_time > 0 else 0,
+            'backpressure_wait_time': self.backpressure_wait_time,
+            'avg_queue_depth': self.queue_depth_total / self.queue_depth_samples if self.queue_depth_samples else 0,
+            'max_queue_depth': self.max_queue_depth
+        }
+
+
+class PipelineTestRunner:
+    """Runs generation and evaluation as separate stages joined by a bounded queue.
+
+    The subject model generates answers one at a time, so power monitoring is
+    still attributed per test, while a pool of judge workers scores completed
+    answers. Queue items hold up to the evaluator batch size of answers to one
+    question. Once the queue is full, generation waits for a judge to catch up.
+    """
+
+    def __init__(self, model_tester: ModelTester, evaluation_manager: EvaluationManager,
+                 power_manager: PowerMetricsManager, number_of_tests: int,
+                 queue_size: int, judge_workers: int, journal: RunJournal):
+        self.model_tester = model_tester
+        self.evaluation_manager = evaluation_manager
+        self.power_manager = power_manager
+        self.number_of_tests = number_of_tests
+        self.queue_size = queue_size
+        self.judge_workers = judge_workers
+        self.journal = journal
+        # Set on shard workers to skip tests that belong to other shards
+        self.test_filter: Optional[Callable[[str, int, int], bool]] = None
+        self.stats = PipelineStats()
+
+    def run_model(self, model: Dict[str, str], qa_pairs: List[Dict[str, str]],
+                  first_question_num: int = 1) -> List[List[Dict[str, Any]]]:
+        return asyncio.run(registry.run_and_close(self._run_model(model, qa_pairs, first_question_num)))
+
+    def get_stats_summary(self) -> Dict[str, float]:
+        return self.stats.get_summary(self.queue_size, self.judge_workers)
+
+    async def _run_model(self, model: Dict[str, str], qa_pairs: List[Dict[str, str]],
+                         first_question_num: int) -> List[List[Dict[str, Any]]]:
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        results = [[None] * self.number_of_tests for _ in qa_pairs]
+        errors = []
+
+        start_time = time.perf_counter()
+        workers = [
+            asyncio.create_task(self._judge_worker(queue, errors))
+            for _ in range(self.judge_workers)
+        ]
+
+        await self._generate(model, qa_pairs, first_question_num, queue, results)
+        await queue.join()
+
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        self.stats.wall_time += time.perf_counter() - start_time
+
+        if errors:
+            raise errors[0]
+
+        return results
+
+    async def _generate(self, model: Dict[str, str], qa_pairs: List[Dict[str, str]], first_question_num: int,
+                        queue: asyncio.Queue, results: List[List[Optional[Dict[str, Any]]]]) -> None:
+        batch_size = max(1, self.evaluation_manager.batch_size)
+
+        for question_num, qa in enumerate(qa_pairs, first_question_num):
+            question_results = results[question_num - first_question_num]
+            batch = []
+            for test_num in range(1, self.number_of_tests + 1):
+                if self.test_filter and not self.test_filter(model['model'], question_num, test_num):
+                    continue
+                journaled_result = self.journal.get_result(model['model'], question_num, test_num)
+                if journaled_result:
+                    question_results[test_num - 1] = journaled_result
+                    continue
+
+                busy_start = time.perf_counter()
+
+                self.power_manager.start_monitoring()
+                response = await self.model_tester.test_single_iteration_async(
+                    model['provider'], model['model'], qa['question']
+                )
+                power_measurement = await asyncio.to_thread(self.power_manager.stop_monitoring)
+                energy_metrics = self.power_manager.calculate_energy_metrics(
+                    power_measurement, response['completion_tokens']
+                )
+
+                self.stats.generation_busy_time += time.perf_counter() - busy_start
+                self.stats.generated += 1
+
+                batch.append((test_num, response, energy_metrics))
+                if len(batch) == batch_size:
+                    await self._enqueue(queue, (model['model'], question_num, qa, batch, question_results))
+                    batch = []
+
+            if batch:
+                await self._enqueue(queue, (model['model'], question_num, qa, batch, question_results))
+
+    async def _enqueue(self, queue: asyncio.Queue, item: tuple) -> None:
+        wait_start = time.perf_counter()
+        await queue.put(item)
+        self.stats.backpressure_wait_time += time.perf_counter() - wait_start
+        self.stats.record_queue_depth(queue.qsize())
+
+    async def _judge_worker(self, queue: asyncio.Queue, errors: List[Exception]) -> None:
+        while True:
+            model_name, question_num, qa, batch, question_results = await queue.get()
+            try:
+                if errors:
+                    # Drain the queue without judging once a worker has failed
+                    continue
+
+                busy_start = time.perf_counter()
+                expected_answer = qa['answer'] if qa['answer'] else None
+                evaluation_results = await self.evaluation_manager.evaluate_responses_async(
+                    qa['question'], expected_answer, [response['response'] for _, response, _ in batch]
+                )
+                self.stats.evaluation_busy_time += time.perf_counter() - busy_start
+                self.stats.evaluated += len(batch)
+
+                for (test_num, response, energy_metrics), evaluation_result in zip(batch, evaluation_results):
+                    print(f"Question {question_num}, Test {test_num}: completed in {response['response_time']:.2f} seconds, "
+                          f"score {evaluation_result['score']}", file=console.details)
+
+                    result = build_test_result(response, energy_metrics, evaluation_result)
+                    self.journal.record(model_name, question_num, test_num, result)
+                    console.record_test(model_name, result)
+                    question_results[test_num - 1] = result
+            except Exception as e:
+                errors.append(e)
+            finally:
+                queue.task_done()
@@ -1,36 +1,133 @@
-from typing import Optional
-from powermetrics import PowerMetricsCollector
+import time
+from typing import Any, Dict, Optional
+from console_output import console
+from power_source import PowerSource
+from powermetrics import PowerMetricsSampler
+from rapl import RaplPowerSource
+
+# Tried in order when power_backend is 'auto'
+POWER_BACKENDS = {
+    PowerMetricsSampler.name: PowerMetricsSampler,
+    RaplPowerSource.name: RaplPowerSource
+}
 
 
 class PowerMetricsManager:
-    def __init__(self, enabled: bool = False):
+    """Measures energy per test from one power source that runs for the whole suite.
+
+    Each test marks its [start, end] window and gets the energy integrated over
+    exactly that window. When an idle baseline has been calibrated, the idle
+    draw over the window is subtracted to give the net energy used by the model.
+    """
+
+    def __init__(self, enabled: bool = False, backend: str = 'auto', source: Optional[PowerSource] = None,
+                 baseline_seconds: float = 0.0):
         self.enabled = enabled
-        self.power_collector = None
-        
+        self.backend = backend
+        self.source = source
+        self.baseline_seconds = baseline_seconds
+        self.baseline_power = None
+        self._window_start = None
+
+    def _create_source(self) -> Optional[PowerSource]:
+        if self.backend == 'auto':
+            for source_class in POWER_BACKENDS.values():
+                if source_class.is_available():
+                    return source_class()
+            print("Power: No power backend is available on this system, power metrics are disabled")
+            return None
+
+        if self.backend not in POWER_BACKENDS:
+            raise ValueError(
+                f"Unknown power backend '{self.backend}'. Available backends: auto, {', '.join(POWER_BACKENDS)}"
+            )
+        return POWER_BACKENDS[self.backend]()
+
+    def start(self) -> None:
+        # Started ahead of the first test so that its window is already being measured
+        if self.enabled and self.source is None:
+            self.source = self._create_source()
+            if self.source is None:
+                self.enabled = False
+                return
+            self.source.start()
+
+    def calibrate_baseline(self) -> Optional[float]:
+        """Measures the idle system power, which is subtracted from every test window."""
+        if not self.enabled or self.baseline_seconds <= 0:
+            return None
+
+        print(f"\nMeasuring idle power baseline for {self.baseline_seconds:g} seconds...")
+        start_mark, start_time = self.source.mark(), time.perf_counter()
+        time.sleep(self.baseline_seconds)
+        end_mark, end_time = self.source.mark(), time.perf_counter()
+
+        joules = self.source.energy_between(start_mark, end_mark)
+        if joules is not None:
+            self.baseline_power = joules / (end_time - start_time)
+            print(f"Idle Power Baseline: {self.baseline_power:.3f} W")
+        else:
+            print("Idle Power Baseline: N/A")
+        return self.baseline_power
+
     def start_monitoring(self) -> None:
         if self.enabled:
-            self.power_collector = PowerMetricsCollector()
-            self.power_collector.start_collection()
+            self.start()
+        if self.enabled:
+            self._window_start = (self.source.mark(), time.perf_counter())
     
-    def stop_monitoring(self) -> Optional[float]:
-        if self.enabled and self.power_collector:
-            energy_usage = self.power_collector.stop_collection()
-            return energy_usage
-        return None
+    def stop_monitoring(self) -> Optional[Dict[str, float]]:
+        if not (self.enabled and self.source and self._window_start is not None):
+            return None
+
+        end_mark, end_time = self.source.mark(), time.perf_counter()
+        start_mark, start_time = self._window_start
+        self._window_start = None
+
+        joules = self.source.energy_between(start_mark, end_mark)
+        if joules is None:
+            return None
+
+        duration = end_time - start_time
+        baseline_joules = (self.baseline_power or 0.0) * duration
+        return {
+            'duration': duration,
+            'energy_joules': joules,
+            'net_energy_joules': max(0.0, joules - baseline_joules),
+            'average_power': joules / duration if duration > 0 else None
+        }
+
+    def close(self) -> None:
+        if self.source:
+            self.source.stop()
+            self.source = None
     
-    def calculate_energy_consumption(self, energy_usage: Optional[float], 
-                                   response_time: float) -> Optional[float]:
-        if energy_usage is not None and response_time > 0:
-            # Calculate energy consumption in Wh: Power (W) × Time (hours)
-            return energy_usage * (response_time / 3600)
-        return None
+    def calculate_energy_metrics(self, measurement: Optional[Dict[str, float]],
+                                 completion_tokens: int) -> Optional[Dict[str, Any]]:
+        if measurement is None:
+            return None
+
+        net_joules = measurement['net_energy_joules']
+        return {
+            'energy_consumption_wh': net_joules / 3600,
+            'gross_energy_consumption_wh': measurement['energy_joules'] / 3600,
+            'average_power': measurement['average_power'],
+            'joules_per_token': net_joules / completion_tokens if completion_tokens else None,
+            'tokens_per_joule': completion_tokens / net_joules if net_joules > 0 else None
+        }
     
-    def display_power_metrics(self, energy_usage: Optional[float], 
-                            response_time: float) -> None:
-        if energy_usage is not None:
-            energy_consumption_wh = self.calculate_energy_consumption(energy_usage, response_time)
-            print(f"Power Usage: {energy_usage:.3f} W")
-            print(f"Energy Consumption: {energy_consumption_wh:.6f} Wh")
+    def display_power_metrics(self, energy_metrics: Optional[Dict[str, Any]]) -> None:
+        if energy_metrics is not None:
+            if energy_metrics['average_power'] is not None:
+                print(f"Power Usage: {energy_metrics['average_power']:.3f} W", file=console.details)
+            if self.baseline_power is not None:
+                print(f"Energy Consumption: {energy_metrics['energy_consumption_wh']:.6f} Wh net "
+                      f"({energy_metrics['gross_energy_consumption_wh']:.6f} Wh gross, "
+                      f"idle baseline {self.baseline_power:.3f} W)", file=console.details)
+            else:
+                print(f"Energy Consumption: {energy_metrics['energy_consumption_wh']:.6f} Wh", file=console.details)
+            if energy_metrics['joules_per_token'] is not None:
+                print(f"Energy per Token: {energy_metrics['joules_per_token']:.4f} J", file=console.details)
         else:
-            print("Power Usage: N/A")
-            print("Energy Consumption: N/A")
\ No newline at end of file
+            print("Power Usage: N/A", file=console.details)
+            print("Energy Consumption: N/A", file=console.details)
@@ -0,0 +1,53 @@
+from abc import ABC, abstractmethod
+from typing import Any, List, Optional, Tuple
+import numpy as np
+
+
+def integrate_power(points: List[Tuple[float, float]], start: float, end: float) -> Optional[float]:
+    """Trapezoidal integral in joules of (timestamp, watts) points over [start, end].
+
+    Power is interpolated linearly between points and held at the first/last
+    point's value beyond them, so windows shorter than the sample interval
+    still get an estimate.
+    """
+    if not points:
+        return None
+    if end <= start:
+        return 0.0
+
+    timestamps = np.array([timestamp for timestamp, _ in points])
+    watts = np.array([power for _, power in points])
+    inner = timestamps[(timestamps > start) & (timestamps < end)]
+    grid = np.concatenate(([start], inner, [end]))
+    power = np.interp(grid, timestamps, watts)
+    return float(np.sum((power[1:] + power[:-1]) / 2 * np.diff(grid)))
+
+
+class PowerSource(ABC):
+    """Interface for power backends used by PowerMetricsManager.
+
+    A test marks the start and end of its window with mark(); the marks are
+    opaque to the manager and are passed back to energy_between(). start()
+    and stop() are optional hooks for backends that run a sampler.
+    """
+
+    name = ''
+
+    @classmethod
+    @abstractmethod
+    def is_available(cls) -> bool:
+        ...
+
+    def start(self) -> None:
+        pass
+
+    @abstractmethod
+    def mark(self) -> Any:
+        ...
+
+    @abstractmethod
+    def energy_between(self, start: Any, end: Any) -> Optional[float]:
+        """Returns the joules used between two marks, or None if unknown."""
+
+    def stop(self) -> None:
+        pass
@@ -1,72 +1,172 @@
 import subprocess
 import re
+import shutil
+import sys
 import time
 import threading
-import statistics
+from collections import deque
+from typing import Iterable, List, Optional, Tuple
+from power_source import PowerSource, integrate_power
 
-class PowerMetricsCollector:
-    def __init__(self):
-        self.power_readings = []
-        self.is_collecting = False
-        self.collection_thread = None
+COMBINED_POWER_PATTERN = re.compile(r'Combined Power \(CPU \+ GPU \+ ANE\):\s+(\d+)\s+mW')
+ELAPSED_PATTERN = re.compile(r'\*\*\* Sampled system activity .*\(([\d.]+)ms elapsed\) \*\*\*')
 
-    def _collect_power_reading(self):
+# A sample is (timestamp, watts, interval): the average power over (timestamp - interval, timestamp]
+PowerSample = Tuple[float, float, float]
+
+
+class PowerMetricsParser:
+    """Incremental parser for `powermetrics --samplers cpu_power` output.
+
+    Lines are fed one at a time, so the parser works equally on a live process
+    and on recorded output. feed() returns (watts, interval_seconds) when a
+    sample's combined power line is complete.
+    """
+
+    def __init__(self, interval_ms: int = 100):
+        self.default_interval = interval_ms / 1000
+        self._interval = self.default_interval
+
+    def feed(self, line: str) -> Optional[Tuple[float, float]]:
+        header = ELAPSED_PATTERN.search(line)
+        if header:
+            self._interval = float(header.group(1)) / 1000
+            return None
+
+        match = COMBINED_POWER_PATTERN.search(line)
+        if match:
+            interval, self._interval = self._interval, self.default_interval
+            return int(match.group(1)) / 1000.0, interval  # Convert mW to W
+        return None
+
+    def parse(self, lines: Iterable[str]) -> List[Tuple[float, float]]:
+        return [sample for sample in map(self.feed, lines) if sample is not None]
+
+
+class PowerSampleBuffer:
+    """Thread-safe ring buffer of timestamped power samples."""
+
+    def __init__(self, capacity: int = 36000):
+        self._samples = deque(maxlen=capacity)
+        self._condition = threading.Condition()
+        self.closed = False
+
+    def add(self, timestamp: float, watts: float, interval: float) -> None:
+        with self._condition:
+            self._samples.append((timestamp, watts, interval))
+            self._condition.notify_all()
+
+    def close(self) -> None:
+        # Wakes any waiters once no more samples will arrive
+        with self._condition:
+            self.closed = True
+            self._condition.notify_all()
+
+    def wait_until(self, timestamp: float, timeout: float) -> bool:
+        """Waits for a sample at or after timestamp, so the end of a window is covered."""
+        with self._condition:
+            return self._condition.wait_for(
+                lambda: self.closed or (self._samples and self._samples[-1][0] >= timestamp), timeout
+            )
+
+    def points(self, start: float, end: float) -> List[Tuple[float, float]]:
+        """Returns (midpoint, watts) for the samples around [start, end], oldest first.
+
+        Each sample is the average over its interval, so it is placed at the
+        interval's midpoint. The nearest point before the window is included
+        so the start of the window can be interpolated.
+        """
+        points = []
+        with self._condition:
+            # Windows are recent, so scan back from the newest sample
+            for timestamp, watts, interval in reversed(self._samples):
+                midpoint = timestamp - interval / 2
+                points.append((midpoint, watts))
+                if midpoint < start:
+                    break
+        return points[::-1]
+
+    def energy(self, start: float, end: float) -> Optional[float]:
+        return integrate_power(self.points(start, end), start, end)
+
+
+class PowerMetricsSampler(PowerSource):
+    """Runs one long-lived powermetrics process and records every sample it emits.
+
+    Samples are timestamped on arrival with time.perf_counter, so callers should
+    mark window boundaries with mark(). The source can be replaced with any
+    iterable of lines (e.g. a recorded powermetrics log) for testing.
+    """
+
+    name = 'powermetrics'
+
+    def __init__(self, interval_ms: int = 100, capacity: int = 36000, source: Optional[Iterable[str]] = None):
+        self.interval_ms = interval_ms
+        self.parser = PowerMetricsParser(interval_ms)
+        self.buffer = PowerSampleBuffer(capacity)
+        self.source = source
+        self.process = None
+        self.reader_thread = None
+
+    def _open_source(self) -> Iterable[str]:
         """
-        Collect power reading
+        Start powermetrics without a sample count (-n) so it runs until stopped
         -i: interval in ms
-        -n: number of samples
+        -b 1: line buffered output, so samples arrive as they are taken
         Outputs the combined CPU, GPU and ANE in mW
-
-        Power reading is a collection of 10 samples for 1 second
-        (interval of 100ms and 10 samples)
         """
+        cmd = ["sudo", "powermetrics", "-i", str(self.interval_ms), "-b", "1", "--samplers", "cpu_power"]
+        self.process = subprocess.Popen(
+            cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, universal_newlines=True, bufsize=1
+        )
+        return self.process.stdout
+
+    def _read_loop(self, lines: Iterable[str]) -> None:
         try:
-            cmd = "sudo powermetrics -i 100 -n 10 --samplers cpu_power | grep 'Combined Power'"
-            output = subprocess.check_output(cmd, shell=True, universal_newlines=True, stderr=subprocess.STDOUT)
-
-            pattern = r'Combined Power \(CPU \+ GPU \+ ANE\):\s+(\d+)\s+mW'
-            match = re.search(pattern, output)
-            if match:
-                mw_value = int(match.group(1))
-                watts_value = mw_value / 1000.0  # Convert mW to W
-                return watts_value
-            else:
-                print(f"PowerMetrics: Could not parse power reading from output: '{output}'")
-                print(f"PowerMetrics: Pattern used: {pattern}")
-                return None
-        except subprocess.CalledProcessError as e:
-            print(f"PowerMetrics: Command failed with error: {e}")
-            print(f"PowerMetrics: Output: {e.output}")
-            return None
+            for line in lines:
+                sample = self.parser.feed(line)
+                if sample is not None:
+                    watts, interval = sample
+                    self.buffer.add(self.mark(), watts, interval)
         except Exception as e:
-            print(f"PowerMetrics: Unexpected error: {e}")
-            return None
+            print(f"PowerMetrics: Sampler stopped with error: {e}")
+        finally:
+            self.buffer.close()
 
-    def _collection_loop(self):
-        """Continuously collect power readings every 1 second"""
-        while self.is_collecting:
-            reading = self._collect_power_reading()
-            if reading is not None:
-                self.power_readings.append(reading)
-            time.sleep(1)
-
-    def start_collection(self):
-        """Start collecting power metrics"""
-        self.power_readings = []
-        self.is_collecting = True
-        self.collection_thread = threading.Thread(target=self._collection_loop)
-        self.collection_thread.start()
-
-    def stop_collection(self):
-        """Stop collecting power metrics and return average"""
-        self.is_collecting = False
-        if self.collection_thread:
-            self.collection_thread.join()
-
-        if self.power_readings:
-            return statistics.mean(self.power_readings)
-        else:
-            return None
+    @classmethod
+    def is_available(cls) -> bool:
+        return sys.platform == 'darwin' and shutil.which('powermetrics') is not None
+
+    def mark(self) -> float:
+        return time.perf_counter()
+
+    def start(self) -> None:
+        if self.reader_thread:
+            return
+        try:
+            lines = self.source if self.source is not None else self._open_source()
+        except OSError as e:
+            print(f"PowerMetrics: Could not start powermetrics: {e}")
+            return
+        self.reader_thread = threading.Thread(target=self._read_loop, args=(lines,), daemon=True)
+        self.reader_thread.start()
+
+    def energy_between(self, start: float, end: float) -> Optional[float]:
+        # Wait briefly for the sample covering the end of the window to arrive
+        self.buffer.wait_until(end, timeout=max(1.0, 3 * self.interval_ms / 1000))
+        return self.buffer.energy(start, end)
+
+    def stop(self) -> None:
+        if self.process:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+            self.process = None
+        if self.reader_thread:
+            self.reader_thread.join(timeout=5)
+            self.reader_thread = None
 
 # def get_cpu_power_usage():
 #     """Legacy function for backward compatibility"""
@@ -1,12 +1,66 @@
 import os
-from anthropic import Anthropic
+from anthropic import Anthropic, AsyncAnthropic, DefaultHttpxClient, DefaultAsyncHttpxClient
+from anthropic import APIConnectionError, APIStatusError, RateLimitError
 from dotenv import load_dotenv
+from providers.http_pool import build_http_client
+from providers.streaming import StreamTimer
 
-load_dotenv()
-client = Anthropic(api_key=os.getenv("ANTHROPIC_API_KEY"))
+def create_client(pool, timeout, base_url=None, api_key=None):
+  load_dotenv()
+  # Retries are handled by the provider registry, so the SDK's own retries are disabled
+  return Anthropic(
+    api_key=api_key or os.getenv("ANTHROPIC_API_KEY"),
+    base_url=base_url,
+    timeout=timeout,
+    max_retries=0,
+    http_client=build_http_client(DefaultHttpxClient, pool, timeout)
+  )
 
-def call_anthropic_model(model, system_prompt, prompt, temperature=0.3, max_output_tokens=1000):
+def create_async_client(pool, timeout, base_url=None, api_key=None):
+  load_dotenv()
+  return AsyncAnthropic(
+    api_key=api_key or os.getenv("ANTHROPIC_API_KEY"),
+    base_url=base_url,
+    timeout=timeout,
+    max_retries=0,
+    http_client=build_http_client(DefaultAsyncHttpxClient, pool, timeout)
+  )
+
+def is_retryable(error):
+  # Covers 429s, timeouts, dropped connections, 5xx and 529 overloaded responses
+  if isinstance(error, (RateLimitError, APIConnectionError)):
+    return True
+  return isinstance(error, APIStatusError) and error.status_code >= 500
+
+def _format_response(response):
+  return {
+    "response": response.content[0].text,
+    "prompt_tokens": response.usage.input_tokens,
+    "completion_tokens": response.usage.output_tokens,
+    "total_tokens": response.usage.input_tokens + response.usage.output_tokens
+  }
+
+def _format_stream_response(content, usage, timer):
+  return {
+    "response": "".join(content),
+    "prompt_tokens": usage["input_tokens"],
+    "completion_tokens": usage["output_tokens"],
+    "total_tokens": usage["input_tokens"] + usage["output_tokens"],
+    **timer.get_timings()
+  }
+
+def _handle_event(event, content, usage, timer):
+  if event.type == "message_start":
+    usage["input_tokens"] = event.message.usage.input_tokens
+  elif event.type == "content_block_delta" and event.delta.type == "text_delta":
+    timer.record_token()
+    content.append(event.delta.text)
+  elif event.type == "message_delta":
+    usage["output_tokens"] = event.usage.output_tokens
+
+def call_model(client, model, system_prompt, prompt, temperature=0.3, max_output_tokens=1000, stream=False):
   try:
+    timer = StreamTimer()
     response = client.messages.create(
       model=model,
       system=system_prompt,
@@ -14,15 +68,40 @@ def call_anthropic_model(model, system_prompt, prompt, temperature=0.3, max_outp
           {"role": "user", "content": prompt}
       ],
       temperature=temperature,
-      max_tokens=max_output_tokens
+      max_tokens=max_output_tokens,
+      stream=stream
+    )
+    if not stream:
+      return _format_response(response)
+
+    content, usage = [], {"input_tokens": 0, "output_tokens": 0}
+    for event in response:
+      _handle_event(event, content, usage, timer)
+    return _format_stream_response(content, usage, timer)
+
+  except Exception as e:
+    raise e
+
+async def call_model_async(async_client, model, system_prompt, prompt, temperature=0.3, max_output_tokens=1000, stream=False):
+  try:
+    timer = StreamTimer()
+    response = await async_client.messages.create(
+      model=model,
+      system=system_prompt,
+      messages=[
+          {"role": "user", "content": prompt}
+      ],
+      temperature=temperature,
+      max_tokens=max_output_tokens,
+      stream=stream
     )
+    if not stream:
+      return _format_response(response)
 
-    return {
-      "response": response.content[0].text,
-      "prompt_tokens": response.usage.input_tokens,
-      "completion_tokens": response.usage.output_tokens,
-      "total_tokens": response.usage.input_tokens + response.usage.output_tokens
-    }
+    content, usage = [], {"input_tokens": 0, "output_tokens": 0}
+    async for event in response:
+      _handle_event(event, content, usage, timer)
+    return _format_stream_response(content, usage, timer)
 
   except Exception as e:
-    raise e
\ No newline at end of file
+    raise e
@@ -0,0 +1,140 @@
+import threading
+import time
+from typing import Dict, Any, List, Optional, Tuple
+
+from console_output import console
+
+
+class Endpoint:
+  """One server in a pool, with its own pooled client, retries and rate limits."""
+
+  def __init__(self, client):
+    self.client = client
+    self.url = client.settings['base_url']
+    self.outstanding = 0
+    self.consecutive_failures = 0
+    self.ejected_until: Optional[float] = None
+    # Set while the single request that re-checks an ejected endpoint is in flight
+    self.probing = False
+    self.last_selected = 0
+    self.requests = 0
+    self.errors = 0
+    self.ejections = 0
+    self.response_time = 0.0
+    self.completion_tokens = 0
+
+  def get_stats(self) -> Dict[str, Any]:
+    return {
+      'endpoint': self.url,
+      'requests': self.requests,
+      'errors': self.errors,
+      'ejections': self.ejections,
+      'ejected': self.ejected_until is not None,
+      'avg_response_time': self.response_time / self.requests if self.requests else None,
+      'tokens_per_second': self.completion_tokens / self.response_time if self.response_time > 0 else None
+    }
+
+
+class EndpointPool:
+  """Routes one model's requests across several servers hosting it.
+
+  Each request goes to the healthy endpoint with the fewest requests in flight.
+  An endpoint whose requests fail max_failures times in a row (after its own
+  retries) is ejected for ejection_time seconds, then gets a single request to
+  check whether it has recovered. A failed request is tried again on another
+  endpoint, so it only fails once every endpoint has failed it.
+  """
+
+  def __init__(self, clients: List[Any], max_failures: int = 3, ejection_time: float = 30.0):
+    self.endpoints = [Endpoint(client) for client in clients]
+    self.max_failures = max_failures
+    self.ejection_time = ejection_time
+    self._selections = 0
+    self._lock = threading.Lock()
+
+  def _is_available(self, endpoint: Endpoint, now: float) -> bool:
+    if endpoint.ejected_until is None:
+      return True
+    return now >= endpoint.ejected_until and not endpoint.probing
+
+  def _acquire(self, tried: List[Endpoint]) -> Tuple[Endpoint, bool]:
+    with self._lock:
+      now = time.monotonic()
+      untried = [endpoint for endpoint in self.endpoints if endpoint not in tried]
+      candidates = [endpoint for endpoint in untried if self._is_available(endpoint, now)]
+      if candidates:
+        # Ties go to the endpoint picked least recently, so sequential runs alternate
+        endpoint = min(candidates, key=lambda endpoint: (endpoint.outstanding, endpoint.last_selected))
+      else:
+        # Every remaining endpoint is ejected: try the one due back soonest rather than failing outright
+        endpoint = min(untried, key=lambda endpoint: endpoint.ejected_until)
+      probe = endpoint.ejected_until is not None
+      if probe:
+        endpoint.probing = True
+      endpoint.outstanding += 1
+      self._selections += 1
+      endpoint.last_selected = self._selections
+      return endpoint, probe
+
+  def _release(self, endpoint: Endpoint, probe: bool, response: Optional[Dict[str, Any]]) -> None:
+    with self._lock:
+      endpoint.outstanding -= 1
+      if probe:
+        endpoint.probing = False
+      if response is not None:
+        if endpoint.ejected_until is not None:
+          print(f"  Endpoint {endpoint.url} recovered", file=console.details)
+        endpoint.requests += 1
+        endpoint.consecutive_failures = 0
+        endpoint.ejected_until = None
+        endpoint.response_time += response['response_time']
+        endpoint.completion_tokens += response['completion_tokens']
+        return
+
+      endpoint.errors += 1
+      endpoint.consecutive_failures += 1
+      if probe:
+        reason = "its recovery check failed"
+      elif endpoint.ejected_until is None and endpoint.consecutive_failures >= self.max_failures:
+        reason = f"{endpoint.consecutive_failures} failed requests in a row"
+      else:
+        # Below the threshold, or a request sent before the endpoint was ejected
+        return
+      endpoint.ejected_until = time.monotonic() + self.ejection_time
+      endpoint.ejections += 1
+      print(f"  Endpoint {endpoint.url} ejected for {self.ejection_time:g} seconds: {reason}",
+            file=console.details)
+
+  def call(self, model: str, *args) -> Dict[str, Any]:
+    tried = []
+    while True:
+      endpoint, probe = self._acquire(tried)
+      try:
+        response = endpoint.client.call(model, *args)
+      except Exception:
+        self._release(endpoint, probe, None)
+        tried.append(endpoint)
+        if len(tried) == len(self.endpoints):
+          raise
+        continue
+      self._release(endpoint, probe, response)
+      return {**response, 'endpoint': endpoint.url}
+
+  async def call_async(self, model: str, *args) -> Dict[str, Any]:
+    tried = []
+    while True:
+      endpoint, probe = self._acquire(tried)
+      try:
+        response = await endpoint.client.call_async(model, *args)
+      except Exception:
+        self._release(endpoint, probe, None)
+        tried.append(endpoint)
+        if len(tried) == len(self.endpoints):
+          raise
+        continue
+      self._release(endpoint, probe, response)
+      return {**response, 'endpoint': endpoint.url}
+
+  def get_stats(self) -> List[Dict[str, Any]]:
+    with self._lock:
+      return [endpoint.get_stats() for endpoint in self.endpoints]
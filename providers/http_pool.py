@@ -0,0 +1,11 @@
+import importlib
+
+def build_http_client(client_class, pool, timeout):
+  """Builds an SDK's default HTTP client with the given connection pool limits.
+
+  SDKs are built on httpx (httpx2 in newer releases) and reject objects from the
+  other library, so Limits and Timeout come from the library client_class uses.
+  """
+  base = next(cls for cls in client_class.__mro__ if cls.__name__ in ("Client", "AsyncClient"))
+  http = importlib.import_module(base.__module__.split(".")[0])
+  return client_class(limits=http.Limits(**pool), timeout=http.Timeout(timeout, connect=10.0))
@@ -1,24 +1,14 @@
-from openai import OpenAI
+from providers import openai
 
-client = OpenAI(base_url="http://127.0.0.1:1234/v1", api_key="*")
+# LM Studio serves an OpenAI compatible API, so requests are made with the OpenAI client
+DEFAULT_BASE_URL = "http://127.0.0.1:1234/v1"
 
-def call_lmstudio_model(model, system_prompt, prompt, temperature=0.3, max_output_tokens=1000):
-  try:
-    response = client.chat.completions.create(
-      model=model,
-      messages=[
-          {"role": "system", "content": f"{system_prompt}"},
-          {"role": "user", "content": prompt}
-      ],
-      temperature=temperature,
-      max_tokens=max_output_tokens
-    )
-    return {
-      "response": response.choices[0].message.content,
-      "prompt_tokens": response.usage.prompt_tokens,
-      "completion_tokens": response.usage.completion_tokens,
-      "total_tokens": response.usage.total_tokens
-    }
+is_retryable = openai.is_retryable
+call_model = openai.call_model
+call_model_async = openai.call_model_async
 
-  except Exception as e:
-    raise e
\ No newline at end of file
+def create_client(pool, timeout, base_url=None, api_key=None):
+  return openai.create_client(pool, timeout, base_url or DEFAULT_BASE_URL, api_key or "*")
+
+def create_async_client(pool, timeout, base_url=None, api_key=None):
+  return openai.create_async_client(pool, timeout, base_url or DEFAULT_BASE_URL, api_key or "*")
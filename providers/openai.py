@@ -1,12 +1,66 @@
 import os
-from openai import OpenAI
+from openai import OpenAI, AsyncOpenAI, DefaultHttpxClient, DefaultAsyncHttpxClient
+from openai import APIConnectionError, APIStatusError, RateLimitError
 from dotenv import load_dotenv
+from providers.http_pool import build_http_client
+from providers.streaming import StreamTimer
 
-load_dotenv()
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+def create_client(pool, timeout, base_url=None, api_key=None):
+  load_dotenv()
+  # Retries are handled by the provider registry, so the SDK's own retries are disabled
+  return OpenAI(
+    api_key=api_key or os.getenv("OPENAI_API_KEY"),
+    base_url=base_url,
+    timeout=timeout,
+    max_retries=0,
+    http_client=build_http_client(DefaultHttpxClient, pool, timeout)
+  )
 
-def call_openai_model(model, system_prompt, prompt, temperature=0.3, max_output_tokens=1000):
+def create_async_client(pool, timeout, base_url=None, api_key=None):
+  load_dotenv()
+  return AsyncOpenAI(
+    api_key=api_key or os.getenv("OPENAI_API_KEY"),
+    base_url=base_url,
+    timeout=timeout,
+    max_retries=0,
+    http_client=build_http_client(DefaultAsyncHttpxClient, pool, timeout)
+  )
+
+def is_retryable(error):
+  # APITimeoutError is a subclass of APIConnectionError
+  if isinstance(error, (RateLimitError, APIConnectionError)):
+    return True
+  return isinstance(error, APIStatusError) and error.status_code >= 500
+
+def _format_response(response):
+  return {
+    "response": response.choices[0].message.content,
+    "prompt_tokens": response.usage.prompt_tokens,
+    "completion_tokens": response.usage.completion_tokens,
+    "total_tokens": response.usage.total_tokens
+  }
+
+def _format_stream_response(content, usage, timer):
+  # Fall back to counting content chunks if the server does not report usage
+  completion_tokens = usage.completion_tokens if usage else len(timer.inter_token_latencies) + 1
+  prompt_tokens = usage.prompt_tokens if usage else 0
+  return {
+    "response": "".join(content),
+    "prompt_tokens": prompt_tokens,
+    "completion_tokens": completion_tokens,
+    "total_tokens": prompt_tokens + completion_tokens,
+    **timer.get_timings()
+  }
+
+def _handle_chunk(chunk, content, timer):
+  if chunk.choices and chunk.choices[0].delta.content:
+    timer.record_token()
+    content.append(chunk.choices[0].delta.content)
+  return chunk.usage
+
+def call_model(client, model, system_prompt, prompt, temperature=0.3, max_output_tokens=1000, stream=False):
   try:
+    timer = StreamTimer()
     response = client.chat.completions.create(
       model=model,
       messages=[
@@ -14,14 +68,42 @@ def call_openai_model(model, system_prompt, prompt, temperature=0.3, max_output_
           {"role": "user", "content": prompt}
       ],
       temperature=temperature,
-      max_tokens=max_output_tokens
+      max_tokens=max_output_tokens,
+      stream=stream,
+      **({"stream_options": {"include_usage": True}} if stream else {})
+    )
+    if not stream:
+      return _format_response(response)
+
+    content, usage = [], None
+    for chunk in response:
+      usage = _handle_chunk(chunk, content, timer) or usage
+    return _format_stream_response(content, usage, timer)
+
+  except Exception as e:
+    raise e
+
+async def call_model_async(async_client, model, system_prompt, prompt, temperature=0.3, max_output_tokens=1000, stream=False):
+  try:
+    timer = StreamTimer()
+    response = await async_client.chat.completions.create(
+      model=model,
+      messages=[
+          {"role": "system", "content": system_prompt},
+          {"role": "user", "content": prompt}
+      ],
+      temperature=temperature,
+      max_tokens=max_output_tokens,
+      stream=stream,
+      **({"stream_options": {"include_usage": True}} if stream else {})
     )
-    return {
-      "response": response.choices[0].message.content,
-      "prompt_tokens": response.usage.prompt_tokens,
-      "completion_tokens": response.usage.completion_tokens,
-      "total_tokens": response.usage.total_tokens
-    }
+    if not stream:
+      return _format_response(response)
+
+    content, usage = [], None
+    async for chunk in response:
+      usage = _handle_chunk(chunk, content, timer) or usage
+    return _format_stream_response(content, usage, timer)
 
   except Exception as e:
-    raise e
\ No newline at end of file
+    raise e
@@ -0,0 +1,319 @@
+import asyncio
+import importlib
+import random
+import threading
+import time
+from typing import Dict, Any, List, Optional, Tuple
+
+from console_output import console
+from providers.endpoint_pool import EndpointPool
+from startup_profiler import startup_profiler
+
+# Provider modules (and their SDKs) are imported when a provider is first used,
+# so a run only pays for the providers it is configured with
+PROVIDER_MODULES = {
+  'openai': 'providers.openai',
+  'anthropic': 'providers.anthropic',
+  'lmstudio': 'providers.lmstudio'
+}
+
+DEFAULT_SETTINGS = {
+  'requests_per_minute': None,
+  'tokens_per_minute': None,
+  'max_retries': 5,
+  'initial_backoff': 1.0,
+  'max_backoff': 60.0,
+  'timeout': 120.0,
+  'max_connections': 20,
+  'max_keepalive_connections': 10,
+  'keepalive_expiry': 30.0,
+  'base_url': None,
+  'api_key': None,
+  'max_endpoint_failures': 3,
+  'endpoint_ejection_time': 30.0
+}
+
+# Local models can take minutes to load and answer, so LM Studio gets a longer timeout
+PROVIDER_DEFAULTS = {
+  'lmstudio': {'timeout': 600.0}
+}
+
+
+class TokenBucket:
+  """Token bucket refilled continuously at rate_per_minute, holding at most one minute of capacity.
+
+  Callers reserve capacity up front and sleep for the returned wait, so waiters are
+  served in arrival order and the balance can go negative while requests queue.
+  """
+
+  def __init__(self, rate_per_minute: float):
+    self.rate_per_second = rate_per_minute / 60
+    self.capacity = rate_per_minute
+    self.tokens = rate_per_minute
+    self.updated_at = time.monotonic()
+    self._lock = threading.Lock()
+
+  def reserve(self, amount: float) -> float:
+    with self._lock:
+      now = time.monotonic()
+      self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate_per_second)
+      self.updated_at = now
+      # A single request larger than the bucket waits for a full bucket rather than forever
+      self.tokens -= min(amount, self.capacity)
+      return max(0.0, -self.tokens / self.rate_per_second)
+
+  def adjust(self, amount: float) -> None:
+    # Corrects an earlier reservation once the real usage is known
+    with self._lock:
+      self.tokens = min(self.capacity, self.tokens - amount)
+
+
+class ProviderClient:
+  """Pooled clients for one provider, with rate limiting and retries around every request."""
+
+  def __init__(self, name: str, settings: Dict[str, Any]):
+    self.name = name
+    self.module = importlib.import_module(PROVIDER_MODULES[name])
+    self.settings = {**DEFAULT_SETTINGS, **PROVIDER_DEFAULTS.get(name, {}), **settings}
+    self.pool = {
+      'max_connections': self.settings['max_connections'],
+      'max_keepalive_connections': self.settings['max_keepalive_connections'],
+      'keepalive_expiry': self.settings['keepalive_expiry']
+    }
+    self.request_limiter = self._create_limiter('requests_per_minute')
+    self.token_limiter = self._create_limiter('tokens_per_minute')
+    self.retries = 0
+    self.rate_limit_wait_time = 0.0
+    self._client = None
+    self._async_client = None
+    self._async_loop = None
+    self._lock = threading.Lock()
+
+  def _create_limiter(self, setting: str) -> Optional[TokenBucket]:
+    rate = self.settings[setting]
+    return TokenBucket(rate) if rate else None
+
+  @property
+  def client(self):
+    with self._lock:
+      if self._client is None:
+        with startup_profiler.measure(f"{self.name} client"):
+          self._client = self.module.create_client(
+            self.pool, self.settings['timeout'], self.settings['base_url'], self.settings['api_key']
+          )
+      return self._client
+
+  async def get_async_client(self):
+    # Async connection pools are bound to the event loop that opened them,
+    # and each model in the async runner runs in its own event loop
+    loop = asyncio.get_running_loop()
+    if self._async_client is None or self._async_loop is not loop:
+      previous = self._async_client
+      self._async_client = self.module.create_async_client(
+        self.pool, self.settings['timeout'], self.settings['base_url'], self.settings['api_key']
+      )
+      self._async_loop = loop
+      if previous is not None:
+        await self._close(previous)
+    return self._async_client
+
+  async def aclose(self) -> None:
+    """Closes the async connection pool; call it before the event loop that opened the pool ends."""
+    if self._async_client is not None:
+      client, self._async_client, self._async_loop = self._async_client, None, None
+      await self._close(client)
+
+  @staticmethod
+  async def _close(client) -> None:
+    try:
+      await client.close()
+    except RuntimeError:
+      # A pool left open when its event loop ended; its sockets went with the loop
+      pass
+
+  @staticmethod
+  def _estimate_tokens(system_prompt: str, prompt: str, max_output_tokens: int) -> int:
+    # Roughly four characters per token, plus the full output allowance
+    return (len(system_prompt) + len(prompt)) // 4 + max_output_tokens
+
+  def _reserve(self, estimated_tokens: int) -> float:
+    wait = 0.0
+    if self.request_limiter:
+      wait = max(wait, self.request_limiter.reserve(1))
+    if self.token_limiter:
+      wait = max(wait, self.token_limiter.reserve(estimated_tokens))
+    self.rate_limit_wait_time += wait
+    return wait
+
+  def _settle(self, estimated_tokens: int, response: Dict[str, Any]) -> None:
+    if self.token_limiter:
+      self.token_limiter.adjust(response['total_tokens'] - estimated_tokens)
+
+  def _backoff(self, attempt: int, error: Exception) -> float:
+    # Full jitter exponential backoff, respecting a Retry-After header when the server sends one
+    delay = random.uniform(0, min(self.settings['max_backoff'], self.settings['initial_backoff'] * 2 ** attempt))
+    response = getattr(error, 'response', None)
+    retry_after = response.headers.get('retry-after') if response is not None else None
+    try:
+      delay = max(delay, float(retry_after))
+    except (TypeError, ValueError):
+      pass
+    return delay
+
+  def _should_retry(self, attempt: int, error: Exception) -> bool:
+    if attempt >= self.settings['max_retries'] or not self.module.is_retryable(error):
+      return False
+    self.retries += 1
+    print(f"  {self.name} request failed ({type(error).__name__}), retrying ({attempt + 1}/{self.settings['max_retries']})",
+          file=console.details)
+    return True
+
+  def call(self, model: str, system_prompt: str, prompt: str, temperature: float = 0.3,
+           max_output_tokens: int = 1000, stream: bool = False) -> Dict[str, Any]:
+    estimated_tokens = self._estimate_tokens(system_prompt, prompt, max_output_tokens)
+    attempt = 0
+    while True:
+      time.sleep(self._reserve(estimated_tokens))
+      client = self.client
+      start_time = time.time()
+      try:
+        response = self.module.call_model(
+          client, model, system_prompt, prompt, temperature, max_output_tokens, stream
+        )
+      except Exception as e:
+        if not self._should_retry(attempt, e):
+          raise
+        time.sleep(self._backoff(attempt, e))
+        attempt += 1
+        continue
+
+      self._settle(estimated_tokens, response)
+      return {**response, 'response_time': time.time() - start_time}
+
+  async def call_async(self, model: str, system_prompt: str, prompt: str, temperature: float = 0.3,
+                       max_output_tokens: int = 1000, stream: bool = False) -> Dict[str, Any]:
+    estimated_tokens = self._estimate_tokens(system_prompt, prompt, max_output_tokens)
+    attempt = 0
+    while True:
+      await asyncio.sleep(self._reserve(estimated_tokens))
+      async_client = await self.get_async_client()
+      start_time = time.time()
+      try:
+        response = await self.module.call_model_async(
+          async_client, model, system_prompt, prompt, temperature, max_output_tokens, stream
+        )
+      except Exception as e:
+        if not self._should_retry(attempt, e):
+          raise
+        await asyncio.sleep(self._backoff(attempt, e))
+        attempt += 1
+        continue
+
+      self._settle(estimated_tokens, response)
+      return {**response, 'response_time': time.time() - start_time}
+
+  def get_stats(self) -> Dict[str, Any]:
+    return {'retries': self.retries, 'rate_limit_wait_time': self.rate_limit_wait_time}
+
+
+class ProviderRegistry:
+  """Creates one ProviderClient per provider on first use and shares it between subject and evaluator calls.
+
+  Models configured with several endpoints get an EndpointPool instead, with one
+  ProviderClient per endpoint.
+  """
+
+  def __init__(self, provider_settings: Optional[Dict[str, Dict[str, Any]]] = None):
+    self.provider_settings = provider_settings or {}
+    self._providers: Dict[str, ProviderClient] = {}
+    self._endpoints: Dict[Tuple[str, str], List[Any]] = {}
+    self._pools: Dict[Tuple[str, str], EndpointPool] = {}
+    self._lock = threading.Lock()
+
+  def configure(self, provider_settings: Dict[str, Dict[str, Any]]) -> None:
+    with self._lock:
+      self.provider_settings = provider_settings or {}
+      self._providers = {}
+      self._pools = {}
+
+  def configure_endpoints(self, subject_models: List[Dict[str, Any]]) -> None:
+    """Registers the endpoints of subject models that list them, as URLs or provider settings overrides."""
+    with self._lock:
+      self._endpoints = {}
+      self._pools = {}
+      for model in subject_models:
+        if model.get('endpoints'):
+          # Unknown providers are served by LM Studio, as for subject model requests
+          provider = model['provider'] if model['provider'] in PROVIDER_MODULES else 'lmstudio'
+          self._endpoints[(provider, model['model'])] = model['endpoints']
+
+  def _get_pool(self, provider: str, model: str) -> Optional[EndpointPool]:
+    key = (provider, model)
+    if key not in self._endpoints:
+      return None
+    with self._lock:
+      if key not in self._pools:
+        settings = self.provider_settings.get(provider) or {}
+        clients = [
+          ProviderClient(provider, {**settings, **(endpoint if isinstance(endpoint, dict) else {'base_url': endpoint})})
+          for endpoint in self._endpoints[key]
+        ]
+        self._pools[key] = EndpointPool(
+          clients, clients[0].settings['max_endpoint_failures'], clients[0].settings['endpoint_ejection_time']
+        )
+      return self._pools[key]
+
+  def get(self, provider: str) -> ProviderClient:
+    if provider not in PROVIDER_MODULES:
+      raise ValueError(f"Unknown provider '{provider}'. Available providers: {', '.join(PROVIDER_MODULES)}")
+
+    with self._lock:
+      if provider not in self._providers:
+        with startup_profiler.measure(f"{provider} provider"):
+          self._providers[provider] = ProviderClient(provider, self.provider_settings.get(provider) or {})
+      return self._providers[provider]
+
+  def call(self, provider: str, model: str, system_prompt: str, prompt: str, temperature: float = 0.3,
+           max_output_tokens: int = 1000, stream: bool = False) -> Dict[str, Any]:
+    pool = self._get_pool(provider, model)
+    if pool:
+      return pool.call(model, system_prompt, prompt, temperature, max_output_tokens, stream)
+    return self.get(provider).call(model, system_prompt, prompt, temperature, max_output_tokens, stream)
+
+  async def call_async(self, provider: str, model: str, system_prompt: str, prompt: str, temperature: float = 0.3,
+                       max_output_tokens: int = 1000, stream: bool = False) -> Dict[str, Any]:
+    pool = self._get_pool(provider, model)
+    if pool:
+      return await pool.call_async(model, system_prompt, prompt, temperature, max_output_tokens, stream)
+    return await self.get(provider).call_async(model, system_prompt, prompt, temperature, max_output_tokens, stream)
+
+  async def run_and_close(self, coroutine):
+    # For asyncio.run: the pools opened by the coroutine are closed before its event loop ends
+    try:
+      return await coroutine
+    finally:
+      await self.aclose()
+
+  async def aclose(self) -> None:
+    """Closes every async connection pool opened in the running event loop."""
+    clients = list(self._providers.values())
+    for pool in self._pools.values():
+      clients.extend(endpoint.client for endpoint in pool.endpoints)
+    for client in clients:
+      await client.aclose()
+
+  def get_stats(self) -> Dict[str, Dict[str, Any]]:
+    stats = {name: provider.get_stats() for name, provider in self._providers.items()}
+    # Endpoint clients count towards their provider
+    for (provider, _), pool in self._pools.items():
+      for endpoint in pool.endpoints:
+        provider_stats = stats.setdefault(provider, {'retries': 0, 'rate_limit_wait_time': 0.0})
+        for name, value in endpoint.client.get_stats().items():
+          provider_stats[name] += value
+    return stats
+
+  def get_endpoint_stats(self) -> Dict[str, List[Dict[str, Any]]]:
+    return {model: pool.get_stats() for (_, model), pool in self._pools.items()}
+
+
+registry = ProviderRegistry()
@@ -0,0 +1,48 @@
+import time
+import statistics
+from typing import Dict, List, Optional
+
+
+class StreamTimer:
+    """Records arrival times of streamed content chunks.
+
+    The timer starts when it is created, which should be immediately before the
+    streaming request is sent, so time to first token includes queueing and prefill.
+    """
+
+    def __init__(self):
+        self.start_time = time.perf_counter()
+        self.first_token_time = None
+        self.last_token_time = None
+        self.inter_token_latencies = []
+
+    def record_token(self) -> None:
+        now = time.perf_counter()
+        if self.first_token_time is None:
+            self.first_token_time = now
+        else:
+            self.inter_token_latencies.append(now - self.last_token_time)
+        self.last_token_time = now
+
+    def get_timings(self) -> Dict[str, object]:
+        return {
+            "time_to_first_token": self.first_token_time - self.start_time if self.first_token_time is not None else None,
+            "inter_token_latencies": self.inter_token_latencies
+        }
+
+
+def summarise_inter_token_latencies(latencies: List[float]) -> Dict[str, Optional[float]]:
+    if not latencies:
+        return {"inter_token_latency_avg": None, "inter_token_latency_p50": None, "inter_token_latency_p95": None}
+
+    ordered = sorted(latencies)
+
+    def percentile(pct):
+        index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+        return ordered[index]
+
+    return {
+        "inter_token_latency_avg": statistics.mean(ordered),
+        "inter_token_latency_p50": percentile(50),
+        "inter_token_latency_p95": percentile(95)
+    }
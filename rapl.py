@@ -0,0 +1,115 @@
+import glob
+import os
+import re
+import time
+from typing import List, Optional, Tuple
+from power_source import PowerSource
+
+POWERCAP_ROOT = '/sys/class/powercap'
+HWMON_ROOT = '/sys/class/hwmon'
+
+
+def _read_int(path: str) -> Optional[int]:
+    try:
+        with open(path, 'r') as counter_file:
+            return int(counter_file.read().strip())
+    except (OSError, ValueError):
+        return None
+
+
+def _read_text(path: str) -> str:
+    try:
+        with open(path, 'r') as text_file:
+            return text_file.read().strip()
+    except OSError:
+        return ''
+
+
+class EnergyCounter:
+    """A cumulative energy counter in microjoules, wrapping at max_energy_uj when known."""
+
+    def __init__(self, name: str, energy_path: str, max_energy_uj: Optional[int] = None):
+        self.name = name
+        self.energy_path = energy_path
+        self.max_energy_uj = max_energy_uj
+
+    def read(self) -> Optional[int]:
+        return _read_int(self.energy_path)
+
+    def delta(self, start: int, end: int) -> int:
+        # A counter that went backwards has wrapped once; windows spanning several wraps cannot be detected
+        if end < start and self.max_energy_uj:
+            return end + self.max_energy_uj - start
+        return max(0, end - start)
+
+
+def discover_rapl_counters(root: str = POWERCAP_ROOT) -> List[EnergyCounter]:
+    """Finds the RAPL zones that can be summed without double counting.
+
+    Package zones already include their core/uncore subzones, so only top-level
+    package zones and DRAM subzones are used. A psys (platform) zone covers the
+    whole SoC and is used on its own when present.
+    """
+    counters = []
+    psys = []
+    for zone in sorted(glob.glob(os.path.join(root, 'intel-rapl:*'))):
+        name = _read_text(os.path.join(zone, 'name'))
+        is_top_level = re.search(r'intel-rapl:\d+$', zone) is not None
+        if not (is_top_level and name.startswith('package')) and name not in ('psys', 'dram'):
+            continue
+
+        counter = EnergyCounter(
+            f"{os.path.basename(zone)} ({name})",
+            os.path.join(zone, 'energy_uj'),
+            _read_int(os.path.join(zone, 'max_energy_range_uj'))
+        )
+        if counter.read() is None:
+            continue
+        (psys if name == 'psys' else counters).append(counter)
+    return psys or counters
+
+
+def discover_hwmon_counters(root: str = HWMON_ROOT) -> List[EnergyCounter]:
+    # hwmon energy counters (e.g. amd_energy) are 64-bit microjoule totals that do not wrap in practice
+    counters = []
+    for energy_path in sorted(glob.glob(os.path.join(root, 'hwmon*', 'energy*_input'))):
+        device = os.path.dirname(energy_path)
+        counter = EnergyCounter(
+            f"{os.path.basename(device)} ({_read_text(os.path.join(device, 'name'))})", energy_path
+        )
+        if counter.read() is not None:
+            counters.append(counter)
+    return counters
+
+
+class RaplPowerSource(PowerSource):
+    """Linux power source reading cumulative energy counters from powercap RAPL.
+
+    hwmon energy counters are used when no readable RAPL zone is found, as they
+    usually report the same CPU energy. Energy per window is exact (counter
+    deltas), not sampled. Reading energy_uj usually requires root.
+    """
+
+    name = 'rapl'
+
+    def __init__(self, counters: Optional[List[EnergyCounter]] = None):
+        self.counters = counters if counters is not None else self.discover_counters()
+
+    @staticmethod
+    def discover_counters() -> List[EnergyCounter]:
+        return discover_rapl_counters() or discover_hwmon_counters()
+
+    @classmethod
+    def is_available(cls) -> bool:
+        return bool(cls.discover_counters())
+
+    def mark(self) -> Tuple[float, List[Optional[int]]]:
+        return time.perf_counter(), [counter.read() for counter in self.counters]
+
+    def energy_between(self, start: Tuple[float, List[Optional[int]]],
+                       end: Tuple[float, List[Optional[int]]]) -> Optional[float]:
+        """Returns the joules used between two marks."""
+        readings = list(zip(self.counters, start[1], end[1]))
+        if not readings or any(s is None or e is None for _, s, e in readings):
+            return None
+        return sum(counter.delta(s, e) for counter, s, e in readings) / 1_000_000
@@ -1,4 +1,7 @@
-from typing import Dict, Any, Optional
+from contextlib import redirect_stdout
+from typing import Dict, Any, List, Optional
+
+from console_output import console
 
 
 class ResultsDisplayer:
@@ -10,45 +13,67 @@ class ResultsDisplayer:
         print(f"Testing Provider and Model: {provider} - {model}")
         print(f"{'='*60}")
     
+    def display_warmup(self, warmup_num: int, warmup_requests: int, response: Dict[str, Any]) -> None:
+        line = f"Warmup {warmup_num}/{warmup_requests}: {response['response_time']:.2f} seconds"
+        if response.get('time_to_first_token') is not None:
+            line += f" (first token after {response['time_to_first_token']:.3f} seconds)"
+        print(line + ", discarded")
+    
     def display_question_header(self, question_num: int, test_num: int, question: str) -> None:
-        print(f"\nQuestion {question_num}, Test {test_num}: {question}")
+        print(f"\nQuestion {question_num}, Test {test_num}: {question}", file=console.details)
+    
+    def display_journaled_test(self, question_num: int, test_num: int) -> None:
+        print(f"\nQuestion {question_num}, Test {test_num}: restored from run journal", file=console.details)
     
     def display_expected_answer(self, expected_answer: Optional[str]) -> None:
         if expected_answer:
-            print(f"Expected Answer: {expected_answer}")
+            print(f"Expected Answer: {expected_answer}", file=console.details)
         else:
-            print("Expected Answer: None (question-only dataset)")
+            print("Expected Answer: None (question-only dataset)", file=console.details)
     
     def display_response_details(self, response: Dict[str, Any]) -> None:
-        print(f"AI Answer: {response['response']}")
-        print("-" * 50)
-        print(f"Prompt Tokens: {response['prompt_tokens']}")
-        print(f"Completion Tokens: {response['completion_tokens']}")
-        print(f"Total Tokens: {response['total_tokens']}")
-        print("-" * 50)
-        print(f"Response Time: {response['response_time']:.2f} seconds")
+        print(f"AI Answer: {response['response']}", file=console.details)
+        print("-" * 50, file=console.details)
+        print(f"Prompt Tokens: {response['prompt_tokens']}", file=console.details)
+        print(f"Completion Tokens: {response['completion_tokens']}", file=console.details)
+        print(f"Total Tokens: {response['total_tokens']}", file=console.details)
+        print("-" * 50, file=console.details)
+        print(f"Response Time: {response['response_time']:.2f} seconds", file=console.details)
+        if response.get('endpoint'):
+            print(f"Endpoint: {response['endpoint']}", file=console.details)
+        if response.get('time_to_first_token') is not None:
+            print(f"Time to First Token: {response['time_to_first_token']:.3f} seconds", file=console.details)
+            if response['decode_tokens_per_second'] is not None:
+                print(f"Decode Throughput: {response['decode_tokens_per_second']:.2f} tokens/second", file=console.details)
+            if response['inter_token_latency_avg'] is not None:
+                print(f"Inter-Token Latency: {response['inter_token_latency_avg'] * 1000:.1f} ms average, "
+                      f"{response['inter_token_latency_p95'] * 1000:.1f} ms p95", file=console.details)
     
     def display_power_metrics(self, energy_usage: Optional[float], response_time: float) -> None:
         if energy_usage is not None:
             energy_consumption_wh = energy_usage * (response_time / 3600)
-            print(f"Power Usage: {energy_usage:.3f} W")
-            print(f"Energy Consumption: {energy_consumption_wh:.6f} Wh")
+            print(f"Power Usage: {energy_usage:.3f} W", file=console.details)
+            print(f"Energy Consumption: {energy_consumption_wh:.6f} Wh", file=console.details)
         else:
-            print("Power Usage: N/A")
-            print("Energy Consumption: N/A")
-        print("-" * 50)
+            print("Power Usage: N/A", file=console.details)
+            print("Energy Consumption: N/A", file=console.details)
+        print("-" * 50, file=console.details)
     
     def display_question_averages(self, question_num: int, metrics: Dict[str, Optional[float]]) -> None:
-        print("=" * 50)
-        print(f"📈 Question {question_num} Averages:")
-        print(f"  Score: {metrics['avg_score']:.2f}")
-        print(f"  Response Time: {metrics['avg_response_time']:.2f} seconds")
-        print(f"  Completion Tokens: {metrics['avg_completion_tokens']:.2f}")
-        print(f"  Total Tokens: {metrics['avg_total_tokens']:.2f}")
-        if metrics['avg_energy_usage'] is not None:
-            print(f"  Energy Consumption: {metrics['avg_energy_usage']:.6f} Wh")
-        else:
-            print(f"  Energy Consumption: N/A")
+        # Shares the per-test output stream, as it is printed after every question
+        with redirect_stdout(console.details):
+            print("=" * 50)
+            print(f"📈 Question {question_num} Averages:")
+            print(f"  Score: {metrics['avg_score']:.2f}")
+            print(f"  Response Time: {metrics['avg_response_time']:.2f} seconds")
+            print(f"  Completion Tokens: {metrics['avg_completion_tokens']:.2f}")
+            print(f"  Total Tokens: {metrics['avg_total_tokens']:.2f}")
+            if metrics['avg_energy_usage'] is not None:
+                print(f"  Energy Consumption: {metrics['avg_energy_usage']:.6f} Wh")
+            else:
+                print(f"  Energy Consumption: N/A")
+            self._display_energy_efficiency(metrics, "  ")
+            self._display_streaming_averages(metrics, "  ")
     
     def display_model_averages(self, model_name: str, metrics: Dict[str, Optional[float]]) -> None:
         print("=" * 60)
@@ -61,12 +86,17 @@ class ResultsDisplayer:
             print(f"Average Energy Consumption: {metrics['avg_energy_usage']:.6f} Wh")
         else:
             print(f"Average Energy Consumption: N/A")
+        self._display_energy_efficiency(metrics, "")
+        self._display_streaming_averages(metrics, "", "Average ")
+        self._display_cold_start(metrics, "")
         print("=" * 60)
     
     def display_model_comparison(self, model_metrics: Dict[str, Dict[str, Optional[float]]]) -> None:
         print("\n" + "=" * 80)
         print("MODEL COMPARISON SUMMARY:")
         print("=" * 80)
+        if any(metrics.get('cold_start_response_time') is not None for metrics in model_metrics.values()):
+            print("Averages are steady state; warmup requests are excluded and reported as the cold start.\n")
         for model_name, metrics in model_metrics.items():
             print(f"{model_name}:")
             print(f"  Average Score: {metrics['avg_score']:.2f}")
@@ -77,10 +107,204 @@ class ResultsDisplayer:
                 print(f"  Average Energy Consumption: {metrics['avg_energy_usage']:.6f} Wh")
             else:
                 print(f"  Average Energy Consumption: N/A")
+            self._display_energy_efficiency(metrics, "  ")
+            self._display_streaming_averages(metrics, "  ", "Average ")
+            self._display_cold_start(metrics, "  ")
+            self._display_distribution(metrics, 'response_time', "Response Time", "s", 3)
+            self._display_distribution(metrics, 'completion_tokens', "Completion Tokens", "", 1)
+            self._display_distribution(metrics, 'energy_usage', "Energy Consumption", " Wh", 6)
             print()
     
-    def display_winning_model(self, winning_model_name: str, winning_score: float) -> None:
+    def _display_cold_start(self, metrics: Dict[str, Optional[float]], indent: str) -> None:
+        # Averages above are steady state; the cold start is the first (discarded) warmup request
+        if metrics.get('cold_start_response_time') is None:
+            return
+        line = f"{indent}Cold Start Response Time: {metrics['cold_start_response_time']:.2f} seconds"
+        if metrics['cold_start_time_to_first_token'] is not None:
+            line += f" (first token after {metrics['cold_start_time_to_first_token']:.3f} seconds)"
+        print(line)
+        if metrics['model_load_latency'] is not None:
+            print(f"{indent}Model Load Latency: {metrics['model_load_latency']:.2f} seconds")
+
+    def _display_energy_efficiency(self, metrics: Dict[str, Optional[float]], indent: str) -> None:
+        if metrics.get('joules_per_token') is None:
+            return
+        line = f"{indent}Energy per Token: {metrics['joules_per_token']:.4f} J"
+        if metrics['tokens_per_joule'] is not None:
+            line += f" ({metrics['tokens_per_joule']:.2f} tokens/J)"
+        print(line)
+
+    def display_energy_ranking(self, ranking: list) -> None:
+        if not ranking:
+            return
+        print("ENERGY EFFICIENCY RANKING (score x tokens per joule, net of idle power):")
+        for position, (model_name, metrics) in enumerate(ranking, 1):
+            print(f"  {position}. {model_name}: {metrics['avg_score']:.2f} score, "
+                  f"{metrics['tokens_per_joule']:.2f} tokens/J, {metrics['joules_per_token']:.4f} J/token")
+        print("=" * 80)
+
+    def _display_distribution(self, metrics: Dict[str, Optional[float]], metric: str, label: str,
+                              unit: str, precision: int) -> None:
+        if metrics.get(f"{metric}_p50") is None:
+            return
+        def fmt(stat):
+            return f"{metrics[f'{metric}_{stat}']:.{precision}f}{unit}"
+        print(f"  {label} p50/p90/p95/p99: {fmt('p50')} / {fmt('p90')} / {fmt('p95')} / {fmt('p99')}")
+        print(f"  {label} min/max: {fmt('min')} / {fmt('max')}, stddev: {fmt('stddev')}, "
+              f"95% CI of mean: [{fmt('ci_low')}, {fmt('ci_high')}]")
+    
+    def _display_streaming_averages(self, metrics: Dict[str, Optional[float]], indent: str, prefix: str = "") -> None:
+        if metrics.get('avg_time_to_first_token') is not None:
+            print(f"{indent}{prefix}Time to First Token: {metrics['avg_time_to_first_token']:.3f} seconds")
+        if metrics.get('avg_decode_tokens_per_second') is not None:
+            print(f"{indent}{prefix}Decode Throughput: {metrics['avg_decode_tokens_per_second']:.2f} tokens/second")
+        if metrics.get('avg_inter_token_latency') is not None:
+            print(f"{indent}{prefix}Inter-Token Latency: {metrics['avg_inter_token_latency'] * 1000:.1f} ms")
+    
+    def display_scoring_summary(self, summary: Dict[str, int]) -> None:
+        print("SCORING SUMMARY:")
+        print(f"  Scored Locally: {summary['local']}")
+        print(f"  Scored From Cache: {summary['cache']}")
+        print(f"  Scored By Evaluator: {summary['judge']} ({summary['judge_requests']} requests)")
+        print(f"  Evaluator Calls Saved: {summary['judge_calls_saved']}")
+        print("=" * 80)
+    
+    def display_cache_stats(self, stats: Dict[str, Any]) -> None:
+        print("EVALUATION CACHE:")
+        print(f"  Hits: {stats['hits']}")
+        print(f"  Misses: {stats['misses']}")
+        print(f"  Hit Rate: {stats['hit_rate'] * 100:.1f}%")
+        print(f"  Entries: {stats['entries']}/{stats['max_entries']} ({stats['evictions']} evicted)")
+        print("=" * 80)
+    
+    def display_pipeline_stats(self, stats: Dict[str, float]) -> None:
+        print("PIPELINE STAGE SUMMARY:")
+        print(f"  Queue Size: {stats['queue_size']} (Judge Workers: {stats['judge_workers']})")
+        print(f"  Wall Time: {stats['wall_time']:.2f} seconds")
+        print(f"  Generation: {stats['generated']} answers, {stats['generation_throughput']:.2f}/s, "
+              f"{stats['generation_utilisation'] * 100:.1f}% busy")
+        print(f"  Evaluation: {stats['evaluated']} answers, {stats['evaluation_throughput']:.2f}/s, "
+              f"{stats['evaluation_utilisation'] * 100:.1f}% busy")
+        print(f"  Queue Depth: {stats['avg_queue_depth']:.2f} average, {stats['max_queue_depth']} max")
+        print(f"  Backpressure Wait: {stats['backpressure_wait_time']:.2f} seconds")
+        print("=" * 80)
+    
+    def display_provider_stats(self, stats: Dict[str, Dict[str, float]]) -> None:
+        # Only shown when a provider was throttled or had to retry
+        if not any(provider['retries'] or provider['rate_limit_wait_time'] for provider in stats.values()):
+            return
+        print("PROVIDER REQUESTS:")
+        for name, provider in stats.items():
+            print(f"  {name}: {provider['retries']} retries, "
+                  f"{provider['rate_limit_wait_time']:.2f} seconds waiting on rate limits")
+        print("=" * 80)
+    
+    def display_job_header(self, job_name: str, dataset: str, evaluation_type: str) -> None:
+        print(f"\n{'#'*80}")
+        print(f"JOB {job_name}: {dataset} ({evaluation_type})")
+        print(f"{'#'*80}")
+
+    def display_suite_summary(self, rows: List[Dict[str, Any]], overall: Dict[str, Dict[str, float]]) -> None:
+        print("\n" + "=" * 80)
+        print("SUITE RESULTS:")
+        print("=" * 80)
+        print(f"{'Job':<20} {'Model':<30} {'Score':>6} {'Time (s)':>9} {'Tokens':>8}")
+        for row in rows:
+            print(f"{row['job'][:20]:<20} {row['model_name'][:30]:<30} {row['avg_score']:>6.2f} "
+                  f"{row['avg_response_time']:>9.2f} {row['avg_completion_tokens']:>8.1f}")
+        print("-" * 80)
+        print("Overall (mean over jobs, each job weighted equally):")
+        for model_name, scores in overall.items():
+            print(f"  {model_name}: score {scores['avg_score']:.2f}, response time {scores['avg_response_time']:.2f}s "
+                  f"({scores['jobs']} jobs)")
+        if overall:
+            print(f"Highest Overall Score: {next(iter(overall))}")
+        print("=" * 80)
+
+    def display_endpoint_averages(self, model_name: str, endpoint_averages: Dict[str, Dict[str, Any]]) -> None:
+        if not endpoint_averages:
+            return
+        print(f"\nPer-endpoint averages for {model_name}:")
+        for endpoint, averages in endpoint_averages.items():
+            print(f"  {endpoint}: {averages['tests']} tests, score {averages['avg_score']:.2f}, "
+                  f"response time {averages['avg_response_time']:.2f}s "
+                  f"(p50 {averages['response_time_p50']:.2f}s, p95 {averages['response_time_p95']:.2f}s), "
+                  f"{averages['avg_completion_tokens']:.1f} completion tokens")
+
+    def display_endpoint_stats(self, stats: Dict[str, List[Dict[str, Any]]]) -> None:
+        if not stats:
+            return
+        print("ENDPOINT REQUESTS (routed to the endpoint with the fewest in flight, including warmups):")
+        for model_name, endpoints in stats.items():
+            print(f"  {model_name}:")
+            for endpoint in endpoints:
+                average = f"{endpoint['avg_response_time']:.2f}s average" if endpoint['avg_response_time'] is not None else 'no responses'
+                throughput = f", {endpoint['tokens_per_second']:.1f} tokens/s" if endpoint['tokens_per_second'] is not None else ''
+                status = ' (ejected)' if endpoint['ejected'] else ''
+                print(f"    {endpoint['endpoint']}: {endpoint['requests']} requests, {endpoint['errors']} errors, "
+                      f"{endpoint['ejections']} ejections, {average}{throughput}{status}")
+        print("=" * 80)
+
+    def display_halving_round(self, round_num: int, last_question_num: int, dropped: list, remaining: list) -> None:
+        print(f"\n{'='*60}")
+        print(f"Successive halving round {round_num} (questions up to {last_question_num}):")
+        if dropped:
+            print(f"  Dropped (score clearly below the leader): {', '.join(model['model'] for model in dropped)}")
+        else:
+            print("  No model clearly dominated, all kept")
+        print(f"  Continuing with: {', '.join(model['model'] for model in remaining)}")
+        print(f"{'='*60}")
+    
+    def display_sampling_summary(self, summary: Dict[str, Any]) -> None:
+        print("SAMPLING BUDGET:")
+        saved_pct = summary['tests_saved'] / summary['fixed_tests'] * 100 if summary['fixed_tests'] else 0
+        print(f"  Tests Run: {summary['tests_run']}")
+        print(f"  Fixed Run ({summary['number_of_tests']} per question): {summary['fixed_tests']} tests")
+        if summary['max_tests'] is not None:
+            print(f"  Adaptive Ceiling ({summary['max_tests']} per question): {summary['ceiling_tests']} tests")
+        print(f"  Tests Saved vs Fixed Run: {summary['tests_saved']} ({saved_pct:.1f}%, negative means more tests)")
+        for model_name, last_question_num in summary['eliminated_models'].items():
+            print(f"  {model_name}: dropped after question {last_question_num}")
+        print("=" * 80)
+    
+    def display_significance(self, comparison: Dict[str, Any]) -> None:
+        models = comparison['models']
+        width = max(12, max(len(model) for model in models) + 2)
+        print(f"PAIRED COMPARISON ({comparison['questions']} questions, significant at p < {comparison['alpha']}):")
+        print("  Per-question wins-ties-losses of each row model against each column model (* significant):")
+        print(f"  {'':<{width}}" + "".join(f"{model[:width - 2]:>{width}}" for model in models))
+        for i, row_model in enumerate(models):
+            cells = []
+            for j in range(len(models)):
+                if i == j:
+                    cells.append(f"{'-':>{width}}")
+                    continue
+                marker = '*' if comparison['p_values'][i, j] < comparison['alpha'] else ' '
+                record = f"{comparison['wins'][i, j]}-{comparison['ties'][i, j]}-{comparison['losses'][i, j]}{marker}"
+                cells.append(f"{record:>{width}}")
+            print(f"  {row_model[:width - 2]:<{width}}" + "".join(cells))
+        print("=" * 80)
+    
+    def display_tied_models(self, comparison: Dict[str, Any], model_metrics: Dict[str, Dict[str, Optional[float]]]) -> None:
+        print("🤝 NO SIGNIFICANT WINNER 🤝")
+        print(f"Tied Models: {', '.join(comparison['tied_models'])}")
+        for model_name in comparison['tied_models']:
+            print(f"  {model_name}: Average Score {model_metrics[model_name]['avg_score']:.2f}")
+        print(f"Highest Mean Score: {comparison['best_model']} "
+              f"(better than {comparison['runner_up']} with {comparison['winner_confidence'] * 100:.1f}% "
+              f"bootstrap confidence, p = {comparison['winner_p_value']:.3f})")
+        print("=" * 80)
+    
+    def display_shard_complete(self, shard_index: int, shard_count: int, tests: int, journal_path: str) -> None:
+        print(f"\nShard {shard_index + 1}/{shard_count} complete: {tests} tests recorded in {journal_path}")
+        print("Merge the shard journals with: python main.py --merge <journals>")
+    
+    def display_winning_model(self, winning_model_name: str, winning_score: float,
+                              comparison: Optional[Dict[str, Any]] = None) -> None:
         print("🏆 WINNING MODEL 🏆")
         print(f"Model: {winning_model_name}")
         print(f"Highest Average Score: {winning_score:.2f}")
+        if comparison:
+            print(f"Better than {comparison['runner_up']} with {comparison['winner_confidence'] * 100:.1f}% "
+                  f"bootstrap confidence (p = {comparison['winner_p_value']:.3f})")
         print("=" * 80)
\ No newline at end of file
@@ -1,21 +1,142 @@
 import csv
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+from metrics_collector import COLD_START_FIELDNAMES, DISTRIBUTION_FIELDNAMES
+
+
+class CsvResultsWriter:
+    def __init__(self, output_filename: str, fieldnames: List[str]):
+        self._file = open(output_filename, 'w', newline='', encoding='utf-8')
+        self._writer = csv.DictWriter(self._file, fieldnames=fieldnames)
+        self._writer.writeheader()
+
+    def write_rows(self, rows: List[Dict[str, Any]]) -> None:
+        self._writer.writerows(rows)
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class ParquetResultsWriter:
+    """Writes rows to Parquet in row groups of batch_size rows.
+
+    Metrics are stored as float64 (prompt tokens as int64) with nulls where the
+    CSV has 'N/A' or an empty cell, so they can be filtered and aggregated
+    without casting. Model, question, evaluator and row label columns repeat
+    heavily across a suite, so they are dictionary encoded; question_number and
+    test_number stay strings because aggregate rows are labelled there.
+    """
+
+    DICTIONARY_COLUMNS = {
+        'question_number', 'test_number', 'question', 'expected_answer', 'model_name', 'endpoint', 'evaluator',
+        'evaluator_model', 'scored_by'
+    }
+    INTEGER_COLUMNS = {'prompt_tokens'}
+    FLOAT_COLUMNS = {
+        'completion_tokens', 'total_tokens', 'response_time', 'energy_usage', 'gross_energy_usage',
+        'joules_per_token', 'tokens_per_joule', 'evaluation_score', 'time_to_first_token',
+        'inter_token_latency_avg', 'inter_token_latency_p95', 'decode_tokens_per_second',
+        *COLD_START_FIELDNAMES, *DISTRIBUTION_FIELDNAMES
+    }
+
+    def __init__(self, output_filename: str, fieldnames: List[str], batch_size: int):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Parquet output requires pyarrow. Install it with: pip install pyarrow")
+
+        self._pa = pa
+        self.fieldnames = fieldnames
+        self.batch_size = batch_size
+        self._buffer = []
+        self._schema = pa.schema([(name, self._column_type(name)) for name in fieldnames])
+        self._writer = pq.ParquetWriter(output_filename, self._schema)
+
+    def write_rows(self, rows: List[Dict[str, Any]]) -> None:
+        self._buffer.extend(rows)
+        if len(self._buffer) >= self.batch_size:
+            self._flush()
+
+    def _flush(self) -> None:
+        if not self._buffer:
+            return
+
+        pa = self._pa
+        columns = []
+        for name in self.fieldnames:
+            if name in self.INTEGER_COLUMNS or name in self.FLOAT_COLUMNS:
+                cast = int if name in self.INTEGER_COLUMNS else float
+                columns.append(pa.array(
+                    [self._to_number(row.get(name), cast) for row in self._buffer], type=self._column_type(name)
+                ))
+                continue
+            values = pa.array([self._to_string(row.get(name)) for row in self._buffer], type=pa.string())
+            columns.append(values.dictionary_encode() if name in self.DICTIONARY_COLUMNS else values)
+
+        self._writer.write_table(pa.Table.from_arrays(columns, schema=self._schema))
+        self._buffer = []
+
+    def _column_type(self, name: str):
+        pa = self._pa
+        if name in self.INTEGER_COLUMNS:
+            return pa.int64()
+        if name in self.FLOAT_COLUMNS:
+            return pa.float64()
+        if name in self.DICTIONARY_COLUMNS:
+            return pa.dictionary(pa.int32(), pa.string())
+        return pa.string()
+
+    @staticmethod
+    def _to_number(value: Any, cast) -> Optional[float]:
+        # Rows are formatted for the CSV, where missing metrics are 'N/A' or empty
+        if value is None or value in ('', 'N/A'):
+            return None
+        return cast(float(value))
+
+    @staticmethod
+    def _to_string(value: Any) -> str:
+        return '' if value is None else str(value)
+
+    def close(self) -> None:
+        self._flush()
+        self._writer.close()
 
 
 class ResultsExporter:
-    def __init__(self, output_filename: str = 'test_results.csv'):
+    def __init__(self, output_filename: str = 'test_results.csv', output_format: str = 'csv',
+                 batch_size: int = 1000):
         self.output_filename = output_filename
+        self.output_format = output_format
+        self.batch_size = batch_size
         self.fieldnames = [
             'question_number', 'test_number', 'question', 'llm_answer', 'expected_answer',
-            'model_name', 'evaluator', 'evaluator_model', 'prompt_tokens', 'completion_tokens',
-            'total_tokens', 'response_time', 'energy_usage', 'evaluation_score', 'evaluation_reasoning'
+            'model_name', 'endpoint', 'evaluator', 'evaluator_model', 'prompt_tokens', 'completion_tokens',
+            'total_tokens', 'response_time', 'energy_usage', 'gross_energy_usage', 'joules_per_token',
+            'tokens_per_joule', 'evaluation_score', 'evaluation_reasoning', 'scored_by',
+            'time_to_first_token', 'inter_token_latency_avg', 'inter_token_latency_p95', 'decode_tokens_per_second',
+            *COLD_START_FIELDNAMES, *DISTRIBUTION_FIELDNAMES
         ]
-    
+        self._writer = None
+
+    def open(self) -> None:
+        if self.output_format == 'parquet':
+            self._writer = ParquetResultsWriter(self.output_filename, self.fieldnames, self.batch_size)
+        elif self.output_format == 'csv':
+            self._writer = CsvResultsWriter(self.output_filename, self.fieldnames)
+        else:
+            raise ValueError(f"Unsupported output format '{self.output_format}'. Available formats: csv, parquet")
+
+    def write_rows(self, rows: List[Dict[str, Any]]) -> None:
+        self._writer.write_rows(rows)
+
+    def close(self) -> None:
+        if self._writer:
+            self._writer.close()
+            self._writer = None
+            print(f"\nResults exported to {self.output_filename}")
+
     def export_to_csv(self, csv_data: List[Dict[str, Any]]) -> None:
-        with open(self.output_filename, 'w', newline='', encoding='utf-8') as csvfile:
-            writer = csv.DictWriter(csvfile, fieldnames=self.fieldnames)
-            writer.writeheader()
-            writer.writerows(csv_data)
-        
-        print(f"\nResults exported to {self.output_filename}")
-    
+        self.open()
+        self.write_rows(csv_data)
+        self.close()
@@ -0,0 +1,330 @@
+import argparse
+import hashlib
+import json
+import os
+import platform
+import socket
+import sqlite3
+import subprocess
+import sys
+import threading
+import time
+from typing import Dict, Any, List, Optional
+
+SCHEMA = [
+    "CREATE TABLE IF NOT EXISTS runs ("
+    "id INTEGER PRIMARY KEY, started_at REAL NOT NULL, finished_at REAL, job TEXT, dataset TEXT NOT NULL, "
+    "evaluation_type TEXT NOT NULL, evaluator TEXT, evaluator_model TEXT, git_revision TEXT, "
+    "hardware TEXT NOT NULL, config TEXT NOT NULL)",
+    # One row per model per run, so trend queries never scan the individual tests
+    "CREATE TABLE IF NOT EXISTS model_runs ("
+    "run_id INTEGER NOT NULL REFERENCES runs (id), model_name TEXT NOT NULL, dataset TEXT NOT NULL, "
+    "started_at REAL NOT NULL, tests INTEGER NOT NULL, avg_score REAL, avg_response_time REAL, "
+    "response_time_p95 REAL, avg_time_to_first_token REAL, tokens_per_second REAL, "
+    "avg_decode_tokens_per_second REAL, avg_energy_usage REAL, joules_per_token REAL, "
+    "PRIMARY KEY (run_id, model_name))",
+    "CREATE TABLE IF NOT EXISTS tests ("
+    "run_id INTEGER NOT NULL REFERENCES runs (id), model_name TEXT NOT NULL, dataset TEXT NOT NULL, "
+    "question_number INTEGER NOT NULL, question_key TEXT NOT NULL, test_number INTEGER NOT NULL, "
+    "endpoint TEXT, evaluation_score REAL, scored_by TEXT, response_time REAL, time_to_first_token REAL, "
+    "completion_tokens INTEGER, total_tokens INTEGER, decode_tokens_per_second REAL, energy_usage REAL, "
+    "joules_per_token REAL)",
+    "CREATE INDEX IF NOT EXISTS idx_runs_started_at ON runs (started_at)",
+    "CREATE INDEX IF NOT EXISTS idx_model_runs_trend ON model_runs (model_name, dataset, started_at)",
+    "CREATE INDEX IF NOT EXISTS idx_model_runs_dataset ON model_runs (dataset, started_at)",
+    "CREATE INDEX IF NOT EXISTS idx_tests_question ON tests (model_name, dataset, question_key, run_id)",
+    "CREATE INDEX IF NOT EXISTS idx_tests_run ON tests (run_id, model_name, question_number)"
+]
+
+# Setting names whose values are not stored in the config snapshot
+SECRET_SETTINGS = ('api_key',)
+
+
+def _redact(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {
+            key: '<redacted>' if key in SECRET_SETTINGS and item else _redact(item)
+            for key, item in value.items()
+        }
+    if isinstance(value, list):
+        return [_redact(item) for item in value]
+    return value
+
+
+def _json_value(value: Any) -> str:
+    # Enums such as the evaluation type are stored by name
+    return getattr(value, 'name', str(value))
+
+
+def get_git_revision() -> Optional[str]:
+    """Revision of the harness checkout, with a +dirty suffix for uncommitted changes."""
+    directory = os.path.dirname(os.path.abspath(__file__))
+    try:
+        revision = subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], cwd=directory, capture_output=True, text=True, timeout=5, check=True
+        ).stdout.strip()
+        status = subprocess.run(
+            ['git', 'status', '--porcelain', '--untracked-files=no'], cwd=directory, capture_output=True,
+            text=True, timeout=5, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return f"{revision}+dirty" if status else revision
+
+
+def get_hardware_info() -> Dict[str, Any]:
+    memory_bytes = None
+    try:
+        memory_bytes = os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES')
+    except (AttributeError, ValueError, OSError):
+        pass
+    return {
+        'hostname': socket.gethostname(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'processor': platform.processor(),
+        'cpu_count': os.cpu_count(),
+        'memory_bytes': memory_bytes,
+        'python_version': platform.python_version()
+    }
+
+
+def question_key(qa: Dict[str, Any]) -> str:
+    # Items are matched across runs by id when they have one, otherwise by question text
+    if qa.get('id'):
+        return str(qa['id'])
+    return hashlib.sha256(qa['question'].encode('utf-8')).hexdigest()[:16]
+
+
+class RunHistory:
+    """Indexed SQLite history of runs, for comparing models and builds across runs.
+
+    Each run stores a config snapshot (with API keys redacted), the git revision
+    of the harness, hardware information, every test and one summary row per
+    model. Trend queries read only the per-model summaries.
+    """
+
+    def __init__(self, path: str = 'run_history.sqlite'):
+        self.path = path
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        for statement in SCHEMA:
+            self._connection.execute(statement)
+        self._connection.commit()
+
+    def start_run(self, config: Dict[str, Any], dataset: str, evaluation_type: str, evaluator: str,
+                  evaluator_model: str, job: Optional[str] = None) -> int:
+        git_revision = get_git_revision()
+        with self._lock:
+            cursor = self._connection.execute(
+                "INSERT INTO runs (started_at, job, dataset, evaluation_type, evaluator, evaluator_model, "
+                "git_revision, hardware, config) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    time.time(), job, dataset, evaluation_type, evaluator, evaluator_model, git_revision,
+                    json.dumps(get_hardware_info()), json.dumps(_redact(config), default=_json_value)
+                )
+            )
+            self._connection.commit()
+            return cursor.lastrowid
+
+    def record_tests(self, run_id: int, model_name: str, dataset: str, question_num: int, qa: Dict[str, Any],
+                     results: List[Dict[str, Any]]) -> None:
+        key = question_key(qa)
+        with self._lock:
+            self._connection.executemany(
+                "INSERT INTO tests (run_id, model_name, dataset, question_number, question_key, test_number, "
+                "endpoint, evaluation_score, scored_by, response_time, time_to_first_token, completion_tokens, "
+                "total_tokens, decode_tokens_per_second, energy_usage, joules_per_token) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        run_id, model_name, dataset, question_num, key, test_num, result.get('endpoint'),
+                        result['evaluation_score'], result['scored_by'], result['response_time'],
+                        result['time_to_first_token'], result['completion_tokens'], result['total_tokens'],
+                        result['decode_tokens_per_second'], result['energy_consumption_wh'],
+                        result.get('joules_per_token')
+                    )
+                    for test_num, result in enumerate(results, 1)
+                ]
+            )
+            self._connection.commit()
+
+    def record_model(self, run_id: int, model_name: str, dataset: str, tests: int,
+                     averages: Dict[str, Optional[float]]) -> None:
+        response_time = averages['avg_response_time']
+        with self._lock:
+            started_at = self._connection.execute(
+                "SELECT started_at FROM runs WHERE id = ?", (run_id,)
+            ).fetchone()[0]
+            self._connection.execute(
+                "INSERT OR REPLACE INTO model_runs (run_id, model_name, dataset, started_at, tests, avg_score, "
+                "avg_response_time, response_time_p95, avg_time_to_first_token, tokens_per_second, "
+                "avg_decode_tokens_per_second, avg_energy_usage, joules_per_token) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    run_id, model_name, dataset, started_at, tests, averages['avg_score'], response_time,
+                    averages.get('response_time_p95'), averages['avg_time_to_first_token'],
+                    averages['avg_completion_tokens'] / response_time if response_time else None,
+                    averages['avg_decode_tokens_per_second'], averages['avg_energy_usage'],
+                    averages.get('joules_per_token')
+                )
+            )
+            self._connection.commit()
+
+    def finish_run(self, run_id: int) -> None:
+        # Runs that were interrupted keep a NULL finished_at
+        with self._lock:
+            self._connection.execute("UPDATE runs SET finished_at = ? WHERE id = ?", (time.time(), run_id))
+            self._connection.commit()
+
+    def _query(self, sql: str, parameters: tuple) -> List[Dict[str, Any]]:
+        with self._lock:
+            cursor = self._connection.execute(sql, parameters)
+            columns = [column[0] for column in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    def get_runs(self, limit: int = 20) -> List[Dict[str, Any]]:
+        return self._query(
+            "SELECT id, started_at, finished_at, job, dataset, evaluation_type, evaluator_model, git_revision, "
+            "json_extract(hardware, '$.hostname') AS hostname FROM runs ORDER BY started_at DESC LIMIT ?",
+            (limit,)
+        )
+
+    def get_trends(self, model_name: Optional[str] = None, dataset: Optional[str] = None,
+                   limit: int = 20) -> List[Dict[str, Any]]:
+        """The latest limit runs of each model (optionally one model and dataset), oldest first."""
+        conditions, parameters = [], []
+        if model_name:
+            conditions.append("model_name = ?")
+            parameters.append(model_name)
+        if dataset:
+            conditions.append("dataset = ?")
+            parameters.append(dataset)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+        pairs = self._query(
+            f"SELECT DISTINCT model_name, dataset FROM model_runs {where} ORDER BY model_name, dataset",
+            tuple(parameters)
+        )
+
+        # One index range per model and dataset, so the cost does not grow with the number of runs
+        rows = []
+        for pair in pairs:
+            rows.extend(self._query(
+                "SELECT m.*, r.git_revision FROM model_runs m JOIN runs r ON r.id = m.run_id "
+                "WHERE m.model_name = ? AND m.dataset = ? ORDER BY m.started_at DESC LIMIT ?",
+                (pair['model_name'], pair['dataset'], limit)
+            )[::-1])
+        return rows
+
+    def get_question_history(self, model_name: str, dataset: str, question_number: int,
+                             limit: int = 20) -> List[Dict[str, Any]]:
+        """Per-run score and response time of one question, matched across runs by its id or text.
+
+        question_number is the question's number in the model's latest run.
+        """
+        return self._query(
+            "SELECT t.run_id, r.started_at, r.git_revision, COUNT(*) AS tests, AVG(t.evaluation_score) AS avg_score, "
+            "AVG(t.response_time) AS avg_response_time FROM tests t JOIN runs r ON r.id = t.run_id "
+            "WHERE t.model_name = ? AND t.dataset = ? AND t.question_key = ("
+            "SELECT question_key FROM tests WHERE run_id = ("
+            "SELECT run_id FROM model_runs WHERE model_name = ? AND dataset = ? ORDER BY started_at DESC LIMIT 1"
+            ") AND model_name = ? AND question_number = ? LIMIT 1) "
+            "GROUP BY t.run_id ORDER BY t.run_id DESC LIMIT ?",
+            (model_name, dataset, model_name, dataset, model_name, question_number, limit)
+        )[::-1]
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+
+def _format(value: Optional[float], precision: int, unit: str = '') -> str:
+    return f"{value:.{precision}f}{unit}" if value is not None else 'N/A'
+
+
+def _format_change(value: Optional[float], previous: Optional[float], precision: int) -> str:
+    if value is None or previous is None:
+        return ''
+    return f" ({value - previous:+.{precision}f})"
+
+
+def _format_revision(revision: Optional[str]) -> str:
+    if not revision:
+        return 'N/A'
+    return revision[:8] + ('+dirty' if revision.endswith('+dirty') else '')
+
+
+def _format_time(timestamp: float) -> str:
+    return time.strftime('%Y-%m-%d %H:%M', time.localtime(timestamp))
+
+
+def display_trends(rows: List[Dict[str, Any]]) -> None:
+    previous = None
+    for row in rows:
+        if previous is None or (previous['model_name'], previous['dataset']) != (row['model_name'], row['dataset']):
+            print(f"\n{row['model_name']} on {row['dataset']}:")
+            print(f"  {'Run':>5} {'Started':<16} {'Revision':<14} {'Tests':>6} {'Score':>14} {'Time (s)':>15} "
+                  f"{'p95 (s)':>8} {'Tokens/s':>9} {'Energy (Wh)':>12}")
+            previous = None
+        print(f"  {row['run_id']:>5} {_format_time(row['started_at']):<16} {_format_revision(row['git_revision']):<14} "
+              f"{row['tests']:>6} "
+              f"{_format(row['avg_score'], 2) + _format_change(row['avg_score'], previous and previous['avg_score'], 2):>14} "
+              f"{_format(row['avg_response_time'], 2) + _format_change(row['avg_response_time'], previous and previous['avg_response_time'], 2):>15} "
+              f"{_format(row['response_time_p95'], 2):>8} {_format(row['tokens_per_second'], 1):>9} "
+              f"{_format(row['avg_energy_usage'], 6):>12}")
+        previous = row
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Query the run history database')
+    parser.add_argument('--database', default='run_history.sqlite', help='Path to the run history database')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    runs_parser = subparsers.add_parser('runs', help='List the most recent runs')
+    runs_parser.add_argument('--limit', type=int, default=20)
+
+    trends_parser = subparsers.add_parser(
+        'trends', help='Score, latency, throughput and energy of each model across its latest runs'
+    )
+    trends_parser.add_argument('--model', help='Only this subject model')
+    trends_parser.add_argument('--dataset', help='Only this dataset')
+    trends_parser.add_argument('--limit', type=int, default=20, help='Runs shown per model and dataset')
+
+    question_parser = subparsers.add_parser('question', help='History of one question for one model')
+    question_parser.add_argument('--model', required=True)
+    question_parser.add_argument('--dataset', required=True)
+    question_parser.add_argument('--question', type=int, required=True, help='Question number in the latest run')
+    question_parser.add_argument('--limit', type=int, default=20)
+    args = parser.parse_args()
+
+    if not os.path.exists(args.database):
+        sys.exit(f"No run history at {args.database}")
+    history = RunHistory(args.database)
+    start_time = time.perf_counter()
+
+    if args.command == 'runs':
+        for run in history.get_runs(args.limit):
+            status = '' if run['finished_at'] else ' (interrupted)'
+            job = f" [{run['job']}]" if run['job'] else ''
+            print(f"{run['id']:>5} {_format_time(run['started_at'])} {run['dataset']}{job} ({run['evaluation_type']}, "
+                  f"judge {run['evaluator_model']}) rev {_format_revision(run['git_revision'])} on {run['hostname']}{status}")
+    elif args.command == 'trends':
+        display_trends(history.get_trends(args.model, args.dataset, args.limit))
+    else:
+        for row in history.get_question_history(args.model, args.dataset, args.question, args.limit):
+            print(f"{row['run_id']:>5} {_format_time(row['started_at'])} rev {_format_revision(row['git_revision'])}: "
+                  f"{row['tests']} tests, score {_format(row['avg_score'], 2)}, "
+                  f"response time {_format(row['avg_response_time'], 2, 's')}")
+
+    print(f"\nQuery took {(time.perf_counter() - start_time) * 1000:.1f} ms")
+    history.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+import hashlib
+import json
+import os
+from typing import Dict, Any, List, Optional, Tuple
+
+
+class RunJournal:
+    """Append-only journal of completed tests, used to resume interrupted suites.
+
+    Each completed test is written as one JSON line and flushed to disk before
+    the suite moves on, so at most the in-flight tests are lost on a crash. A
+    truncated final line (from a crash mid-write) is ignored when loading.
+    """
+
+    def __init__(self, path: str, run_signature: Dict[str, Any], resume: bool = False):
+        self.path = path
+        self.run_hash = hashlib.sha256(json.dumps(run_signature, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+        self.completed: Dict[Tuple[str, int, int], Dict[str, Any]] = {}
+        self.warmups: Dict[str, Dict[str, Any]] = {}
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        if resume and os.path.exists(path):
+            self._load()
+            self._file = open(path, 'a', encoding='utf-8')
+            self._terminate_partial_line()
+        else:
+            self._file = open(path, 'w', encoding='utf-8')
+            self._write({'type': 'run', 'run_hash': self.run_hash})
+
+    def _load(self) -> None:
+        with open(self.path, 'r', encoding='utf-8') as journal_file:
+            for line in journal_file:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+
+                if entry['type'] == 'run' and entry['run_hash'] != self.run_hash:
+                    raise ValueError(
+                        f"Journal '{self.path}' was written for a different configuration and cannot be resumed"
+                    )
+                if entry['type'] == 'test':
+                    key = (entry['model'], entry['question_number'], entry['test_number'])
+                    self.completed[key] = entry['result']
+                if entry['type'] == 'warmup':
+                    self.warmups.setdefault(entry['model'], entry['response'])
+
+    def _terminate_partial_line(self) -> None:
+        # Keep new entries off a line left half-written by a crash
+        with open(self.path, 'rb') as journal_file:
+            journal_file.seek(0, os.SEEK_END)
+            if journal_file.tell() == 0:
+                return
+            journal_file.seek(-1, os.SEEK_END)
+            if journal_file.read(1) != b'\n':
+                self._file.write('\n')
+
+    def _write(self, entry: Dict[str, Any]) -> None:
+        self._file.write(json.dumps(entry) + '\n')
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def get_result(self, model_name: str, question_num: int, test_num: int) -> Optional[Dict[str, Any]]:
+        return self.completed.get((model_name, question_num, test_num))
+
+    def record(self, model_name: str, question_num: int, test_num: int, result: Dict[str, Any]) -> None:
+        self._write({
+            'type': 'test',
+            'model': model_name,
+            'question_number': question_num,
+            'test_number': test_num,
+            'result': result
+        })
+
+    def get_warmup(self, model_name: str) -> Optional[Dict[str, Any]]:
+        return self.warmups.get(model_name)
+
+    def record_warmup(self, model_name: str, response: Dict[str, Any]) -> None:
+        # Only the cold start is kept, so resumed and merged runs can still report it
+        self._write({'type': 'warmup', 'model': model_name, 'response': response})
+
+    def close(self) -> None:
+        self._file.close()
+
+    @staticmethod
+    def merge(paths: List[str], output_path: str) -> int:
+        """Combines journals written by shard workers of the same run into one journal.
+
+        All journals must come from the same configuration. Each test is taken
+        from the first journal that has it, as is each model's cold start.
+        Returns the number of tests in the merged journal.
+        """
+        run_hashes = set()
+        tests: Dict[Tuple[str, int, int], Dict[str, Any]] = {}
+        warmups: Dict[str, Dict[str, Any]] = {}
+        for path in paths:
+            with open(path, 'r', encoding='utf-8') as journal_file:
+                for line in journal_file:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    if entry['type'] == 'run':
+                        run_hashes.add(entry['run_hash'])
+                    elif entry['type'] == 'test':
+                        tests.setdefault((entry['model'], entry['question_number'], entry['test_number']), entry)
+                    elif entry['type'] == 'warmup':
+                        warmups.setdefault(entry['model'], entry)
+
+        if len(run_hashes) != 1:
+            raise ValueError("Shard journals were written for different configurations and cannot be merged")
+
+        directory = os.path.dirname(output_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(output_path, 'w', encoding='utf-8') as merged_file:
+            merged_file.write(json.dumps({'type': 'run', 'run_hash': run_hashes.pop()}) + '\n')
+            for entry in warmups.values():
+                merged_file.write(json.dumps(entry) + '\n')
+            for key in sorted(tests):
+                merged_file.write(json.dumps(tests[key]) + '\n')
+        return len(tests)
@@ -0,0 +1,106 @@
+import sys
+import time
+from contextlib import contextmanager
+from importlib.abc import MetaPathFinder
+from typing import Dict, List, Tuple
+
+
+class _TimedLoader:
+    """Wraps a module loader to time module execution, delegating everything else."""
+
+    def __init__(self, loader, name: str, profiler: 'StartupProfiler'):
+        self._loader = loader
+        self._name = name
+        self._profiler = profiler
+
+    def __getattr__(self, attribute):
+        return getattr(self._loader, attribute)
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        with self._profiler.measure_import(self._name):
+            self._loader.exec_module(module)
+
+
+class _TimingFinder(MetaPathFinder):
+    def __init__(self, profiler: 'StartupProfiler'):
+        self._profiler = profiler
+
+    def find_spec(self, fullname, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, 'find_spec'):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                if spec.loader is not None and hasattr(spec.loader, 'exec_module'):
+                    spec.loader = _TimedLoader(spec.loader, fullname, self._profiler)
+                return spec
+        return None
+
+
+class StartupProfiler:
+    """Records module import times and named initialization steps when enabled.
+
+    Import times are self times (excluding nested imports, like python -X importtime)
+    and are reported per top-level package. Disabled profilers record nothing.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.start_time = time.perf_counter()
+        self.import_times: Dict[str, float] = {}
+        self.initialisation_times: List[Tuple[str, float]] = []
+        self._nested_import_time = [0.0]
+
+    def enable(self) -> None:
+        if not self.enabled:
+            self.enabled = True
+            sys.meta_path.insert(0, _TimingFinder(self))
+
+    @contextmanager
+    def measure_import(self, module_name: str):
+        start_time = time.perf_counter()
+        self._nested_import_time.append(0.0)
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start_time
+            nested = self._nested_import_time.pop()
+            self._nested_import_time[-1] += elapsed
+
+            package = module_name.split('.')[0]
+            self.import_times[package] = self.import_times.get(package, 0.0) + elapsed - nested
+
+    @contextmanager
+    def measure(self, name: str):
+        if not self.enabled:
+            yield
+            return
+
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.initialisation_times.append((name, time.perf_counter() - start_time))
+
+    def display_report(self, limit: int = 15) -> None:
+        print("\nSTARTUP PROFILE:")
+        print(f"  Time since profiler start: {time.perf_counter() - self.start_time:.3f}s")
+
+        print("  Imports (self time per top-level package):")
+        ordered_imports = sorted(self.import_times.items(), key=lambda item: item[1], reverse=True)
+        for package, seconds in ordered_imports[:limit]:
+            print(f"    {package:<30} {seconds * 1000:8.1f} ms")
+        remaining = ordered_imports[limit:]
+        if remaining:
+            print(f"    {f'{len(remaining)} other packages':<30} {sum(s for _, s in remaining) * 1000:8.1f} ms")
+
+        print("  Initialization:")
+        for name, seconds in self.initialisation_times:
+            print(f"    {name:<30} {seconds * 1000:8.1f} ms")
+        print("=" * 80)
+
+
+startup_profiler = StartupProfiler()
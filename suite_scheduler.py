@@ -0,0 +1,139 @@
+import csv
+import os
+from typing import Any, Dict, List, Tuple
+
+from config_manager import ConfigManager
+
+# Settings a job can set; subject models, providers and execution settings are shared by the whole suite
+JOB_SETTINGS = (
+    'name', 'dataset', 'evaluation_type', 'evaluator', 'evaluator_model', 'number_of_tests',
+    'dataset_sampling', 'local_scoring', 'output', 'journal_path'
+)
+SUITE_FIELDNAMES = [
+    'job', 'dataset', 'evaluation_type', 'evaluator', 'evaluator_model', 'model_name',
+    'avg_score', 'avg_response_time', 'avg_completion_tokens', 'avg_energy_usage'
+]
+
+
+def _with_job_name(filename: str, job_name: str) -> str:
+    base, extension = os.path.splitext(filename)
+    return f"{base}_{job_name}{extension}"
+
+
+def job_overrides(config: ConfigManager) -> List[Dict[str, Any]]:
+    """Config overrides for each job of the suite manifest.
+
+    Jobs without their own results file or journal get the suite's with the
+    job name appended, so jobs never write to the same file.
+    """
+    overrides = []
+    for job in config.jobs:
+        unsupported = sorted(set(job) - set(JOB_SETTINGS))
+        if unsupported:
+            raise ValueError(
+                f"Unsupported job settings: {', '.join(unsupported)}. Jobs can set: {', '.join(JOB_SETTINGS)}"
+            )
+        if not job.get('dataset') or not job.get('evaluation_type'):
+            raise ValueError("Every job needs a dataset and an evaluation_type")
+
+        name = job.get('name') or os.path.splitext(os.path.basename(job['dataset'].rstrip('/')))[0]
+        if any(override['name'] == name for override in overrides):
+            raise ValueError(f"Duplicate job name '{name}'; give each job a unique name")
+
+        output = {**config.load_config().get('output', {}), **job.get('output', {})}
+        if 'filename' not in job.get('output', {}):
+            output['filename'] = _with_job_name(config.output_filename, name)
+        overrides.append({
+            **job,
+            'name': name,
+            'output': output,
+            'journal_path': job.get('journal_path', _with_job_name(config.journal_path, name))
+        })
+    return overrides
+
+
+class SuiteScheduler:
+    """Runs the jobs of a suite manifest model-major.
+
+    Each subject model runs every job before the next model is tested, so a
+    local model is loaded once per suite rather than once per job. Every job
+    keeps its own results file, journal and report; the suite summary compares
+    models across jobs, weighting each job equally.
+    """
+
+    def __init__(self, jobs: List[Tuple[str, Any]], output_filename: str):
+        self.jobs = jobs
+        self.output_filename = output_filename
+
+    def run(self, subject_models: List[Dict[str, str]]) -> List[Dict[str, Any]]:
+        displayer = self.jobs[0][1].displayer
+        for job_num, (_, suite) in enumerate(self.jobs):
+            # The jobs share one power sampler, calibrated once
+            suite.open(start_power=job_num == 0)
+        try:
+            for model in subject_models:
+                for job_name, suite in self.jobs:
+                    displayer.display_job_header(job_name, suite.config.dataset, suite.config.evaluation_type.name)
+                    suite.run_model(model)
+            for _, suite in self.jobs:
+                suite.finish()
+        finally:
+            for _, suite in self.jobs:
+                suite.close()
+
+        for job_name, suite in self.jobs:
+            displayer.display_job_header(job_name, suite.config.dataset, suite.config.evaluation_type.name)
+            suite.display_results()
+
+        rows = self.get_summary_rows()
+        displayer.display_suite_summary(rows, self.get_overall_scores(rows))
+        self.export(rows)
+        return rows
+
+    def get_summary_rows(self) -> List[Dict[str, Any]]:
+        rows = []
+        for job_name, suite in self.jobs:
+            for model_name, metrics in suite.model_metrics.items():
+                rows.append({
+                    'job': job_name,
+                    'dataset': suite.config.dataset,
+                    'evaluation_type': suite.config.evaluation_type.name,
+                    'evaluator': suite.config.evaluator,
+                    'evaluator_model': suite.config.evaluator_model,
+                    'model_name': model_name,
+                    'avg_score': metrics['avg_score'],
+                    'avg_response_time': metrics['avg_response_time'],
+                    'avg_completion_tokens': metrics['avg_completion_tokens'],
+                    'avg_energy_usage': metrics['avg_energy_usage']
+                })
+        return rows
+
+    @staticmethod
+    def get_overall_scores(rows: List[Dict[str, Any]]) -> Dict[str, Dict[str, float]]:
+        """Mean score and response time of each model over the jobs, best score first."""
+        per_model: Dict[str, List[Dict[str, Any]]] = {}
+        for row in rows:
+            per_model.setdefault(row['model_name'], []).append(row)
+        overall = {
+            model_name: {
+                'jobs': len(model_rows),
+                'avg_score': sum(row['avg_score'] for row in model_rows) / len(model_rows),
+                'avg_response_time': sum(row['avg_response_time'] for row in model_rows) / len(model_rows)
+            }
+            for model_name, model_rows in per_model.items()
+        }
+        return dict(sorted(overall.items(), key=lambda item: item[1]['avg_score'], reverse=True))
+
+    def export(self, rows: List[Dict[str, Any]]) -> None:
+        with open(self.output_filename, 'w', newline='', encoding='utf-8') as csv_file:
+            writer = csv.DictWriter(csv_file, fieldnames=SUITE_FIELDNAMES)
+            writer.writeheader()
+            for row in rows:
+                writer.writerow({
+                    **row,
+                    'avg_score': f"{row['avg_score']:.2f}",
+                    'avg_response_time': f"{row['avg_response_time']:.2f}",
+                    'avg_completion_tokens': f"{row['avg_completion_tokens']:.2f}",
+                    'avg_energy_usage': f"{row['avg_energy_usage']:.6f}" if row['avg_energy_usage'] is not None else 'N/A'
+                })
+        print(f"\nSuite results exported to {self.output_filename}")
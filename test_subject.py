@@ -1,10 +1,8 @@
-import time
-from providers.anthropic import call_anthropic_model
-from providers.lmstudio import call_lmstudio_model
-from providers.openai import call_openai_model
+from providers.registry import registry, PROVIDER_MODULES
+from providers.streaming import summarise_inter_token_latencies
 from evaluators.evaluation_types import EvaluationType
 
-def test_model(provider:str, model:str="*", evaluation_type:EvaluationType = None, question:str = "", temperature=0.5):
+def get_instructions(evaluation_type:EvaluationType = None):
 
   instructions = ""
 
@@ -15,26 +13,48 @@ def test_model(provider:str, model:str="*", evaluation_type:EvaluationType = Non
   elif evaluation_type == EvaluationType.SUMMARISE:
     instructions = "Summarise the given text, maintain the key and factual elements."
 
-  # Start a timer for the local model completion
-  start_time = time.time()
+  return instructions
 
-  if provider == 'openai':
-    response = call_openai_model(model, instructions, question, temperature)
-  elif provider == 'anthropic':
-    response = call_anthropic_model(model, instructions, question, temperature)
-  elif provider == 'lmstudio':
-    response = call_lmstudio_model(model, instructions, question, temperature)
-  else:
-    response = call_lmstudio_model(model, instructions, question, temperature)
+def _subject_provider(provider):
+  # Unknown providers are assumed to be served by LM Studio
+  return provider if provider in PROVIDER_MODULES else 'lmstudio'
 
-  # End time and response time
-  end_time = time.time()
-  response_time = end_time - start_time
+def _format_result(response):
+  # Response time is measured by the registry around the successful attempt,
+  # so rate limit waits and retried attempts are not counted
+  response_time = response["response_time"]
+  time_to_first_token = response.get("time_to_first_token")
+
+  # Decode throughput excludes prefill/queueing, so only the tokens after the first are counted
+  decode_tokens_per_second = None
+  if time_to_first_token is not None and response_time > time_to_first_token and response["completion_tokens"] > 1:
+    decode_tokens_per_second = (response["completion_tokens"] - 1) / (response_time - time_to_first_token)
 
   return {
     "response": response["response"],
     "response_time": response_time,
     "prompt_tokens": response["prompt_tokens"],
     "completion_tokens": response["completion_tokens"],
-    "total_tokens": response["total_tokens"]
-  }
\ No newline at end of file
+    "total_tokens": response["total_tokens"],
+    "time_to_first_token": time_to_first_token,
+    "decode_tokens_per_second": decode_tokens_per_second,
+    # Set when the model is served by several endpoints
+    "endpoint": response.get("endpoint"),
+    **summarise_inter_token_latencies(response.get("inter_token_latencies", []))
+  }
+
+def test_model(provider:str, model:str="*", evaluation_type:EvaluationType = None, question:str = "", temperature=0.5, stream=False):
+
+  instructions = get_instructions(evaluation_type)
+
+  response = registry.call(_subject_provider(provider), model, instructions, question, temperature, stream=stream)
+
+  return _format_result(response)
+
+async def test_model_async(provider:str, model:str="*", evaluation_type:EvaluationType = None, question:str = "", temperature=0.5, stream=False):
+
+  instructions = get_instructions(evaluation_type)
+
+  response = await registry.call_async(_subject_provider(provider), model, instructions, question, temperature, stream=stream)
+
+  return _format_result(response)
@@ -0,0 +1,103 @@
+import asyncio
+
+from async_runner import AsyncTestRunner
+
+MODEL = {'provider': 'openai', 'model': 'model-a'}
+QA_PAIRS = [{'question': f'Q{i}', 'answer': f'A{i}'} for i in range(1, 4)]
+
+
+class FakeJournal:
+    def __init__(self, completed=None):
+        self.completed = dict(completed or {})
+
+    def get_result(self, model_name, question_num, test_num):
+        return self.completed.get((model_name, question_num, test_num))
+
+    def record(self, model_name, question_num, test_num, result):
+        self.completed[(model_name, question_num, test_num)] = result
+
+
+class FakeModelTester:
+    """Answers each question with its text, tracking how many requests overlap."""
+
+    def __init__(self):
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.calls = 0
+
+    async def test_single_iteration_async(self, provider, model, question):
+        self.calls += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        return {
+            'response': f'answer to {question}', 'prompt_tokens': 3, 'completion_tokens': 4, 'total_tokens': 7,
+            'response_time': 0.01, 'time_to_first_token': None, 'decode_tokens_per_second': None,
+            'inter_token_latency_avg': None, 'inter_token_latency_p95': None
+        }
+
+
+class FakeEvaluationManager:
+    def __init__(self, batch_size=1):
+        self.batch_size = batch_size
+        self.batches = []
+
+    async def evaluate_responses_async(self, question, expected_answer, actual_answers):
+        self.batches.append(len(actual_answers))
+        return [
+            {'score': '1' if answer == f'answer to {question}' else '0', 'reasoning': expected_answer, 'scored_by': 'judge'}
+            for answer in actual_answers
+        ]
+
+
+def make_runner(journal=None, batch_size=1, number_of_tests=2, concurrency=2):
+    model_tester = FakeModelTester()
+    evaluation_manager = FakeEvaluationManager(batch_size)
+    runner = AsyncTestRunner(model_tester, evaluation_manager, number_of_tests, {'openai': concurrency}, 2,
+                             journal or FakeJournal())
+    return runner, model_tester, evaluation_manager
+
+
+def test_results_are_ordered_by_question_and_test():
+    journal = FakeJournal()
+    runner, model_tester, _ = make_runner(journal)
+    results = runner.run_model(MODEL, QA_PAIRS)
+
+    assert [[result['evaluation_reasoning'] for result in question] for question in results] == [
+        ['A1', 'A1'], ['A2', 'A2'], ['A3', 'A3']
+    ]
+    assert all(result['evaluation_score'] == 1.0 for question in results for result in question)
+    assert model_tester.calls == 6
+    assert set(journal.completed) == {('model-a', q, t) for q in range(1, 4) for t in range(1, 3)}
+
+
+def test_subject_requests_stay_within_the_provider_concurrency():
+    runner, model_tester, _ = make_runner(number_of_tests=4, concurrency=3)
+    runner.run_model(MODEL, QA_PAIRS)
+
+    assert model_tester.max_in_flight == 3
+
+
+def test_answers_to_a_question_are_judged_in_batches():
+    runner, _, evaluation_manager = make_runner(batch_size=2, number_of_tests=3)
+    runner.run_model(MODEL, QA_PAIRS)
+
+    assert sorted(evaluation_manager.batches) == [1, 1, 1, 2, 2, 2]
+
+
+def test_question_numbers_start_at_first_question_num():
+    journal = FakeJournal()
+    runner, _, _ = make_runner(journal, number_of_tests=1)
+    runner.run_model(MODEL, QA_PAIRS[:1], first_question_num=5)
+
+    assert set(journal.completed) == {('model-a', 5, 1)}
+
+
+def test_tests_outside_the_filter_are_left_empty():
+    runner, model_tester, _ = make_runner()
+    runner.test_filter = lambda model_name, question_num, test_num: test_num == 1
+    results = runner.run_model(MODEL, QA_PAIRS)
+
+    assert model_tester.calls == 3
+    assert all(question[0] is not None and question[1] is None for question in results)
@@ -0,0 +1,79 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from comparison_analyzer import ComparisonAnalyzer
+
+analyzer = ComparisonAnalyzer(resamples=20000, permutations=20000)
+
+
+def exact_permutation_p_value(differences):
+    observed = abs(np.mean(differences))
+    flipped = [abs(np.mean(np.array(signs) * differences)) for signs in itertools.product([-1, 1], repeat=len(differences))]
+    return sum(mean >= observed - 1e-12 for mean in flipped) / len(flipped)
+
+
+def test_consistent_winner_is_significant():
+    comparison = analyzer.compare_models({
+        'strong': {q: 1.0 for q in range(1, 21)},
+        'weak': {q: 0.0 for q in range(1, 21)},
+    })
+
+    assert comparison['best_model'] == 'strong'
+    assert comparison['tied_models'] == ['strong']
+    assert comparison['winner_confidence'] == 1.0
+    assert comparison['winner_p_value'] < 0.001
+    assert comparison['wins'][0, 1] == 20 and comparison['losses'][0, 1] == 0
+
+
+def test_identical_models_are_tied():
+    scores = {q: q / 10 for q in range(1, 11)}
+    comparison = analyzer.compare_models({'a': scores, 'b': dict(scores)})
+
+    assert comparison['winner_confidence'] == 0.5
+    assert comparison['winner_p_value'] == 1.0
+    assert comparison['tied_models'] == ['a', 'b']
+    assert comparison['ties'][0, 1] == 10
+
+
+def test_permutation_p_value_matches_exact_enumeration():
+    first = [1.0, 1.0, 0.5, 0.0, 1.0, 0.75, 1.0, 0.5]
+    second = [0.0, 0.5, 0.5, 0.25, 0.0, 0.25, 1.0, 0.0]
+    comparison = analyzer.compare_models({
+        'first': dict(enumerate(first, 1)),
+        'second': dict(enumerate(second, 1)),
+    })
+
+    expected = exact_permutation_p_value(np.array(first) - np.array(second))
+    assert comparison['winner_p_value'] == pytest.approx(expected, abs=0.01)
+    assert comparison['best_model'] == 'first'
+    assert comparison['winner_confidence'] > 0.95
+
+
+def test_only_questions_answered_by_every_model_are_compared():
+    comparison = analyzer.compare_models({
+        'a': {1: 1.0, 2: 1.0, 3: 0.0},
+        'b': {2: 0.0, 3: 0.0, 4: 1.0},
+    })
+
+    assert comparison['questions'] == 2
+    assert comparison['mean_scores'] == {'a': 0.5, 'b': 0.0}
+
+
+def test_results_are_reproducible_for_a_seed():
+    question_scores = {
+        'a': {1: 1.0, 2: 0.0, 3: 1.0, 4: 0.5},
+        'b': {1: 0.0, 2: 1.0, 3: 0.5, 4: 0.5},
+        'c': {1: 0.5, 2: 0.5, 3: 0.0, 4: 1.0},
+    }
+    first = analyzer.compare_models(question_scores, seed=3)
+    second = analyzer.compare_models(question_scores, seed=3)
+
+    np.testing.assert_array_equal(first['prob_better'], second['prob_better'])
+    np.testing.assert_array_equal(first['p_values'], second['p_values'])
+
+
+def test_needs_two_models_with_shared_questions():
+    assert analyzer.compare_models({'a': {1: 1.0}}) is None
+    assert analyzer.compare_models({'a': {1: 1.0}, 'b': {2: 1.0}}) is None
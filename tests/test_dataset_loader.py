@@ -0,0 +1,100 @@
+import json
+
+import pytest
+
+from dataset_loader import Dataset, load_dataset
+from evaluators.evaluation_types import EvaluationType
+
+
+@pytest.fixture
+def dataset_path(tmp_path):
+    path = tmp_path / 'questions.jsonl'
+    with open(path, 'w', encoding='utf-8') as dataset_file:
+        for i in range(200):
+            dataset_file.write(json.dumps({'id': f'q{i}', 'question': f'Question {i}?', 'answer': str(i)}) + '\n')
+    return str(path)
+
+
+def ids(items):
+    return [item['id'] for item in items]
+
+
+def test_sampling_is_deterministic_and_follows_the_seed(dataset_path):
+    sample = ids(load_dataset(dataset_path, sampling={'fraction': 0.25, 'seed': 7}))
+
+    assert sample == ids(load_dataset(dataset_path, sampling={'fraction': 0.25, 'seed': 7}))
+    assert sample != ids(load_dataset(dataset_path, sampling={'fraction': 0.25, 'seed': 8}))
+    assert 25 < len(sample) < 75
+
+
+def test_sampling_is_stable_when_the_dataset_is_reordered(dataset_path, tmp_path):
+    reordered_path = tmp_path / 'reordered.jsonl'
+    with open(dataset_path, encoding='utf-8') as dataset_file:
+        lines = dataset_file.readlines()
+    with open(reordered_path, 'w', encoding='utf-8') as reordered_file:
+        reordered_file.writelines(reversed(lines))
+
+    sample = set(ids(Dataset(dataset_path, fraction=0.3)))
+    assert set(ids(Dataset(str(reordered_path), fraction=0.3))) == sample
+
+
+def test_larger_fractions_keep_the_smaller_samples(dataset_path):
+    assert set(ids(Dataset(dataset_path, fraction=0.2))) <= set(ids(Dataset(dataset_path, fraction=0.5)))
+
+
+def test_shards_partition_the_sample(dataset_path):
+    sample = ids(Dataset(dataset_path, fraction=0.5))
+    shards = [ids(Dataset(dataset_path, fraction=0.5, shard_index=i, shard_count=3)) for i in range(3)]
+
+    assert sorted(sum(shards, [])) == sorted(sample)
+    assert all(shard for shard in shards)
+
+
+def test_max_items_limits_the_sample(dataset_path):
+    assert len(Dataset(dataset_path, fraction=0.5, max_items=10)) == 10
+
+
+def test_items_of_other_evaluation_types_are_skipped(tmp_path):
+    path = tmp_path / 'mixed.jsonl'
+    with open(path, 'w', encoding='utf-8') as dataset_file:
+        dataset_file.write(json.dumps({'question': 'A', 'evaluation_type': 'SIMPLE_QUESTION'}) + '\n')
+        dataset_file.write(json.dumps({'question': 'B', 'evaluation_type': 'SUMMARISE'}) + '\n')
+        dataset_file.write(json.dumps({'question': 'C'}) + '\n')
+
+    dataset = Dataset(str(path), EvaluationType.SIMPLE_QUESTION)
+    assert [item['question'] for item in dataset] == ['A', 'C']
+
+
+@pytest.mark.parametrize('order', [
+    [0, 1, 2, 3],
+    [5, 2, 9, 0],
+    [-1, -200, 199, 100],
+])
+def test_indexing_matches_iteration_in_any_order(dataset_path, order):
+    dataset = Dataset(dataset_path)
+    items = list(dataset)
+    assert [dataset[i] for i in order] == [items[i] for i in order]
+
+
+def test_indexing_out_of_range_raises(dataset_path):
+    dataset = Dataset(dataset_path, max_items=5)
+    with pytest.raises(IndexError):
+        dataset[5]
+    with pytest.raises(IndexError):
+        dataset[-6]
+
+
+def test_slices_are_reiterable_views(dataset_path):
+    dataset = Dataset(dataset_path)
+    items = list(dataset)
+
+    window = dataset[10:20]
+    assert len(window) == 10
+    assert list(window) == items[10:20]
+    assert list(window) == items[10:20]
+    assert window[0] == items[10] and window[-1] == items[19]
+    assert list(window[2:4]) == items[12:14]
+    assert list(dataset[-5:]) == items[-5:]
+    assert len(dataset[50:10]) == 0
+    with pytest.raises(IndexError):
+        window[10]
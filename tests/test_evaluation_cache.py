@@ -0,0 +1,82 @@
+import itertools
+
+import pytest
+
+import evaluation_cache
+from evaluation_cache import EvaluationCache
+
+KEY_ARGS = ('openai', 'gpt-judge', 'template-hash', 'What is 6 * 7?', '42', 'The answer is 42')
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    # Each cache access gets a later timestamp, so least recently used is unambiguous
+    ticks = itertools.count(1)
+    monkeypatch.setattr(evaluation_cache.time, 'time', lambda: float(next(ticks)))
+
+
+def make_cache(tmp_path, max_entries=10000):
+    return EvaluationCache(str(tmp_path / 'cache' / 'evaluations.sqlite'), max_entries)
+
+
+def test_key_ignores_answer_case_and_whitespace():
+    assert EvaluationCache.make_key(*KEY_ARGS) == EvaluationCache.make_key(
+        *KEY_ARGS[:-1], '  the ANSWER is\n42 '
+    )
+
+
+@pytest.mark.parametrize('position, value', [
+    (0, 'anthropic'),
+    (1, 'other-judge'),
+    (2, 'other-template-hash'),
+    (3, 'What is 7 * 6?'),
+    (4, '41'),
+    (5, 'The answer is 41'),
+])
+def test_key_changes_with_anything_that_affects_the_judgment(position, value):
+    changed = list(KEY_ARGS)
+    changed[position] = value
+    assert EvaluationCache.make_key(*changed) != EvaluationCache.make_key(*KEY_ARGS)
+
+
+def test_missing_expected_answer_has_a_stable_key():
+    key = EvaluationCache.make_key(*KEY_ARGS[:4], None, KEY_ARGS[5])
+    assert key == EvaluationCache.make_key(*KEY_ARGS[:4], None, KEY_ARGS[5])
+
+
+def test_entries_persist_across_instances(tmp_path):
+    cache = make_cache(tmp_path)
+    cache.put('key', {'score': 1.0, 'reasoning': 'Correct'})
+    cache.close()
+
+    cache = make_cache(tmp_path)
+    assert cache.get('key') == {'score': '1.0', 'reasoning': 'Correct'}
+    assert cache.get('other') is None
+    assert cache.get_stats()['hits'] == 1 and cache.get_stats()['misses'] == 1
+    cache.close()
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path, clock):
+    cache = make_cache(tmp_path, max_entries=2)
+    cache.put('a', {'score': '1', 'reasoning': ''})
+    cache.put('b', {'score': '1', 'reasoning': ''})
+    cache.get('a')
+    cache.put('c', {'score': '1', 'reasoning': ''})
+
+    assert cache.get('b') is None
+    assert cache.get('a') is not None and cache.get('c') is not None
+    assert cache.get_stats()['evictions'] == 1
+    assert cache.get_stats()['entries'] == 2
+    cache.close()
+
+
+def test_replacing_an_entry_does_not_evict(tmp_path, clock):
+    cache = make_cache(tmp_path, max_entries=2)
+    cache.put('a', {'score': '0', 'reasoning': ''})
+    cache.put('b', {'score': '1', 'reasoning': ''})
+    cache.put('a', {'score': '1', 'reasoning': ''})
+
+    assert cache.get('a')['score'] == '1'
+    assert cache.get('b') is not None
+    assert cache.get_stats()['evictions'] == 0
+    cache.close()
@@ -0,0 +1,25 @@
+import pytest
+
+from evaluators.judging import parse_batch_evaluation
+
+
+def test_orders_scores_by_answer_number():
+    text = 'Scores: [{"answer": 2, "score": 0, "reasoning": "Wrong."}, {"answer": 1, "score": 1}]'
+    assert parse_batch_evaluation(text, 2) == [
+        {'score': '1.0', 'reasoning': 'No reasoning provided'},
+        {'score': '0.0', 'reasoning': 'Wrong.'},
+    ]
+
+
+@pytest.mark.parametrize('text', [
+    '[{"answer": 1, "score": 1}]',
+    '[{"answer": 1, "score": 1}, {"answer": 1, "score": 0}]',
+    '[{"answer": 1, "score": 1}, {"answer": 3, "score": 0}]',
+    '[{"answer": 1, "score": 1}, {"score": 0}]',
+    '[{"answer": 1, "score": 1}, {"answer": 2, "score": 8}]',
+    '[{"answer": 1, "score": 1}, {"answer": 2, "score": -0.5}]',
+    '[{"answer": 1, "score": 1}, {"answer": 2, "score": "good"}]',
+    'No scores here',
+])
+def test_rejects_incomplete_or_out_of_range_scores(text):
+    assert parse_batch_evaluation(text, 2) is None
@@ -0,0 +1,45 @@
+import pytest
+
+from evaluators.local_scorer import LocalScorer
+
+scorer = LocalScorer()
+
+
+@pytest.mark.parametrize('expected, answer, score', [
+    ('3', '3', '1'),
+    ('3', '3.', '1'),
+    ('3', '**3**', '1'),
+    ('3', 'Three', '1'),
+    ('3', '4', '0'),
+    ('0.69', 'The result is 0.69.', '1'),
+    ('8,849m', '8849 metres', '1'),
+    ('42', 'First 6 * 7 gives the product.\nFinal answer: 42', '1'),
+    ('42', '<think>maybe 41</think>Answer: 41', '0'),
+])
+def test_scores_answers_that_are_only_the_quantity(expected, answer, score):
+    assert scorer.score(expected, answer)['score'] == score
+
+
+@pytest.mark.parametrize('answer', [
+    'It is not 3',
+    'The answer is not 3',
+    '3rd',
+    'The answer is the 3rd one',
+    "I'm not sure, maybe 3?",
+    'Either 3 or 4',
+    '3 because 1 + 2 = 3',
+])
+def test_leaves_ambiguous_answers_to_the_judge(answer):
+    assert scorer.score('3', answer) is None
+
+
+def test_mismatched_units_are_left_to_the_judge():
+    assert scorer.score('3 m', '3 km') is None
+
+
+def test_exact_match_ignores_case_and_punctuation():
+    assert scorer.score('Paris', 'paris.')['score'] == '1'
+
+
+def test_no_expected_answer_is_not_scored():
+    assert scorer.score(None, '3') is None
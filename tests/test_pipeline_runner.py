@@ -0,0 +1,109 @@
+import asyncio
+
+import pytest
+
+from pipeline_runner import PipelineTestRunner
+from power_metrics_manager import PowerMetricsManager
+
+MODEL = {'provider': 'openai', 'model': 'model-a'}
+QA_PAIRS = [{'question': f'Q{i}', 'answer': f'A{i}'} for i in range(1, 4)]
+
+
+class FakeJournal:
+    def __init__(self, completed=None):
+        self.completed = dict(completed or {})
+
+    def get_result(self, model_name, question_num, test_num):
+        return self.completed.get((model_name, question_num, test_num))
+
+    def record(self, model_name, question_num, test_num, result):
+        self.completed[(model_name, question_num, test_num)] = result
+
+
+class FakeModelTester:
+    def __init__(self):
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.questions = []
+
+    async def test_single_iteration_async(self, provider, model, question):
+        self.questions.append(question)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.001)
+        self.in_flight -= 1
+        return {
+            'response': f'answer to {question}', 'prompt_tokens': 3, 'completion_tokens': 4, 'total_tokens': 7,
+            'response_time': 0.001, 'time_to_first_token': None, 'decode_tokens_per_second': None,
+            'inter_token_latency_avg': None, 'inter_token_latency_p95': None
+        }
+
+
+class FakeEvaluationManager:
+    def __init__(self, batch_size=1, delay=0.0, fail=False):
+        self.batch_size = batch_size
+        self.delay = delay
+        self.fail = fail
+        self.batches = []
+
+    async def evaluate_responses_async(self, question, expected_answer, actual_answers):
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError('evaluator unavailable')
+        self.batches.append((question, len(actual_answers)))
+        return [{'score': '1', 'reasoning': expected_answer, 'scored_by': 'judge'} for _ in actual_answers]
+
+
+def make_runner(evaluation_manager, journal=None, number_of_tests=2, queue_size=4, judge_workers=2):
+    model_tester = FakeModelTester()
+    runner = PipelineTestRunner(model_tester, evaluation_manager, PowerMetricsManager(enabled=False),
+                                number_of_tests, queue_size, judge_workers, journal or FakeJournal())
+    return runner, model_tester
+
+
+def test_every_test_is_generated_one_at_a_time_and_judged():
+    journal = FakeJournal()
+    runner, model_tester = make_runner(FakeEvaluationManager(), journal)
+    results = runner.run_model(MODEL, QA_PAIRS)
+
+    assert model_tester.max_in_flight == 1
+    assert [[result['evaluation_reasoning'] for result in question] for question in results] == [
+        ['A1', 'A1'], ['A2', 'A2'], ['A3', 'A3']
+    ]
+    assert len(journal.completed) == 6
+    stats = runner.get_stats_summary()
+    assert stats['generated'] == 6 and stats['evaluated'] == 6
+
+
+def test_queue_items_batch_answers_to_one_question():
+    evaluation_manager = FakeEvaluationManager(batch_size=2)
+    runner, _ = make_runner(evaluation_manager, number_of_tests=3)
+    runner.run_model(MODEL, QA_PAIRS)
+
+    assert sorted(evaluation_manager.batches) == [('Q1', 1), ('Q1', 2), ('Q2', 1), ('Q2', 2), ('Q3', 1), ('Q3', 2)]
+
+
+def test_generation_waits_for_a_slow_judge_once_the_queue_is_full():
+    runner, _ = make_runner(FakeEvaluationManager(delay=0.02), number_of_tests=4, queue_size=1, judge_workers=1)
+    runner.run_model(MODEL, QA_PAIRS)
+
+    stats = runner.get_stats_summary()
+    assert stats['max_queue_depth'] <= 1
+    assert stats['backpressure_wait_time'] > 0.1
+    assert stats['evaluated'] == 12
+
+
+def test_journaled_tests_are_not_generated_again():
+    journaled = {'evaluation_reasoning': 'journaled'}
+    journal = FakeJournal({('model-a', 2, 1): journaled})
+    runner, model_tester = make_runner(FakeEvaluationManager(), journal)
+    results = runner.run_model(MODEL, QA_PAIRS)
+
+    assert model_tester.questions == ['Q1', 'Q1', 'Q2', 'Q3', 'Q3']
+    assert results[1][0] is journaled
+
+
+def test_judge_errors_are_raised_after_the_queue_drains():
+    runner, _ = make_runner(FakeEvaluationManager(fail=True))
+    with pytest.raises(RuntimeError, match='evaluator unavailable'):
+        runner.run_model(MODEL, QA_PAIRS)
@@ -0,0 +1,68 @@
+import math
+import os
+
+import pytest
+
+from powermetrics import PowerMetricsParser, PowerMetricsSampler, PowerSampleBuffer
+
+FIXTURE = os.path.join(os.path.dirname(__file__), 'fixtures', 'powermetrics_cpu_power.txt')
+
+# Combined power of the five samples in the fixture, each over a 100 ms interval
+FIXTURE_WATTS = [1.0, 2.0, 2.0, 3.0, 1.0]
+
+
+def recorded_buffer() -> PowerSampleBuffer:
+    # Replays the fixture with each sample arriving at the end of its interval, from t = 0
+    buffer = PowerSampleBuffer()
+    timestamp = 0.0
+    with open(FIXTURE, encoding='utf-8') as lines:
+        for watts, interval in PowerMetricsParser().parse(lines):
+            timestamp += interval
+            buffer.add(timestamp, watts, interval)
+    return buffer
+
+
+def test_parser_reads_combined_power_and_interval():
+    with open(FIXTURE, encoding='utf-8') as lines:
+        samples = PowerMetricsParser().parse(lines)
+    assert samples == [(watts, pytest.approx(0.1)) for watts in FIXTURE_WATTS]
+
+
+def test_energy_is_trapezoidal_between_sample_midpoints():
+    # Midpoints are at 0.05, 0.15, ... 0.45 s: 2 W to 2 W, then 2 W to 3 W, 0.1 s each
+    assert recorded_buffer().energy(0.15, 0.35) == pytest.approx(0.1 * 2.0 + 0.1 * 2.5)
+
+
+def test_energy_interpolates_windows_shorter_than_a_sample():
+    # Between midpoints 0.25 (2 W) and 0.35 (3 W), power at 0.3 s is 2.5 W
+    assert recorded_buffer().energy(0.28, 0.32) == pytest.approx(0.04 * 2.5)
+
+
+def test_energy_holds_the_last_sample_beyond_the_newest_midpoint():
+    assert recorded_buffer().energy(0.45, 0.6) == pytest.approx(0.15 * 1.0)
+
+
+def test_ring_buffer_keeps_only_the_newest_samples():
+    buffer = PowerSampleBuffer(capacity=3)
+    for i, watts in enumerate(FIXTURE_WATTS, 1):
+        buffer.add(i * 0.1, watts, 0.1)
+    assert [watts for _, watts in buffer.points(-math.inf, math.inf)] == FIXTURE_WATTS[-3:]
+
+
+def test_points_include_the_nearest_sample_before_the_window():
+    midpoints = [midpoint for midpoint, _ in recorded_buffer().points(0.3, 0.4)]
+    assert midpoints == pytest.approx([0.25, 0.35, 0.45])
+
+
+def test_sampler_records_every_sample_from_a_recorded_source():
+    with open(FIXTURE, encoding='utf-8') as lines:
+        sampler = PowerMetricsSampler(source=lines)
+        start = sampler.mark()
+        sampler.start()
+        sampler.reader_thread.join(timeout=5)
+        end = sampler.mark()
+
+    assert sampler.buffer.closed
+    assert [watts for _, watts in sampler.buffer.points(-math.inf, math.inf)] == FIXTURE_WATTS
+    energy = sampler.energy_between(start, end)
+    assert energy is not None and 0 <= energy <= max(FIXTURE_WATTS) * (end - start)
@@ -0,0 +1,75 @@
+import pytest
+
+from rapl import EnergyCounter, RaplPowerSource, discover_hwmon_counters, discover_rapl_counters
+
+MAX_ENERGY_UJ = 262_143_328_850
+
+
+def write_zone(root, zone, name, energy_uj, max_energy_uj=MAX_ENERGY_UJ):
+    zone_path = root / zone
+    zone_path.mkdir()
+    (zone_path / 'name').write_text(f"{name}\n")
+    (zone_path / 'energy_uj').write_text(f"{energy_uj}\n")
+    (zone_path / 'max_energy_range_uj').write_text(f"{max_energy_uj}\n")
+    return zone_path
+
+
+def test_counter_wraps_at_max_energy_range():
+    counter = EnergyCounter('package-0', '/unused', MAX_ENERGY_UJ)
+    assert counter.delta(MAX_ENERGY_UJ - 1_000_000, 500_000) == 1_500_000
+    assert counter.delta(1_000_000, 3_000_000) == 2_000_000
+
+
+def test_counter_without_range_never_goes_negative():
+    assert EnergyCounter('hwmon0', '/unused').delta(3_000_000, 1_000_000) == 0
+
+
+def test_energy_between_marks_across_a_wrap(tmp_path):
+    zone = write_zone(tmp_path, 'intel-rapl:0', 'package-0', MAX_ENERGY_UJ - 2_000_000)
+    source = RaplPowerSource(discover_rapl_counters(str(tmp_path)))
+
+    start = source.mark()
+    (zone / 'energy_uj').write_text('1000000\n')
+    end = source.mark()
+
+    assert source.energy_between(start, end) == pytest.approx(3.0)
+
+
+def test_discovery_skips_package_subzones_but_keeps_dram(tmp_path):
+    write_zone(tmp_path, 'intel-rapl:0', 'package-0', 0)
+    write_zone(tmp_path, 'intel-rapl:0:0', 'core', 0)
+    write_zone(tmp_path, 'intel-rapl:0:1', 'dram', 0)
+    write_zone(tmp_path, 'intel-rapl:1', 'package-1', 0)
+
+    counters = discover_rapl_counters(str(tmp_path))
+    assert [counter.name for counter in counters] == [
+        'intel-rapl:0 (package-0)', 'intel-rapl:0:1 (dram)', 'intel-rapl:1 (package-1)'
+    ]
+    assert all(counter.max_energy_uj == MAX_ENERGY_UJ for counter in counters)
+
+
+def test_psys_zone_is_used_on_its_own(tmp_path):
+    write_zone(tmp_path, 'intel-rapl:0', 'package-0', 0)
+    write_zone(tmp_path, 'intel-rapl:1', 'psys', 0)
+
+    assert [counter.name for counter in discover_rapl_counters(str(tmp_path))] == ['intel-rapl:1 (psys)']
+
+
+def test_unreadable_readings_give_no_energy(tmp_path):
+    zone = write_zone(tmp_path, 'intel-rapl:0', 'package-0', 1_000_000)
+    source = RaplPowerSource(discover_rapl_counters(str(tmp_path)))
+
+    start = source.mark()
+    (zone / 'energy_uj').unlink()
+    assert source.energy_between(start, source.mark()) is None
+
+
+def test_hwmon_counters_have_no_wrap_range(tmp_path):
+    device = tmp_path / 'hwmon3'
+    device.mkdir()
+    (device / 'name').write_text('amd_energy\n')
+    (device / 'energy1_input').write_text('5000000\n')
+
+    counters = discover_hwmon_counters(str(tmp_path))
+    assert [counter.name for counter in counters] == ['hwmon3 (amd_energy)']
+    assert counters[0].max_energy_uj is None
@@ -0,0 +1,129 @@
+import pytest
+
+from async_runner import AsyncTestRunner
+from run_journal import RunJournal
+
+SIGNATURE = {'models': ['model-a'], 'dataset': 'questions.txt', 'number_of_tests': 2}
+
+
+def make_result(score):
+    return {'llm_answer': 'answer', 'evaluation_score': score, 'response_time': 0.5}
+
+
+class FakeModelTester:
+    def __init__(self):
+        self.questions = []
+
+    async def test_single_iteration_async(self, provider, model, question):
+        self.questions.append(question)
+        return {
+            'response': 'answer', 'prompt_tokens': 1, 'completion_tokens': 1, 'total_tokens': 2,
+            'response_time': 0.1, 'time_to_first_token': None, 'decode_tokens_per_second': None,
+            'inter_token_latency_avg': None, 'inter_token_latency_p95': None
+        }
+
+
+class FakeEvaluationManager:
+    batch_size = 1
+
+    async def evaluate_responses_async(self, question, expected_answer, actual_answers):
+        return [{'score': '1', 'reasoning': 'Correct', 'scored_by': 'judge'} for _ in actual_answers]
+
+
+def test_resumed_journal_restores_results_and_cold_starts(tmp_path):
+    path = str(tmp_path / 'journal.jsonl')
+    journal = RunJournal(path, SIGNATURE)
+    journal.record_warmup('model-a', {'response_time': 2.0})
+    journal.record('model-a', 1, 1, make_result(1.0))
+    journal.record('model-a', 1, 2, make_result(0.0))
+    journal.close()
+
+    resumed = RunJournal(path, SIGNATURE, resume=True)
+    assert resumed.get_result('model-a', 1, 1) == make_result(1.0)
+    assert resumed.get_result('model-a', 1, 2) == make_result(0.0)
+    assert resumed.get_result('model-a', 2, 1) is None
+    assert resumed.get_warmup('model-a') == {'response_time': 2.0}
+    resumed.close()
+
+
+def test_fresh_run_starts_a_new_journal(tmp_path):
+    path = str(tmp_path / 'journal.jsonl')
+    journal = RunJournal(path, SIGNATURE)
+    journal.record('model-a', 1, 1, make_result(1.0))
+    journal.close()
+
+    fresh = RunJournal(path, SIGNATURE)
+    assert fresh.completed == {}
+    fresh.close()
+
+
+def test_truncated_last_line_is_ignored_and_terminated(tmp_path):
+    path = tmp_path / 'journal.jsonl'
+    journal = RunJournal(str(path), SIGNATURE)
+    journal.record('model-a', 1, 1, make_result(1.0))
+    journal.close()
+    with open(path, 'a', encoding='utf-8') as journal_file:
+        journal_file.write('{"type": "test", "model": "mod')
+
+    resumed = RunJournal(str(path), SIGNATURE, resume=True)
+    resumed.record('model-a', 1, 2, make_result(0.0))
+    resumed.close()
+
+    resumed_again = RunJournal(str(path), SIGNATURE, resume=True)
+    assert set(resumed_again.completed) == {('model-a', 1, 1), ('model-a', 1, 2)}
+    resumed_again.close()
+
+
+def test_resume_rejects_a_different_configuration(tmp_path):
+    path = str(tmp_path / 'journal.jsonl')
+    RunJournal(path, SIGNATURE).close()
+
+    with pytest.raises(ValueError):
+        RunJournal(path, {**SIGNATURE, 'number_of_tests': 3}, resume=True)
+
+
+def test_resume_only_runs_tests_missing_from_the_journal(tmp_path):
+    path = str(tmp_path / 'journal.jsonl')
+    journal = RunJournal(path, SIGNATURE)
+    journal.record('model-a', 1, 1, make_result(0.0))
+    journal.record('model-a', 2, 2, make_result(0.0))
+    journal.close()
+
+    journal = RunJournal(path, SIGNATURE, resume=True)
+    model_tester = FakeModelTester()
+    runner = AsyncTestRunner(model_tester, FakeEvaluationManager(), 2, {'openai': 2}, 2, journal)
+    qa_pairs = [{'question': 'Q1', 'answer': 'A1'}, {'question': 'Q2', 'answer': 'A2'}]
+    results = runner.run_model({'provider': 'openai', 'model': 'model-a'}, qa_pairs)
+    journal.close()
+
+    assert sorted(model_tester.questions) == ['Q1', 'Q2']
+    assert [[result['evaluation_score'] for result in question] for question in results] == [[0.0, 1.0], [1.0, 0.0]]
+    resumed = RunJournal(path, SIGNATURE, resume=True)
+    assert len(resumed.completed) == 4
+    resumed.close()
+
+
+def test_merge_combines_shard_journals(tmp_path):
+    shard_paths = [str(tmp_path / f'shard_{i}.jsonl') for i in range(2)]
+    for shard, path in enumerate(shard_paths):
+        journal = RunJournal(path, SIGNATURE)
+        journal.record_warmup('model-a', {'response_time': float(shard)})
+        journal.record('model-a', 1, shard + 1, make_result(float(shard)))
+        journal.close()
+
+    merged_path = str(tmp_path / 'merged.jsonl')
+    assert RunJournal.merge(shard_paths, merged_path) == 2
+
+    merged = RunJournal(merged_path, SIGNATURE, resume=True)
+    assert merged.get_result('model-a', 1, 2) == make_result(1.0)
+    assert merged.get_warmup('model-a') == {'response_time': 0.0}
+    merged.close()
+
+
+def test_merge_rejects_journals_from_different_configurations(tmp_path):
+    paths = [str(tmp_path / 'a.jsonl'), str(tmp_path / 'b.jsonl')]
+    RunJournal(paths[0], SIGNATURE).close()
+    RunJournal(paths[1], {**SIGNATURE, 'dataset': 'other.txt'}).close()
+
+    with pytest.raises(ValueError):
+        RunJournal.merge(paths, str(tmp_path / 'merged.jsonl'))